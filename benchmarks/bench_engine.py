@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Engine benchmark with regression checks.
+
+Runs AIEngine.get_best_move on every position of engine_positions.txt,
+once per fixed depth and once per time budget, and records time to move,
+nodes searched, nodes per second and peak memory allocated by the search.
+Results are printed as a table and can be saved as JSON. With --compare,
+the totals of every run are checked against a saved result file and the
+script exits with status 1 if a metric got worse by more than its threshold.
+
+Each line of the position file holds a category and a move string (columns
+numbered from 1, player 1 moves first, "-" for the empty board).
+
+Usage:
+    python benchmarks/bench_engine.py [--depths 2,4,6] [--budgets 50,200]
+        [--output results.json] [--compare baseline.json] [--threshold 0.1]
+        [--metric-threshold nodes=0] [--positions engine_positions.txt]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+from constants import PLAYER_1, PLAYER_2
+from ai_engine import AIEngine
+from bitboard import Position
+
+
+# Whether a larger value of a metric is better, for the compare mode
+HIGHER_IS_BETTER = {
+    'time_ms': False,
+    'nodes': False,
+    'nodes_per_sec': True,
+    'peak_kb': False,
+}
+
+
+def load_positions(path):
+    """Read (category, moves) pairs, skipping blank lines and comments."""
+    positions = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                category, moves = line.split()
+                positions.append((category, '' if moves == '-' else moves))
+    return positions
+
+
+def run_search(engine, position, depth, budget_ms):
+    """
+    Search one position with a cleared engine.
+
+    Args:
+        engine (AIEngine): The engine to search with
+        position (Position): The position, with the engine's player to move
+        depth (int): Fixed search depth, or None with a budget
+        budget_ms (int): Time budget in ms, or None for a fixed depth
+
+    Returns:
+        tuple: (column, seconds, nodes)
+    """
+    engine.reset()
+    board = position.to_board()
+    start = time.perf_counter()
+    column = engine.get_best_move(board, time_limit_ms=budget_ms, max_depth=depth)
+    return column, time.perf_counter() - start, engine.nodes
+
+
+def measure_position(engine, moves, depth, budget_ms, repeat):
+    """
+    Measure the search of one position.
+
+    The fastest of several runs is kept. Peak memory comes from a separate
+    run under tracemalloc, which slows the search down.
+
+    Args:
+        engine (AIEngine): The engine to search with
+        moves (str): Move string of the position
+        depth (int): Search depth, or None with a budget
+        budget_ms (int): Time budget in ms, or None for a fixed depth
+        repeat (int): Number of timed runs
+
+    Returns:
+        dict: The metrics of the position
+    """
+    position = Position.from_moves(moves)
+    engine.ai_player = PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+    engine.human_player = 3 - engine.ai_player
+
+    best_time = None
+    for _ in range(repeat):
+        column, elapsed, nodes = run_search(engine, position, depth, budget_ms)
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+            best_nodes = nodes
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    run_search(engine, position, depth, budget_ms)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        'moves': moves,
+        'column': column,
+        'time_ms': round(best_time * 1000, 3),
+        'nodes': best_nodes,
+        'nodes_per_sec': round(best_nodes / best_time) if best_time > 0 else 0,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(positions, depths, budgets, repeat):
+    """
+    Run every position for every depth and time budget.
+
+    Args:
+        positions (list): (category, moves) pairs
+        depths (list): Fixed search depths
+        budgets (list): Time budgets in ms, each deepening as far as it allows
+        repeat (int): Timed runs per position
+
+    Returns:
+        dict: Runs keyed by name ("depth-4", "budget-200ms"), each holding the
+            per-position results and their totals
+    """
+    engine = AIEngine(book_path=None, workers=1)
+    configs = [(f"depth-{depth}", depth, None) for depth in depths]
+    configs += [(f"budget-{budget}ms", None, budget) for budget in budgets]
+
+    runs = {}
+    for name, depth, budget_ms in configs:
+        results = []
+        for category, moves in positions:
+            result = measure_position(engine, moves, depth, budget_ms, repeat)
+            result['category'] = category
+            results.append(result)
+
+        total_time = sum(result['time_ms'] for result in results)
+        total_nodes = sum(result['nodes'] for result in results)
+        runs[name] = {
+            'depth': depth,
+            'budget_ms': budget_ms,
+            'positions': results,
+            'totals': {
+                'time_ms': round(total_time, 3),
+                'nodes': total_nodes,
+                'nodes_per_sec': round(total_nodes * 1000 / total_time) if total_time > 0 else 0,
+                'peak_kb': max(result['peak_kb'] for result in results),
+            },
+        }
+    return runs
+
+
+def compare(runs, baseline, threshold, metric_thresholds):
+    """
+    Find metrics that got worse than in a baseline.
+
+    Only the totals of runs present in both result sets are compared. Time
+    and node totals of budget runs are set by the budget, so only nodes per
+    second and peak memory are compared for them.
+
+    Args:
+        runs (dict): Current results from run_benchmark
+        baseline (dict): Saved results from run_benchmark
+        threshold (float): Allowed relative change in the bad direction
+        metric_thresholds (dict): Per-metric overrides of the threshold
+
+    Returns:
+        list: One message per regression
+    """
+    regressions = []
+    for name, run in runs.items():
+        if name not in baseline:
+            continue
+        for metric, higher_is_better in HIGHER_IS_BETTER.items():
+            if run['budget_ms'] is not None and metric in ('time_ms', 'nodes'):
+                continue
+            old = baseline[name]['totals'][metric]
+            new = run['totals'][metric]
+            if old == 0:
+                continue
+            change = (new - old) / old
+            if higher_is_better:
+                change = -change
+            allowed = metric_thresholds.get(metric, threshold)
+            if change > allowed:
+                regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.1%} worse, "
+                                   f"threshold {allowed:.1%})")
+    return regressions
+
+
+def parse_list(text):
+    """Parse a comma separated list of integers."""
+    return [int(value) for value in text.split(',') if value]
+
+
+def parse_metric_thresholds(items):
+    """Parse metric=threshold arguments into a dict."""
+    thresholds = {}
+    for item in items:
+        metric, _, value = item.partition('=')
+        if metric not in HIGHER_IS_BETTER:
+            raise SystemExit(f"Unknown metric {metric!r} (choose from {', '.join(HIGHER_IS_BETTER)})")
+        thresholds[metric] = float(value)
+    return thresholds
+
+
+def main():
+    """Run the benchmark, print the totals and optionally save and compare them."""
+    parser = argparse.ArgumentParser(description="AIEngine benchmark")
+    parser.add_argument('--depths', type=parse_list, default=[2, 4, 6], help="fixed depths, e.g. 2,4,6")
+    parser.add_argument('--budgets', type=parse_list, default=[50, 200], help="time budgets in ms, e.g. 50,200")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per position (fastest is kept)")
+    parser.add_argument('--positions', default=os.path.join(BENCHMARK_DIR, 'engine_positions.txt'))
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON file of a previous run to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.1, help="allowed relative regression")
+    parser.add_argument('--metric-threshold', action='append', default=[], metavar='METRIC=VALUE',
+                        help="threshold for one metric, e.g. nodes=0 (repeatable)")
+    args = parser.parse_args()
+
+    metric_thresholds = parse_metric_thresholds(args.metric_threshold)
+    positions = load_positions(args.positions)
+    runs = run_benchmark(positions, args.depths, args.budgets, args.repeat)
+
+    print(f"{'run':<14} {'time ms':>10} {'nodes':>10} {'nodes/s':>10} {'peak kB':>9}")
+    for name, run in runs.items():
+        totals = run['totals']
+        print(f"{name:<14} {totals['time_ms']:>10.1f} {totals['nodes']:>10} "
+              f"{totals['nodes_per_sec']:>10} {totals['peak_kb']:>9.1f}")
+
+    if args.output:
+        result = {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'positions': len(positions),
+            'runs': runs,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['runs']
+        regressions = compare(runs, baseline, args.threshold, metric_thresholds)
+        if regressions:
+            print("Regressions:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Memory footprint benchmark for game models.
+
+Creates many games at the same point of play under tracemalloc and reports
+the bytes held per game, along with the cost of taking board snapshots,
+undoing and redoing moves, and exporting and importing move strings.
+
+Usage:
+    python benchmarks/bench_game_memory.py [games]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from game_model import GameModel
+
+
+# Moves of the benchmark games (player 1 starts, columns numbered from 1)
+MOVES = "4453221176"
+
+
+def measure_footprint(count):
+    """
+    Measure the memory held by a list of games.
+
+    Args:
+        count (int): Number of games to create
+
+    Returns:
+        float: Bytes per game, including its slot in the list
+    """
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    games = [GameModel.from_moves(MOVES) for _ in range(count)]
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(games) == count
+    return (current - baseline) / count
+
+
+def time_operation(label, operation, repeat=100000):
+    """
+    Time an operation and print the time per call.
+
+    Args:
+        label (str): Name printed for the operation
+        operation: Function called without arguments
+        repeat (int): Number of calls
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        operation()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1e6 / repeat:>8.2f} us")
+
+
+def main():
+    """Print the footprint and operation timings."""
+    parser = argparse.ArgumentParser(description="Memory footprint benchmark for game models")
+    parser.add_argument('games', nargs='?', type=int, default=10000, help="games held in memory at once")
+    count = parser.parse_args().games
+    print(f"{count} games after {len(MOVES)} moves: {measure_footprint(count):.0f} bytes per game")
+    print()
+
+    game = GameModel.from_moves(MOVES)
+
+    def undo_redo():
+        game.undo()
+        game.redo()
+
+    time_operation("snapshot", game.snapshot)
+    time_operation("undo + redo", undo_redo)
+    time_operation("to_moves", game.to_moves)
+    time_operation("from_moves", lambda: GameModel.from_moves(MOVES), repeat=10000)
+
+
+if __name__ == "__main__":
+    main()
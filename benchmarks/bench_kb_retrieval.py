@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Knowledge base retrieval benchmark.
+
+Checks the relevance of KnowledgeIndex on the questions of kb_relevance.txt
+against the real knowledge base (the expected document must rank first),
+then builds an index over a generated corpus of many documents plus the
+real ones and reports the time to build, save and load it and the latency
+of searches. The relevance checks are repeated on the large corpus, where
+the expected document must be among the top k. The script exits with
+status 1 if too few checks pass or the 99th percentile search latency
+exceeds its limit.
+
+Usage:
+    python benchmarks/bench_kb_retrieval.py [--documents 1000] [--k 2]
+        [--max-p99-us 1000] [--min-recall 1.0] [--min-corpus-recall 0.6]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+from constants import KNOWLEDGE_BASE_DIR
+from knowledge_index import KnowledgeIndex
+from knowledge_loader import KnowledgeBase
+
+
+# Connect 4 words mixed into the generated documents, so common question
+# terms have long posting lists
+DOMAIN_WORDS = """
+piece pieces column columns row rows diagonal horizontal vertical board opponent player move
+moves position positions threat threats block blocking win winning lose losing draw center
+edge corner opening endgame midgame tempo parity odd even square squares stack trap traps
+zugzwang sequence pattern patterns combination combinations strategy tactic tactics advantage
+defend defense attack attacking force forced control space connect four three two line lines
+bottom top left right early late plan planning mistake mistakes analysis evaluate evaluation
+""".split()
+
+
+def load_queries(path):
+    """Read (expected source, question) pairs, skipping blank lines and comments."""
+    queries = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                source, query = line.split(None, 1)
+                queries.append((source, query))
+    return queries
+
+
+def generate_corpus(directory, count, seed=0, vocabulary_size=20000, domain_share=0.1):
+    """
+    Write generated markdown documents with a few sections each.
+
+    Words are drawn from a made-up vocabulary with Zipf-distributed
+    frequencies, like natural text, with a share of Connect 4 words mixed in.
+
+    Args:
+        directory (str): Directory to write to
+        count (int): Number of documents
+        seed (int): Seed of the generator
+        vocabulary_size (int): Number of made-up words
+        domain_share (float): Share of words taken from DOMAIN_WORDS
+    """
+    rng = random.Random(seed)
+    syllables = [consonant + vowel for consonant in 'bdfgklmnprstvz' for vowel in 'aeiou']
+    vocabulary = sorted({''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+                         for _ in range(vocabulary_size)})
+    rng.shuffle(vocabulary)
+    cumulative = []
+    total = 0.0
+    for rank in range(len(vocabulary)):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+
+    def words(n):
+        return ' '.join(rng.choice(DOMAIN_WORDS) if rng.random() < domain_share
+                        else rng.choices(vocabulary, cum_weights=cumulative)[0] for _ in range(n))
+
+    for index in range(count):
+        sections = []
+        for _ in range(rng.randint(1, 4)):
+            heading = words(rng.randint(2, 4)).title()
+            paragraphs = []
+            for _ in range(rng.randint(1, 3)):
+                sentences = [words(rng.randint(6, 18)).capitalize() + '.'
+                             for _ in range(rng.randint(2, 6))]
+                paragraphs.append(' '.join(sentences))
+            sections.append(f"## {heading}\n\n" + '\n\n'.join(paragraphs))
+        path = os.path.join(directory, 'generated', f"note_{index:05d}.md")
+        with open(path, 'w') as f:
+            f.write(f"# Note {index}\n\n" + '\n\n'.join(sections) + '\n')
+
+
+def scan(directory):
+    """Scan a knowledge base directory once, without watching it."""
+    knowledge_base = KnowledgeBase(directory)
+    knowledge_base.refresh()
+    return knowledge_base
+
+
+def check_relevance(index, queries, k):
+    """
+    Run the relevance checks.
+
+    Args:
+        index (KnowledgeIndex): The index to search
+        queries (list): (expected source, question) pairs
+        k (int): Number of results searched
+
+    Returns:
+        tuple: (recall at k, mean reciprocal rank, failed questions)
+    """
+    found = 0
+    reciprocal_ranks = 0.0
+    failures = []
+    for source, query in queries:
+        sources = [result[1] for result in index.search(query, k)]
+        if source in sources:
+            found += 1
+            reciprocal_ranks += 1 / (sources.index(source) + 1)
+        else:
+            failures.append(f"{query!r}: expected {source}, got {sources}")
+    return found / len(queries), reciprocal_ranks / len(queries), failures
+
+
+def measure_latency(index, queries, k, rounds):
+    """
+    Time searches of every question.
+
+    Returns:
+        list: Sorted latencies in microseconds
+    """
+    latencies = []
+    for _ in range(rounds):
+        for _, query in queries:
+            start = time.perf_counter()
+            index.search(query, k)
+            latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return latencies
+
+
+def percentile(values, fraction):
+    """Get a percentile of sorted values."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    """Run the relevance checks and the latency benchmark."""
+    parser = argparse.ArgumentParser(description="Knowledge base retrieval benchmark")
+    parser.add_argument('--documents', type=int, default=1000, help="generated documents in the large corpus")
+    parser.add_argument('--k', type=int, default=2, help="results per search")
+    parser.add_argument('--rounds', type=int, default=200, help="timed searches of every question")
+    parser.add_argument('--queries', default=os.path.join(BENCHMARK_DIR, 'kb_relevance.txt'))
+    parser.add_argument('--max-p99-us', type=float, default=1000.0, help="allowed 99th percentile latency")
+    parser.add_argument('--min-recall', type=float, default=1.0,
+                        help="required share of checks ranked first in the knowledge base")
+    parser.add_argument('--min-corpus-recall', type=float, default=0.6,
+                        help="required share of checks in the top k of the generated corpus")
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries)
+    failed = False
+
+    index = KnowledgeIndex(index_path=None)
+    index.refresh(scan(KNOWLEDGE_BASE_DIR))
+    recall, mrr, failures = check_relevance(index, queries, 1)
+    print(f"Knowledge base: {len(index)} chunks, recall@1 {recall:.0%}")
+    for message in failures:
+        print(f"  miss {message}")
+    failed |= recall < args.min_recall
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        corpus_dir = os.path.join(temp_dir, 'knowledge_base')
+        shutil.copytree(KNOWLEDGE_BASE_DIR, corpus_dir)
+        os.makedirs(os.path.join(corpus_dir, 'generated'))
+        generate_corpus(corpus_dir, args.documents)
+        index_path = os.path.join(temp_dir, 'kb_index.json')
+
+        start = time.perf_counter()
+        knowledge_base = scan(corpus_dir)
+        scan_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        KnowledgeIndex(index_path).refresh(knowledge_base)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        loaded = KnowledgeIndex(index_path)
+        rebuilt = loaded.refresh(knowledge_base)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        documents = len(loaded.signature)
+        print(f"Corpus: {documents} documents, {len(loaded)} chunks, {len(loaded.postings)} terms, "
+              f"index file {os.path.getsize(index_path) / 1024:.0f} kB")
+        print(f"Scan {scan_ms:.1f} ms, build and save {build_ms:.0f} ms, load {load_ms:.0f} ms"
+              f"{' (rebuilt!)' if rebuilt else ''}")
+        failed |= rebuilt
+
+        recall, mrr, failures = check_relevance(loaded, queries, args.k)
+        print(f"Relevance in corpus: recall@{args.k} {recall:.0%}, MRR {mrr:.2f}")
+        for message in failures:
+            print(f"  miss {message}")
+        failed |= recall < args.min_corpus_recall
+
+        latencies = measure_latency(loaded, queries, args.k, args.rounds)
+        p99 = percentile(latencies, 0.99)
+        print(f"Search latency: p50 {percentile(latencies, 0.5):.0f} us, p95 {percentile(latencies, 0.95):.0f} us, "
+              f"p99 {p99:.0f} us, max {latencies[-1]:.0f} us")
+        if p99 > args.max_p99_us:
+            print(f"p99 latency exceeds {args.max_p99_us:.0f} us")
+            failed = True
+    finally:
+        shutil.rmtree(temp_dir)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Move ordering benchmark for the AI search.
+
+Searches a few fixed positions to the same depth with move ordering off and
+on, and reports nodes, beta cutoffs, the share of cutoffs caused by the
+first move tried and the search time.
+
+Usage:
+    python benchmarks/bench_move_ordering.py [depth]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2
+from ai_engine import AIEngine
+
+
+# Move sequences (0-based columns, player 1 starts) that leave player 2 to move
+POSITIONS = {
+    'opening': [3],
+    'early': [3, 3, 2, 4, 4],
+    'midgame': [3, 3, 2, 4, 4, 2, 1, 5, 5],
+    'tactical': [3, 2, 3, 3, 4, 2, 2, 4, 5, 6, 5],
+}
+
+
+def board_from_moves(moves):
+    """Build a NumPy board from a sequence of columns."""
+    board = np.zeros((ROWS, COLUMNS), dtype=int)
+    heights = [0] * COLUMNS
+    player = PLAYER_1
+    for column in moves:
+        board[ROWS - 1 - heights[column]][column] = player
+        heights[column] += 1
+        player = PLAYER_2 if player == PLAYER_1 else PLAYER_1
+    return board
+
+
+def main():
+    """Print the comparison table."""
+    parser = argparse.ArgumentParser(description="Move ordering benchmark for the AI search")
+    parser.add_argument('depth', nargs='?', type=int, default=7, help="fixed search depth")
+    depth = parser.parse_args().depth
+    print(f"Fixed depth {depth}")
+    print(f"{'position':<10} {'ordering':<9} {'nodes':>9} {'cutoffs':>8} {'first-move':>11} {'time s':>7}")
+    for name, moves in POSITIONS.items():
+        board = board_from_moves(moves)
+        for ordering in (False, True):
+            engine = AIEngine(move_ordering=ordering)
+            start = time.perf_counter()
+            engine.get_best_move(board, max_depth=depth)
+            elapsed = time.perf_counter() - start
+            rate = engine.first_move_cutoffs / engine.cutoffs if engine.cutoffs else 0.0
+            print(f"{name:<10} {'on' if ordering else 'off':<9} {engine.nodes:>9} {engine.cutoffs:>8} "
+                  f"{rate:>10.1%} {elapsed:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
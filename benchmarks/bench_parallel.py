@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Parallel search benchmark.
+
+Searches a fixed suite of positions to the same depth with 1 to N worker
+processes, reports the speedup over the single-process search and checks
+that every run finds the same root score as the single-process search.
+
+Usage:
+    python benchmarks/bench_parallel.py [depth] [max_workers]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from constants import PLAYER_1, PLAYER_2
+from ai_engine import AIEngine
+from parallel_search import ParallelSearch
+from bitboard import Position
+
+
+# Move strings (columns numbered from 1, player 1 first)
+POSITIONS = ['4', '443', '44354', '4435432', '443543226', '44354322615']
+
+
+def run_suite(workers, depth):
+    """
+    Search every suite position.
+
+    Args:
+        workers: Number of pool workers, or None for the single-process search
+        depth: Search depth
+
+    Returns:
+        tuple: (list of root scores, total seconds)
+    """
+    pool = None
+    if workers is not None:
+        pool = ParallelSearch(workers)
+        pool.start()
+        # Let every worker start up before timing
+        pool.search(Position.from_moves('1'), 1, PLAYER_2)
+
+    scores = []
+    total = 0.0
+    for moves in POSITIONS:
+        position = Position.from_moves(moves)
+        player = PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+        start = time.perf_counter()
+        if pool is None:
+            score, _ = AIEngine(book_path=None, ai_player=player, workers=1).search(position, max_depth=depth)
+        else:
+            pool.reset()
+            score, _ = pool.search(position, depth, player)
+        total += time.perf_counter() - start
+        scores.append(score)
+
+    if pool is not None:
+        pool.shutdown()
+    return scores, total
+
+
+def main():
+    """Print speedup and score agreement for each worker count."""
+    parser = argparse.ArgumentParser(description="Parallel search benchmark")
+    parser.add_argument('depth', nargs='?', type=int, default=9, help="fixed search depth")
+    parser.add_argument('max_workers', nargs='?', type=int, default=os.cpu_count() or 1,
+                        help="largest worker count measured (default: one per core)")
+    args = parser.parse_args()
+    depth = args.depth
+    max_workers = args.max_workers
+    print(f"Depth {depth}, {len(POSITIONS)} positions, {os.cpu_count()} cores available")
+
+    serial_scores, serial_time = run_suite(None, depth)
+    print(f"{'workers':>7} {'time s':>7} {'speedup':>8}  scores")
+    print(f"{'serial':>7} {serial_time:>7.2f} {1.0:>8.2f}  reference")
+    for workers in range(1, max_workers + 1):
+        scores, elapsed = run_suite(workers, depth)
+        status = "match" if scores == serial_scores else f"MISMATCH {scores}"
+        print(f"{workers:>7} {elapsed:>7.2f} {serial_time / elapsed:>8.2f}  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the exact solver.
+
+Solves every position of solver_positions.txt (ordered from endgame to
+early middle game) and checks the result against the known score.
+
+Each line of the position file holds a move string (columns numbered from
+1, player 1 moves first) and the exact score for the player to move.
+
+Usage:
+    python benchmarks/bench_solver.py [position_file]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+from bitboard import Position
+from solver import Solver, describe_score
+
+
+def load_positions(path):
+    """Read (moves, score) pairs, skipping blank lines and comments."""
+    positions = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                moves, score = line.split()
+                positions.append((moves, int(score)))
+    return positions
+
+
+def main():
+    """Solve all benchmark positions and print one line per position."""
+    parser = argparse.ArgumentParser(description="Benchmark for the exact solver")
+    parser.add_argument('position_file', nargs='?', default=os.path.join(BENCHMARK_DIR, 'solver_positions.txt'),
+                        help="file of move strings and their known scores")
+    path = parser.parse_args().position_file
+    solver = Solver()
+    failures = 0
+    
+    print(f"{'moves':>5} {'score':>6} {'result':<12} {'nodes':>9} {'time s':>7}  status")
+    for moves, expected in load_positions(path):
+        position = Position.from_moves(moves)
+        solver.reset()
+        solver.nodes = 0
+        start = time.perf_counter()
+        score = solver.solve(position)
+        elapsed = time.perf_counter() - start
+        status = "ok" if score == expected else f"FAILED (expected {expected})"
+        failures += score != expected
+        print(f"{len(moves):>5} {score:>6} {describe_score(score, len(moves)):<12} "
+              f"{solver.nodes:>9} {elapsed:>7.2f}  {status}")
+    
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
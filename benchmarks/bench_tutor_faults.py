@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tutor latency benchmark against a degraded service.
+
+Asks the tutor the same series of questions against the offline fake model
+behind a FaultInjectingModel, once per fault profile (healthy, flaky,
+stalling and down), and reports how the answers came out and their
+latency. The client runs with shortened timeouts so the script finishes in
+seconds. It exits with status 1 if any request takes longer than the
+client's deadline plus the margin.
+
+Usage:
+    python benchmarks/bench_tutor_faults.py [--questions 30] [--deadline 2.0] [--attempt-timeout 0.5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+# The fake tutor models are test doubles, kept with the tests
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests'))
+
+from fake_tutor_model import FakeStreamingModel, FaultInjectingModel
+from llm_tutor import LLMTutor
+from tutor_client import TutorClient, ModelBackend, CircuitBreaker
+
+
+# name -> FaultInjectingModel rates
+PROFILES = {
+    'healthy': {},
+    'flaky': {'error_rate': 0.3, 'stall_rate': 0.1, 'drop_rate': 0.05},
+    'stalling': {'stall_rate': 0.8},
+    'down': {'error_rate': 1.0},
+}
+
+QUESTIONS = [
+    "What should I do next?",
+    "How can I control the center?",
+    "What threats should I look for?",
+    "Should I block column 2?",
+]
+
+
+def percentile(values, fraction):
+    """Return the value at a fraction (0-1) of the sorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_profile(rates, args):
+    """
+    Ask the questions against one fault profile.
+
+    Returns:
+        tuple: (latencies in ms, Counter of answer sources, times the breaker opened)
+    """
+    model = FaultInjectingModel(FakeStreamingModel(first_chunk_delay=0.05, chunk_delay=0.002),
+                                stall_s=args.deadline * 2, seed=args.seed, **rates)
+    breaker = CircuitBreaker(reset_timeout_s=args.reset)
+    client = TutorClient(ModelBackend(model), deadline_s=args.deadline, attempt_timeout_s=args.attempt_timeout,
+                         backoff_s=0.05, breaker=breaker)
+    tutor = LLMTutor(model=model, client=client)
+    board = [[0] * 7 for _ in range(6)]
+
+    latencies = []
+    sources = Counter()
+    for index in range(args.questions):
+        question = QUESTIONS[index % len(QUESTIONS)]
+        start = time.perf_counter()
+        tutor.get_tutoring_response(board, "Control the center.", f"{question} ({index})")
+        latencies.append((time.perf_counter() - start) * 1000)
+        sources[tutor.last_request.source] += 1
+    tutor.close()
+    return latencies, sources, breaker.times_opened
+
+
+def main():
+    """Run every profile and print the latencies."""
+    parser = argparse.ArgumentParser(description="Tutor latency benchmark against a degraded service")
+    parser.add_argument('--questions', type=int, default=30, help="questions asked per profile")
+    parser.add_argument('--deadline', type=float, default=2.0, help="deadline of a request in seconds")
+    parser.add_argument('--attempt-timeout', type=float, default=0.5,
+                        help="wait for the first piece of an answer before retrying, in seconds")
+    parser.add_argument('--reset', type=float, default=1.0, help="seconds the circuit breaker stays open")
+    parser.add_argument('--margin', type=float, default=0.25, help="allowed time over the deadline in seconds")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the injected faults")
+    args = parser.parse_args()
+
+    rows = []
+    for name, rates in PROFILES.items():
+        latencies, sources, times_opened = run_profile(rates, args)
+        rows.append((name, latencies, sources, times_opened))
+
+    print(f"\n{'profile':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'opened':>6}  answers")
+    for name, latencies, sources, times_opened in rows:
+        answers = ', '.join(f"{source} {count}" for source, count in sorted(sources.items()))
+        print(f"{name:>8} {percentile(latencies, 0.5):>8.0f} {percentile(latencies, 0.99):>8.0f} "
+              f"{max(latencies):>8.0f} {times_opened:>6}  {answers}")
+
+    worst = max(max(latencies) for _, latencies, _, _ in rows)
+    limit = (args.deadline + args.margin) * 1000
+    print(f"Worst case {worst:.0f} ms (deadline {args.deadline * 1000:.0f} ms)")
+    sys.exit(1 if worst > limit else 0)
+
+
+if __name__ == "__main__":
+    main()
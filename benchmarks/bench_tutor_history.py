@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tutor request size benchmark.
+
+Asks the tutor a question after every move of back-to-back games against
+the offline fake model and reports the prompt tokens and latency of every
+request, next to the tokens the same conversation would cost if every full
+prompt were kept in the history. The script exits with status 1 if a
+request exceeds the token budget or the prompts of the last requests grow
+past the early ones by more than the threshold.
+
+Usage:
+    python benchmarks/bench_tutor_history.py [--questions 60] [--seed 0] [--threshold 0.25]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+# The fake tutor models are test doubles, kept with the tests
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests'))
+
+from constants import COLUMNS, TUTOR_TOKEN_BUDGET
+from chat_history import estimate_tokens
+from fake_tutor_model import FakeStreamingModel
+from game_model import GameModel
+from llm_tutor import LLMTutor
+
+
+QUESTIONS = [
+    "What should I do next?",
+    "How can I control the center?",
+    "What threats should I look for?",
+    "Why did the AI make that move?",
+    "Should I block column 2?",
+    "Am I winning?",
+    "How do I create two threats at once?",
+    "Is the edge a bad place to play?",
+]
+
+
+def play_random_move(game, rng):
+    """Play a random legal move for the player to move, starting a new game when one ends."""
+    if game.game_over or game.is_draw():
+        game.reset_game()
+    column = rng.choice([col for col in range(COLUMNS) if game.is_valid_location(col)])
+    player = game.current_player
+    game.make_move(column, player)
+    game.update_status(player)
+    game.switch_player()
+
+
+def main():
+    """Run the conversation and print the request sizes."""
+    parser = argparse.ArgumentParser(description="Tutor request size benchmark")
+    parser.add_argument('--questions', type=int, default=60, help="questions asked, one after every move")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the random moves")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed growth of the last ten prompts over requests 6-15")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tutor = LLMTutor(model=FakeStreamingModel(first_chunk_delay=0, chunk_delay=0))
+    knowledge_base = tutor.load_knowledge_base()
+    game = GameModel()
+    unbounded_history = 0
+    requests = []
+
+    print(f"{'request':>7} {'moves':>5} {'turns':>5} {'tokens':>7} {'unbounded':>9} {'first ms':>8} {'total ms':>8}")
+    for index in range(args.questions):
+        play_random_move(game, rng)
+        question = QUESTIONS[index % len(QUESTIONS)]
+        board = game.get_board_state()
+        strategy = tutor.find_relevant_strategy(question, knowledge_base)
+        answer = tutor.get_tutoring_response(board, strategy, question)
+        stats = tutor.last_request
+
+        prompt_tokens = estimate_tokens(tutor.build_prompt(board, strategy, question))
+        unbounded = unbounded_history + prompt_tokens
+        unbounded_history = unbounded + estimate_tokens(answer)
+        requests.append((stats, unbounded))
+        if index % 5 == 4 or index == 0:
+            print(f"{index + 1:>7} {len(game.moves):>5} {stats.history_turns:>5} {stats.prompt_tokens:>7} "
+                  f"{unbounded:>9} {stats.first_chunk_ms:>8.2f} {stats.total_ms:>8.2f}")
+    tutor.close()
+
+    tokens = [stats.prompt_tokens for stats, _ in requests]
+    print(f"Prompt tokens: min {min(tokens)}, max {max(tokens)} (budget {TUTOR_TOKEN_BUDGET}), "
+          f"unbounded history would reach {requests[-1][1]}")
+
+    failed = max(tokens) > TUTOR_TOKEN_BUDGET
+    if len(tokens) >= 25:
+        early = sum(tokens[5:15]) / 10
+        late = sum(tokens[-10:]) / 10
+        growth = (late - early) / early
+        print(f"Average of requests 6-15: {early:.0f} tokens, last 10: {late:.0f} tokens ({growth:+.1%})")
+        failed |= growth > args.threshold
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tutor prompt size benchmark.
+
+Builds the tutor prompt of a question for every position of
+engine_positions.txt and compares its estimated input tokens with the
+former prompt, which sent the text grid of GameModel.get_board_text() and
+the whole instruction block with every question. The new prompt's system
+instruction is counted separately: it is sent with every request, but as
+a fixed prefix outside the conversation. Also reports the time spent
+building the prompt, which includes the engine analysis.
+
+Usage:
+    python benchmarks/bench_tutor_prompt.py [--question "What should I do next?"]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+from chat_history import estimate_tokens
+from game_model import GameModel
+from prompt_builder import PromptBuilder, SYSTEM_INSTRUCTION
+from knowledge_loader import KnowledgeBase
+from knowledge_index import KnowledgeIndex
+from bench_engine import load_positions
+
+
+def legacy_prompt(board_state_text, relevant_strategy, user_query):
+    """The prompt the tutor sent before the compact format, for comparison."""
+    return f"""
+You are a helpful Connect 4 tutor using the Socratic method. Your goal is to guide the student to discover the answer themselves rather than giving direct answers.
+
+Current board state:
+{board_state_text}
+
+Relevant strategy information:
+{relevant_strategy}
+
+Student's question: {user_query}
+
+Instructions:
+1. Analyze the board state and the student's question
+2. Consider the relevant strategy information provided
+3. Instead of giving a direct answer, ask a guiding question that will help the student think through the problem
+4. Your response should be encouraging and educational
+5. Keep your response concise (2-3 sentences maximum)
+6. Focus on helping the student develop strategic thinking skills
+
+Remember: You are a tutor, not a coach. Guide the student to discover the answer through thoughtful questioning.
+"""
+
+
+def main():
+    """Compare the prompt sizes and print them per position category."""
+    parser = argparse.ArgumentParser(description="Tutor prompt size benchmark")
+    parser.add_argument('--question', default="What should I do next?")
+    parser.add_argument('--positions', default=os.path.join(BENCHMARK_DIR, 'engine_positions.txt'))
+    args = parser.parse_args()
+
+    knowledge_base = KnowledgeBase()
+    index = KnowledgeIndex(index_path=None)
+    knowledge_base.add_listener(index.refresh)
+    knowledge_base.refresh()
+    strategy = '\n\n'.join(f"## {heading or source}\n{text}" for _, source, heading, text in index.search(args.question))
+    strategy_tokens = estimate_tokens(strategy)
+
+    builder = PromptBuilder()
+    builder.build(GameModel().get_board_state(), strategy, args.question)  # Create the engine
+
+    print(f"{'category':<10} {'moves':<30} {'legacy':>7} {'compact':>8} {'board':>6} {'build ms':>9}")
+    legacy_total = compact_total = 0
+    positions = load_positions(args.positions)
+    for category, moves in positions:
+        game = GameModel.from_moves(moves)
+        board = game.get_board_state()
+        legacy = estimate_tokens(legacy_prompt(game.get_board_text(), strategy, args.question))
+        start = time.perf_counter()
+        prompt = builder.build(board, strategy, args.question)
+        build_ms = (time.perf_counter() - start) * 1000
+        compact = estimate_tokens(prompt)
+        board_tokens = estimate_tokens(prompt[:prompt.index('\n\nStrategy notes:')])
+        legacy_total += legacy
+        compact_total += compact
+        print(f"{category:<10} {moves or '-':<30} {legacy:>7} {compact:>8} {board_tokens:>6} {build_ms:>9.1f}")
+
+    count = len(positions)
+    system_tokens = estimate_tokens(SYSTEM_INSTRUCTION)
+    print(f"Strategy notes: {strategy_tokens} tokens in both prompts")
+    print(f"Average per question: legacy {legacy_total / count:.0f} tokens, compact {compact_total / count:.0f} "
+          f"tokens + {system_tokens} system instruction tokens "
+          f"({(compact_total / count + system_tokens) / (legacy_total / count) - 1:+.0%} in total, "
+          f"{compact_total / legacy_total - 1:+.0%} in the conversation)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,17 +6,20 @@ A comprehensive Connect 4 game with AI opponent and tutoring system.
 Built using MVC architecture with Pygame for the GUI and Google Gemini API for tutoring.
 """
 
+import argparse
 import sys
 import os
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from game_controller import GameController
+from constants import AI_DEPTH, OPENING_BOOK_PATH, OPENING_BOOK_PLY, OPENING_BOOK_DEPTH
 
 
-def main():
-    """Main function to start the Connect 4 AI Tutor game."""
+def play():
+    """Start the Connect 4 AI Tutor game."""
+    from game_controller import GameController
+    
     print("Starting Connect 4 AI Tutor...")
     print("Features:")
     print("- Play Connect 4 against an AI opponent")
@@ -40,5 +43,62 @@ def main():
         sys.exit(1)
 
 
+def build_book(args):
+    """Build the opening book used by the AI."""
+    from opening_book import build_opening_book
+    
+    print(f"Building opening book: ply < {args.ply}, search depth {args.depth}")
+    count = build_opening_book(args.output, max_ply=args.ply, depth=args.depth)
+    print(f"Wrote {count} positions to {args.output}")
+
+
+def selfplay(args):
+    """Play AI-vs-AI games without a display and write them as JSON lines."""
+    from selfplay import run_selfplay, side_settings
+    
+    player1 = side_settings(args.depth1, args.time1, args.book)
+    player2 = side_settings(args.depth2, args.time2, args.book)
+    if args.output == '-':
+        run_selfplay(args.games, sys.stdout, player1, player2, args.workers, args.opening_plies, args.seed)
+    else:
+        with open(args.output, 'w') as output:
+            run_selfplay(args.games, output, player1, player2, args.workers, args.opening_plies, args.seed)
+
+
+def main():
+    """Main function to start the Connect 4 AI Tutor game or one of its tools."""
+    parser = argparse.ArgumentParser(description="Connect 4 AI Tutor")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    book_parser = subparsers.add_parser('build-book', help="build the AI opening book")
+    book_parser.add_argument('--ply', type=int, default=OPENING_BOOK_PLY,
+                             help="store positions with fewer moves than this")
+    book_parser.add_argument('--depth', type=int, default=OPENING_BOOK_DEPTH,
+                             help="search depth for every book position")
+    book_parser.add_argument('--output', default=OPENING_BOOK_PATH, help="book file to write")
+    
+    selfplay_parser = subparsers.add_parser('selfplay', help="play AI-vs-AI games without a display")
+    selfplay_parser.add_argument('--games', type=int, default=100, help="number of games to play")
+    selfplay_parser.add_argument('--workers', type=int, default=0, help="worker processes (0 uses every core)")
+    selfplay_parser.add_argument('--output', default='-', help="JSON lines file to write (- for stdout)")
+    selfplay_parser.add_argument('--opening-plies', type=int, default=2,
+                                 help="random moves at the start of every game")
+    selfplay_parser.add_argument('--seed', type=int, default=0, help="seed of the first game's opening")
+    for player in (1, 2):
+        selfplay_parser.add_argument(f'--depth{player}', type=int, default=AI_DEPTH,
+                                     help=f"search depth of player {player}")
+        selfplay_parser.add_argument(f'--time{player}', type=int, default=None,
+                                     help=f"time per move of player {player} in ms (deepens up to its depth)")
+    selfplay_parser.add_argument('--book', action='store_true', help="let both sides use the opening book")
+    
+    args = parser.parse_args()
+    if args.command == 'build-book':
+        build_book(args)
+    elif args.command == 'selfplay':
+        selfplay(args)
+    else:
+        play()
+
+
 if __name__ == "__main__":
     main()
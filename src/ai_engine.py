@@ -1,12 +1,138 @@
+import time
 import numpy as np
-from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2, EMPTY, AI_DEPTH
+from constants import (ROWS, COLUMNS, PLAYER_1, PLAYER_2, AI_DEPTH, AI_TIME_LIMIT_MS, AI_WORKERS,
+                       AI_SEARCH_STATS, TT_SIZE, OPENING_BOOK_PATH)
+from bitboard import (Position, CENTER_MASK, CENTER_ORDER, COLUMN_MASKS, COLUMN_LIMITS, COLUMN_HEIGHT,
+                      BOTTOM_MASK, BOARD_MASK, popcount, winning_cells)
+from evaluation import IncrementalEvaluator, WINDOW_SCORES, CENTER_SCORE, WIN_SCORE
+from batch_evaluation import evaluate_bitboards
+from opening_book import OpeningBook
+from parallel_search import ParallelSearch
+import rules
+from search_stats import SearchStats
+from solver import Solver, describe_score
+from transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+
+INFINITY = float('inf')
+
+COLUMN_INDICES = tuple(range(COLUMNS))
+
+# Move ordering priorities, added on top of the history score
+HASH_MOVE_BONUS = 1 << 40
+BLOCK_BONUS = 1 << 36
+KILLER_BONUS = 1 << 32
+
+# Longest possible line of play, used to size the principal variation table
+MAX_PLY = ROWS * COLUMNS + 1
+
+# How many nodes are searched between two checks of the search budget
+BUDGET_CHECK_INTERVAL = 256
+
+
+class SearchAborted(Exception):
+    """Raised inside minimax when the search budget runs out or it is cancelled."""
 
 
 class AIEngine:
-    def __init__(self):
-        """Initialize the AI engine."""
-        self.ai_player = PLAYER_2
-        self.human_player = PLAYER_1
+    def __init__(self, tt_size=TT_SIZE, move_ordering=True, batch_leaves=False,
+                 book_path=OPENING_BOOK_PATH, ai_player=PLAYER_2, workers=AI_WORKERS,
+                 collect_stats=AI_SEARCH_STATS):
+        """
+        Initialize the AI engine.
+        
+        Args:
+            tt_size (int): Maximum transposition table entries, 0 to disable it
+            move_ordering (bool): Order moves by threats, hash move, killers
+                and history instead of plain column order
+            batch_leaves (bool): Score all children of depth-1 nodes with one
+                NumPy call instead of the incremental evaluator
+            book_path (str): Opening book file, or None to always search
+            ai_player (int): The player the engine plays for
+            workers (int): Worker processes for fixed-depth searches, 1 to
+                search in this process only, 0 to use every core
+            collect_stats (bool): Keep a SearchStats of every search in self.stats
+        """
+        self.ai_player = ai_player
+        self.human_player = 3 - ai_player
+        
+        # Opening moves come from the book when one has been built
+        self.opening_book = OpeningBook.load(book_path) if book_path else None
+        
+        # Exact solver, created on first use by solve_columns
+        self.solver = None
+        
+        # Fixed-depth searches are split over a process pool when enabled
+        self.parallel_search = None
+        if workers != 1:
+            self.parallel_search = ParallelSearch(workers, tt_size=tt_size, move_ordering=move_ordering,
+                                                  batch_leaves=batch_leaves)
+        
+        # Search results are kept between moves of the same game
+        self.transposition_table = TranspositionTable(tt_size) if tt_size else None
+        
+        # Heuristic scores of the position being searched, set by get_best_move
+        self.evaluator = IncrementalEvaluator()
+        
+        # Search budget, set by get_best_move
+        self.nodes = 0
+        self.deadline = None
+        self.node_limit = None
+        self.next_budget_check = 0
+        
+        # Event set by another thread to cancel the running search
+        self.stop_event = None
+        
+        # Results of ponder(): position key -> (depth, score, column)
+        self.ponder_results = {}
+        
+        # Principal variation of the last iteration, tried first by the next one
+        self.principal_variation = []
+        self.follow_pv = False
+        self.pv_table = [[0] * MAX_PLY for _ in range(MAX_PLY)]
+        self.pv_length = [0] * MAX_PLY
+        
+        # Preallocated per-ply buffers so the search creates no lists per node
+        self.move_buffers = [[0] * COLUMNS for _ in range(MAX_PLY)]
+        self.key_buffers = [[0] * COLUMNS for _ in range(MAX_PLY)]
+        
+        # Move ordering: two killer columns per ply and a history score per
+        # player and cell, raised whenever a move causes a beta cutoff
+        self.move_ordering = move_ordering
+        self.killers = [[-1, -1] for _ in range(MAX_PLY)]
+        self.history = [[0] * (COLUMNS * COLUMN_HEIGHT) for _ in range(3)]
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        
+        # Search telemetry, counted during every search and copied into a
+        # SearchStats at the end when collect_stats is set
+        self.collect_stats = collect_stats
+        self.stats = None
+        self.leaf_evaluations = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.max_ply_reached = 0
+        self.iterations = []
+        
+        # Buffers for scoring the children of depth-1 nodes in one batch
+        self.batch_leaves = batch_leaves
+        self.leaf_bitboards = np.zeros((3, COLUMNS), dtype=np.uint64)
+    
+    def reset(self):
+        """Forget everything learned during the current game."""
+        self.ponder_results.clear()
+        if self.transposition_table is not None:
+            self.transposition_table.clear()
+        for scores in self.history:
+            for cell in range(len(scores)):
+                scores[cell] = 0
+        if self.parallel_search is not None:
+            self.parallel_search.reset()
+    
+    def close(self):
+        """Stop any worker processes used by the search."""
+        if self.parallel_search is not None:
+            self.parallel_search.shutdown()
     
     def score_position(self, board, player):
         """
@@ -19,78 +145,35 @@ class AIEngine:
         Returns:
             int: Score for the position (positive favors the player)
         """
-        score = 0
-        
-        # Check for wins
-        if self.check_win(board, player):
-            return 1000000  # Very high score for win
-        if self.check_win(board, 3 - player):  # Opponent
-            return -1000000  # Very low score for opponent win
-        
-        # Score center column control
-        center_col = COLUMNS // 2
-        center_score = 0
-        for row in range(ROWS):
-            if board[row][center_col] == player:
-                center_score += 3
-            elif board[row][center_col] == 3 - player:
-                center_score -= 3
-        score += center_score
-        
-        # Score horizontal windows
-        score += self.evaluate_windows(board, player, 'horizontal')
-        
-        # Score vertical windows
-        score += self.evaluate_windows(board, player, 'vertical')
-        
-        # Score diagonal windows
-        score += self.evaluate_windows(board, player, 'diagonal')
-        
-        return score
+        return self.evaluate(Position.from_board(board), player)
     
-    def evaluate_windows(self, board, player, direction):
+    def evaluate(self, position, player):
         """
-        Evaluate all 4-piece windows in the specified direction.
+        Evaluate a bitboard position for the given player.
         
         Args:
-            board: The board state
+            position (Position): The position to evaluate
             player: The player to evaluate for
-            direction: 'horizontal', 'vertical', or 'diagonal'
             
         Returns:
-            int: Score for this direction
-        """
-        score = 0
-        opponent = 3 - player
-        
-        if direction == 'horizontal':
-            for row in range(ROWS):
-                for col in range(COLUMNS - 3):
-                    window = [board[row][col], board[row][col + 1], 
-                             board[row][col + 2], board[row][col + 3]]
-                    score += self.evaluate_window(window, player, opponent)
-        
-        elif direction == 'vertical':
-            for row in range(ROWS - 3):
-                for col in range(COLUMNS):
-                    window = [board[row][col], board[row + 1][col], 
-                             board[row + 2][col], board[row + 3][col]]
-                    score += self.evaluate_window(window, player, opponent)
-        
-        elif direction == 'diagonal':
-            # Positive diagonal
-            for row in range(ROWS - 3):
-                for col in range(COLUMNS - 3):
-                    window = [board[row][col], board[row + 1][col + 1], 
-                             board[row + 2][col + 2], board[row + 3][col + 3]]
-                    score += self.evaluate_window(window, player, opponent)
-            
-            # Negative diagonal
-            for row in range(3, ROWS):
-                for col in range(COLUMNS - 3):
-                    window = [board[row][col], board[row - 1][col + 1], 
-                             board[row - 2][col + 2], board[row - 3][col + 3]]
-                    score += self.evaluate_window(window, player, opponent)
+            int: Score for the position (positive favors the player)
+        """
+        own = position.bitboards[player]
+        opponent = position.bitboards[3 - player]
+        
+        # Check for wins
+        if position.has_won(player):
+            return WIN_SCORE  # Very high score for win
+        if position.has_won(3 - player):
+            return -WIN_SCORE  # Very low score for opponent win
+        
+        # Score center column control
+        score = CENTER_SCORE * (popcount(own & CENTER_MASK) - popcount(opponent & CENTER_MASK))
+        
+        # Score every horizontal, vertical and diagonal window
+        for window in rules.LINE_MASKS:
+            if not opponent & window:
+                score += WINDOW_SCORES[popcount(own & window)]
         
         return score
     
@@ -106,19 +189,8 @@ class AIEngine:
         Returns:
             int: Score for this window
         """
-        player_count = window.count(player)
-        opponent_count = window.count(opponent)
-        empty_count = window.count(EMPTY)
-        
-        if opponent_count == 0:
-            if player_count == 4:
-                return 100  # Win
-            elif player_count == 3:
-                return 5  # Strong threat
-            elif player_count == 2:
-                return 2  # Potential threat
-            elif player_count == 1:
-                return 1  # Minor advantage
+        if window.count(opponent) == 0:
+            return WINDOW_SCORES[window.count(player)]
         
         return 0  # No advantage or blocked
     
@@ -133,43 +205,7 @@ class AIEngine:
         Returns:
             bool: True if the player has won
         """
-        # Check horizontal
-        for row in range(ROWS):
-            for col in range(COLUMNS - 3):
-                if (board[row][col] == player and
-                    board[row][col + 1] == player and
-                    board[row][col + 2] == player and
-                    board[row][col + 3] == player):
-                    return True
-        
-        # Check vertical
-        for row in range(ROWS - 3):
-            for col in range(COLUMNS):
-                if (board[row][col] == player and
-                    board[row + 1][col] == player and
-                    board[row + 2][col] == player and
-                    board[row + 3][col] == player):
-                    return True
-        
-        # Check diagonal (positive slope)
-        for row in range(ROWS - 3):
-            for col in range(COLUMNS - 3):
-                if (board[row][col] == player and
-                    board[row + 1][col + 1] == player and
-                    board[row + 2][col + 2] == player and
-                    board[row + 3][col + 3] == player):
-                    return True
-        
-        # Check diagonal (negative slope)
-        for row in range(3, ROWS):
-            for col in range(COLUMNS - 3):
-                if (board[row][col] == player and
-                    board[row - 1][col + 1] == player and
-                    board[row - 2][col + 2] == player and
-                    board[row - 3][col + 3] == player):
-                    return True
-        
-        return False
+        return rules.check_win(board, player)
     
     def get_valid_locations(self, board):
         """
@@ -181,79 +217,315 @@ class AIEngine:
         Returns:
             list: List of valid column indices
         """
-        valid_locations = []
-        for col in range(COLUMNS):
-            if board[0][col] == EMPTY:
-                valid_locations.append(col)
-        return valid_locations
+        return rules.valid_locations(board)
     
-    def minimax(self, board, depth, alpha, beta, maximizing_player):
+    def minimax(self, position, depth, alpha, beta, maximizing_player, ply=0):
         """
         Minimax algorithm with alpha-beta pruning.
         
+        The position is modified in place while searching and restored
+        before returning, unless the search budget runs out. self.evaluator
+        must hold the scores of the position (get_best_move sets it up).
+        
         Args:
-            board: The board state
+            position (Position): The bitboard position
             depth: Current depth in the search tree
             alpha: Alpha value for pruning
             beta: Beta value for pruning
             maximizing_player: True if maximizing player's turn
+            ply: Distance from the root of the search
             
         Returns:
             tuple: (score, column) for the best move
+            
+        Raises:
+            SearchAborted: If the time or node budget is exhausted
         """
-        valid_locations = self.get_valid_locations(board)
+        self.nodes += 1
+        if self.nodes >= self.next_budget_check:
+            self.check_budget()
+        self.pv_length[ply] = ply
+        if ply > self.max_ply_reached:
+            self.max_ply_reached = ply
         
         # Terminal conditions
-        if self.check_win(board, self.ai_player):
-            return (1000000, None)
-        elif self.check_win(board, self.human_player):
-            return (-1000000, None)
-        elif len(valid_locations) == 0:
+        if position.has_won(self.ai_player):
+            return (WIN_SCORE, None)
+        elif position.has_won(self.human_player):
+            return (-WIN_SCORE, None)
+        elif position.is_full():
             return (0, None)
         elif depth == 0:
-            return (self.score_position(board, self.ai_player), None)
+            self.leaf_evaluations += 1
+            return (self.evaluator.scores[self.ai_player], None)
+        
+        # Transposition table lookup
+        table = self.transposition_table
+        hash_move = -1
+        if table is not None:
+            key = position.key()
+            mirror_key = position.mirror_key()
+            mirrored = mirror_key < key
+            if mirrored:
+                key = mirror_key
+            key = key * 2 + maximizing_player
+            slot = table.probe(key)
+            self.tt_probes += 1
+            if slot >= 0:
+                self.tt_hits += 1
+                hash_move = table.moves[slot]
+                if mirrored:
+                    hash_move = COLUMNS - 1 - hash_move
+                if table.depths[slot] >= depth:
+                    score = table.scores[slot]
+                    flag = table.flags[slot]
+                    if flag == EXACT:
+                        return (score, hash_move)
+                    elif flag == LOWER_BOUND:
+                        if score > alpha:
+                            alpha = score
+                    elif score < beta:
+                        beta = score
+                    if alpha >= beta:
+                        return (score, hash_move)
+        original_alpha = alpha
+        original_beta = beta
+        
+        # The previous iteration's best line is searched first
+        if self.follow_pv:
+            pv = self.principal_variation
+            if ply < len(pv) and position.can_play(pv[ply]):
+                hash_move = pv[ply]
+            else:
+                self.follow_pv = False
         
         if maximizing_player:
-            value = float('-inf')
-            column = valid_locations[0]
+            player = self.ai_player
+            win_score = WIN_SCORE
+        else:
+            player = self.human_player
+            win_score = -WIN_SCORE
+        
+        # Collect the playable columns into this ply's move buffer
+        moves = self.move_buffers[ply]
+        heights = position.heights
+        count = 0
+        if self.move_ordering:
+            occupied = position.occupied()
+            playable = (occupied + BOTTOM_MASK) & BOARD_MASK
             
-            for col in valid_locations:
-                # Make a copy of the board and make the move
-                temp_board = board.copy()
-                self.drop_piece(temp_board, col, self.ai_player)
-                
-                new_score, _ = self.minimax(temp_board, depth - 1, alpha, beta, False)
+            # Take an immediate win without searching any further
+            wins = winning_cells(position.bitboards[player], occupied) & playable
+            if wins:
+                column = ((wins & -wins).bit_length() - 1) // COLUMN_HEIGHT
+                self.pv_table[ply][ply] = column
+                self.pv_length[ply] = ply + 1
+                return (win_score, column)
+            
+            # Columns that stop an immediate win of the opponent
+            threats = winning_cells(position.bitboards[3 - player], occupied)
+            blocks = threats & playable
+            if depth >= 2:
+                # Any other move (or one right under an opponent's winning
+                # cell) loses at once, so only the rest needs searching
+                candidates = (blocks or playable) & ~(threats >> 1)
+                if not candidates:
+                    column = ((playable & -playable).bit_length() - 1) // COLUMN_HEIGHT
+                    return (-win_score, column)
+            else:
+                candidates = playable
+            
+            history = self.history[player]
+            killers = self.killers[ply]
+            keys = self.key_buffers[ply]
+            for col in CENTER_ORDER:
+                if candidates & COLUMN_MASKS[col]:
+                    sort_key = history[heights[col]]
+                    if col == hash_move:
+                        sort_key += HASH_MOVE_BONUS
+                    elif blocks & COLUMN_MASKS[col]:
+                        sort_key += BLOCK_BONUS
+                    elif col == killers[0]:
+                        sort_key += KILLER_BONUS + 1
+                    elif col == killers[1]:
+                        sort_key += KILLER_BONUS
+                    
+                    # Insertion sort, highest key first, center first on ties
+                    index = count
+                    while index > 0 and keys[index - 1] < sort_key:
+                        keys[index] = keys[index - 1]
+                        moves[index] = moves[index - 1]
+                        index -= 1
+                    keys[index] = sort_key
+                    moves[index] = col
+                    count += 1
+        else:
+            for col in COLUMN_INDICES:
+                if heights[col] < COLUMN_LIMITS[col]:
+                    moves[count] = col
+                    count += 1
+            if hash_move >= 0 and self.follow_pv:
+                index = 0
+                while moves[index] != hash_move:
+                    index += 1
+                while index > 0:
+                    moves[index] = moves[index - 1]
+                    index -= 1
+                moves[0] = hash_move
+        
+        evaluator = self.evaluator
+        column = moves[0]
+        index = 0
+        if depth == 1 and self.batch_leaves:
+            value, column = self.score_children(position, moves, count, player, maximizing_player)
+            self.pv_table[ply][ply] = column
+            self.pv_length[ply] = ply + 1
+        
+        elif maximizing_player:
+            value = -INFINITY
+            
+            while index < count:
+                col = moves[index]
+                index += 1
+                cell = position.play(col, player)
+                evaluator.add(cell, player)
+                new_score = self.minimax(position, depth - 1, alpha, beta, False, ply + 1)[0]
+                evaluator.remove(position.undo(), player)
+                self.follow_pv = False
                 
                 if new_score > value:
                     value = new_score
                     column = col
+                    self.update_pv(ply, col)
                 
-                alpha = max(alpha, value)
+                if value > alpha:
+                    alpha = value
                 if alpha >= beta:
+                    self.record_cutoff(ply, depth, player, col, cell, index)
                     break
-            
-            return (value, column)
         
         else:
-            value = float('inf')
-            column = valid_locations[0]
+            value = INFINITY
             
-            for col in valid_locations:
-                # Make a copy of the board and make the move
-                temp_board = board.copy()
-                self.drop_piece(temp_board, col, self.human_player)
-                
-                new_score, _ = self.minimax(temp_board, depth - 1, alpha, beta, True)
+            while index < count:
+                col = moves[index]
+                index += 1
+                cell = position.play(col, player)
+                evaluator.add(cell, player)
+                new_score = self.minimax(position, depth - 1, alpha, beta, True, ply + 1)[0]
+                evaluator.remove(position.undo(), player)
+                self.follow_pv = False
                 
                 if new_score < value:
                     value = new_score
                     column = col
+                    self.update_pv(ply, col)
                 
-                beta = min(beta, value)
+                if value < beta:
+                    beta = value
                 if alpha >= beta:
+                    self.record_cutoff(ply, depth, player, col, cell, index)
                     break
+        
+        if table is not None:
+            if value <= original_alpha:
+                flag = UPPER_BOUND
+            elif value >= original_beta:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            table.store(key, value, flag, depth, COLUMNS - 1 - column if mirrored else column)
+        
+        return (value, column)
+    
+    def score_children(self, position, moves, count, player, maximizing_player):
+        """
+        Score every child of a depth-1 node with one batched evaluation.
+        
+        Args:
+            position (Position): The bitboard position
+            moves: Buffer holding the columns to try
+            count: Number of columns in the buffer
+            player: The player to move
+            maximizing_player: True if maximizing player's turn
             
-            return (value, column)
+        Returns:
+            tuple: (score, column) for the best move
+        """
+        leaves = self.leaf_bitboards
+        draws = 0
+        for index in range(count):
+            position.play(moves[index], player)
+            leaves[PLAYER_1, index] = position.bitboards[PLAYER_1]
+            leaves[PLAYER_2, index] = position.bitboards[PLAYER_2]
+            if position.is_full() and not position.has_won(player):
+                draws |= 1 << index
+            position.undo()
+        self.nodes += count
+        self.leaf_evaluations += count
+        
+        scores = evaluate_bitboards(leaves[PLAYER_1, :count], leaves[PLAYER_2, :count], self.ai_player)
+        if draws:
+            for index in range(count):
+                if draws >> index & 1:
+                    scores[index] = 0
+        best = int(scores.argmax() if maximizing_player else scores.argmin())
+        return (int(scores[best]), moves[best])
+    
+    def record_cutoff(self, ply, depth, player, column, cell, move_number):
+        """
+        Count a beta cutoff and remember the move that caused it.
+        
+        Args:
+            ply: Distance from the root of the search
+            depth: Remaining depth of the node
+            player: The player to move at the node
+            column: The column that caused the cutoff
+            cell: Bit index of the cell the piece landed on
+            move_number: 1 if the first move searched caused the cutoff
+        """
+        self.cutoffs += 1
+        if move_number == 1:
+            self.first_move_cutoffs += 1
+        if self.move_ordering:
+            killers = self.killers[ply]
+            if killers[0] != column:
+                killers[1] = killers[0]
+                killers[0] = column
+            self.history[player][cell] += depth * depth
+    
+    def update_pv(self, ply, column):
+        """
+        Record a new best move and the line below it at the given ply.
+        
+        Args:
+            ply: Distance from the root of the search
+            column: The new best column
+        """
+        line = self.pv_table[ply]
+        child_line = self.pv_table[ply + 1]
+        line[ply] = column
+        length = self.pv_length[ply + 1]
+        for i in range(ply + 1, length):
+            line[i] = child_line[i]
+        self.pv_length[ply] = max(length, ply + 1)
+    
+    def check_budget(self):
+        """
+        Stop the search if its time or node budget is exhausted.
+        
+        Raises:
+            SearchAborted: If the budget is exhausted or the search was cancelled
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchAborted()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchAborted()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchAborted()
+        self.next_budget_check = self.nodes + BUDGET_CHECK_INTERVAL
+        if self.node_limit is not None:
+            self.next_budget_check = min(self.next_budget_check, self.node_limit)
     
     def drop_piece(self, board, column, player):
         """
@@ -264,20 +536,301 @@ class AIEngine:
             column: The column to drop the piece in
             player: The player making the move
         """
-        for row in range(ROWS - 1, -1, -1):
-            if board[row][column] == EMPTY:
-                board[row][column] = player
-                break
+        rules.drop_piece(board, column, player)
     
-    def get_best_move(self, board):
+    def get_best_move(self, board, time_limit_ms=AI_TIME_LIMIT_MS, node_limit=None, max_depth=None,
+                      stop_event=None):
         """
         Get the best move for the AI player.
         
+        Positions in the opening book are answered from the book. Otherwise,
+        without a time or node budget the search runs to a fixed depth
+        (AI_DEPTH unless max_depth is given). With a budget it deepens
+        iteratively until the budget runs out and returns the best move of
+        the last completed iteration.
+        
         Args:
             board: The current board state
+            time_limit_ms: Time budget in milliseconds, or None
+            node_limit: Maximum number of nodes to search, or None
+            max_depth: Deepest iteration to search, or None
+            stop_event (threading.Event): Cancels the search when set, or None
             
         Returns:
             int: The best column to move in
+            
+        Raises:
+            SearchAborted: If stop_event was set during the search
         """
-        _, column = self.minimax(board, AI_DEPTH, float('-inf'), float('inf'), True)
+        _, column = self.search(Position.from_board(board), time_limit_ms, node_limit, max_depth, stop_event)
         return column
+    
+    def solve_columns(self, board):
+        """
+        Solve a position exactly and describe the result of every column.
+        
+        Unlike get_best_move this plays perfectly, so it can take seconds in
+        the early middle game. The player to move is worked out from the
+        number of pieces (player 1 moves first).
+        
+        Args:
+            board: The current board state
+            
+        Returns:
+            list: For each column, a (score, description) tuple for the
+                player to move, e.g. (3, "win in 9"), or None if the column
+                is full or the game is already over
+        """
+        position = Position.from_board(board)
+        if position.has_won(PLAYER_1) or position.has_won(PLAYER_2) or position.is_full():
+            return [None] * COLUMNS
+        if self.solver is None:
+            self.solver = Solver()
+        
+        results = []
+        for score in self.solver.analyze(position):
+            if score is None:
+                results.append(None)
+            else:
+                results.append((score, describe_score(score, position.move_count)))
+        return results
+    
+    def score_columns(self, board, depth=None):
+        """
+        Score every column for the player to move with a fixed-depth search.
+        
+        The player to move is worked out from the number of pieces (player 1
+        moves first). The engine's own player is restored afterwards.
+        
+        Args:
+            board: The current board state
+            depth: Search depth of every column, or None for AI_DEPTH
+            
+        Returns:
+            list: For each column, the score of playing there for the player
+                to move (WIN_SCORE or more is a forced win, -WIN_SCORE or less
+                a forced loss within the depth), or None if the column is full
+                or the game is already over
+        """
+        position = Position.from_board(board)
+        if position.has_won(PLAYER_1) or position.has_won(PLAYER_2) or position.is_full():
+            return [None] * COLUMNS
+        
+        saved_players = (self.ai_player, self.human_player)
+        self.ai_player = PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+        self.human_player = 3 - self.ai_player
+        self.stop_event = None
+        try:
+            return [self.search_move(position, col, depth or AI_DEPTH) if position.can_play(col) else None
+                    for col in COLUMN_INDICES]
+        finally:
+            self.ai_player, self.human_player = saved_players
+    
+    def ponder(self, board, max_depth=None, stop_event=None):
+        """
+        Search the AI's answer to every reply of the human player in advance.
+        
+        Meant to run while the human is thinking. Each answer is stored in
+        ponder_results, and the searches fill the transposition table, so
+        the search after the human's actual move can reuse them. Replies
+        are searched center first, as the human is most likely to play there.
+        
+        Args:
+            board: The board state with the human player to move
+            max_depth: Search depth of every answer, or None for AI_DEPTH
+            stop_event (threading.Event): Stops pondering when set, or None
+            
+        Returns:
+            int: Number of replies whose answer was searched completely
+        """
+        position = Position.from_board(board)
+        self.ponder_results.clear()
+        if position.has_won(PLAYER_1) or position.has_won(PLAYER_2):
+            return 0
+        depth = max_depth or AI_DEPTH
+        
+        searched = 0
+        for col in CENTER_ORDER:
+            if not position.can_play(col):
+                continue
+            position.play(col, self.human_player)
+            try:
+                if not position.has_won(self.human_player) and not position.is_full():
+                    score, column = self.search(position, None, None, depth, stop_event)
+                    self.ponder_results[position.key()] = (depth, score, column)
+                    searched += 1
+            except SearchAborted:
+                break
+            finally:
+                position.undo()
+        return searched
+    
+    def search_move(self, position, column, depth, alpha=-INFINITY, stop_event=None):
+        """
+        Score a single root move of the AI player.
+        
+        Args:
+            position (Position): The root position (left unchanged)
+            column: The root move to score
+            depth: Search depth of the root
+            alpha: Best score already found for another root move
+            stop_event: Object whose is_set() cancels the search, or None
+            
+        Returns:
+            int: Score of the move, exact if above alpha, otherwise an upper bound
+            
+        Raises:
+            SearchAborted: If stop_event was set during the search
+        """
+        position = position.copy()
+        position.play(column, self.ai_player)
+        self.evaluator = IncrementalEvaluator.from_position(position)
+        self.nodes = 0
+        self.deadline = None
+        self.node_limit = None
+        self.stop_event = stop_event
+        self.next_budget_check = INFINITY if stop_event is None else BUDGET_CHECK_INTERVAL
+        self.follow_pv = False
+        for killers in self.killers:
+            killers[0] = killers[1] = -1
+        return self.minimax(position, depth - 1, alpha, INFINITY, False, 1)[0]
+    
+    def search(self, position, time_limit_ms=AI_TIME_LIMIT_MS, node_limit=None, max_depth=None,
+               stop_event=None):
+        """
+        Find the best move for the AI player in a bitboard position.
+        
+        Fixed-depth results found by ponder() for this position are reused
+        without searching again.
+        
+        Args:
+            position (Position): The position to search (left unchanged)
+            time_limit_ms: Time budget in milliseconds, or None
+            node_limit: Maximum number of nodes to search, or None
+            max_depth: Deepest iteration to search, or None
+            stop_event (threading.Event): Cancels the search when set, or None
+            
+        Returns:
+            tuple: (score, column) for the best move
+            
+        Raises:
+            SearchAborted: If stop_event was set during the search
+        """
+        start = time.perf_counter()
+        self.stop_event = stop_event
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.leaf_evaluations = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.max_ply_reached = 0
+        self.iterations = []
+        self.principal_variation = []
+        
+        result, source = self.run_search(position, time_limit_ms, node_limit, max_depth, stop_event)
+        
+        if self.collect_stats:
+            self.stats = SearchStats(
+                source, result[1], result[0], (time.perf_counter() - start) * 1000,
+                nodes=self.nodes,
+                leaf_evaluations=self.leaf_evaluations,
+                cutoffs=self.cutoffs,
+                first_move_cutoffs=self.first_move_cutoffs,
+                max_ply=self.max_ply_reached,
+                tt_probes=self.tt_probes,
+                tt_hits=self.tt_hits,
+                iterations=self.iterations,
+                principal_variation=self.principal_variation,
+            )
+        return result
+    
+    def run_search(self, position, time_limit_ms, node_limit, max_depth, stop_event):
+        """
+        Find the best move once search() has reset the counters.
+        
+        Args:
+            position (Position): The position to search (left unchanged)
+            time_limit_ms: Time budget in milliseconds, or None
+            node_limit: Maximum number of nodes to search, or None
+            max_depth: Deepest iteration to search, or None
+            stop_event (threading.Event): Cancels the search when set, or None
+            
+        Returns:
+            tuple: ((score, column), source) where source is "book", "ponder",
+                "parallel" or "search"
+        """
+        if self.opening_book is not None:
+            entry = self.opening_book.lookup(position, self.ai_player)
+            if entry is not None:
+                column, score = entry
+                self.principal_variation = [column]
+                return ((score, column), 'book')
+        
+        if time_limit_ms is None and node_limit is None:
+            entry = self.ponder_results.get(position.key())
+            if entry is not None and entry[0] >= (max_depth or AI_DEPTH):
+                _, score, column = entry
+                self.principal_variation = [column]
+                return ((score, column), 'ponder')
+        
+        position = position.copy()
+        self.evaluator = IncrementalEvaluator.from_position(position)
+        
+        # Killers only apply to this search, older history counts for less
+        for killers in self.killers:
+            killers[0] = killers[1] = -1
+        for scores in self.history:
+            for cell in range(len(scores)):
+                scores[cell] >>= 1
+        
+        start = time.perf_counter()
+        if time_limit_ms is None and node_limit is None and self.parallel_search is not None:
+            depth = max_depth or AI_DEPTH
+            if not position.is_full() and not position.has_won(PLAYER_1) and not position.has_won(PLAYER_2):
+                result = self.parallel_search.search(position, depth, self.ai_player, stop_event=stop_event)
+                if result is None:
+                    raise SearchAborted()
+                self.nodes = self.parallel_search.nodes
+                self.principal_variation = [result[1]]
+                self.iterations.append((depth, (time.perf_counter() - start) * 1000, self.nodes))
+                return (result, 'parallel')
+        
+        if time_limit_ms is None and node_limit is None:
+            self.deadline = None
+            self.node_limit = None
+            self.next_budget_check = INFINITY if stop_event is None else BUDGET_CHECK_INTERVAL
+            self.follow_pv = False
+            depth = max_depth or AI_DEPTH
+            result = self.minimax(position, depth, -INFINITY, INFINITY, True)
+            self.principal_variation = self.pv_table[0][:self.pv_length[0]]
+            self.iterations.append((depth, (time.perf_counter() - start) * 1000, self.nodes))
+            return (result, 'search')
+        
+        self.deadline = None if time_limit_ms is None else start + time_limit_ms / 1000.0
+        self.node_limit = node_limit
+        if max_depth is None:
+            max_depth = ROWS * COLUMNS - position.move_count
+        
+        result = (0, None)
+        for depth in range(1, max_depth + 1):
+            # The first iteration always completes so there is a move to return
+            self.next_budget_check = INFINITY if depth == 1 else self.nodes
+            self.follow_pv = True
+            iteration_start = time.perf_counter()
+            iteration_nodes = self.nodes
+            try:
+                result = self.minimax(position, depth, -INFINITY, INFINITY, True)
+            except SearchAborted:
+                if stop_event is not None and stop_event.is_set():
+                    raise
+                break
+            self.principal_variation = self.pv_table[0][:self.pv_length[0]]
+            self.iterations.append((depth, (time.perf_counter() - iteration_start) * 1000,
+                                    self.nodes - iteration_nodes))
+            
+            # A forced win or loss will not change with more depth
+            if abs(result[0]) >= WIN_SCORE:
+                break
+        
+        return (result, 'search')
@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AIWorker:
+    """
+    Runs AI searches on a background thread so the game loop stays responsive.
+
+    Jobs run one at a time in submission order on a single thread that owns
+    the engine, so a cancelled search has always stopped before the next job
+    (including an engine reset) touches the engine.
+    """
+
+    def __init__(self, ai_engine):
+        """
+        Initialize the worker.
+
+        Args:
+            ai_engine (AIEngine): The engine to search with
+        """
+        self.ai_engine = ai_engine
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai-search')
+        self.stop_event = None
+
+    def request_move(self, board, **search_options):
+        """
+        Start searching for the AI's move, cancelling any running search.
+
+        Args:
+            board: The board state to search (copied by the caller)
+            **search_options: Keyword arguments for AIEngine.get_best_move
+
+        Returns:
+            concurrent.futures.Future: Resolves to the best column, or raises
+                SearchAborted if the search is cancelled
+        """
+        self.cancel()
+        self.stop_event = threading.Event()
+        return self.executor.submit(self.ai_engine.get_best_move, board,
+                                    stop_event=self.stop_event, **search_options)
+
+    def ponder(self, board, **ponder_options):
+        """
+        Start searching the answers to the human's replies, cancelling any
+        running search.
+
+        Args:
+            board: The board state with the human to move (copied by the caller)
+            **ponder_options: Keyword arguments for AIEngine.ponder
+
+        Returns:
+            concurrent.futures.Future: Resolves to the number of replies searched
+        """
+        self.cancel()
+        self.stop_event = threading.Event()
+        return self.executor.submit(self.ai_engine.ponder, board,
+                                    stop_event=self.stop_event, **ponder_options)
+
+    def cancel(self):
+        """Stop the running search, if any. Its result must be ignored."""
+        if self.stop_event is not None:
+            self.stop_event.set()
+            self.stop_event = None
+
+    def reset(self):
+        """Cancel the running search and make the engine forget the game."""
+        self.cancel()
+        self.executor.submit(self.ai_engine.reset)
+
+    def shutdown(self):
+        """Cancel the running search and wait for the thread to finish."""
+        self.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)
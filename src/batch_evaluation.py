@@ -0,0 +1,96 @@
+import numpy as np
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2
+from bitboard import COLUMN_HEIGHT, cell_bit
+from rules import LINE_MASKS, NUM_CELLS
+from evaluation import WINDOW_SCORES, CENTER_SCORE, WIN_SCORE
+
+
+def _build_window_cells():
+    """Build the flat board indices of the four cells of every window."""
+    windows = []
+    for mask in LINE_MASKS:
+        cells = []
+        for bit in range(NUM_CELLS):
+            if mask >> bit & 1:
+                row = ROWS - 1 - bit % COLUMN_HEIGHT
+                col = bit // COLUMN_HEIGHT
+                cells.append(row * COLUMNS + col)
+        windows.append(cells)
+    return np.array(windows, dtype=np.intp)
+
+
+# (number of windows, 4) flat indices into a ROWS * COLUMNS board
+WINDOW_CELLS = _build_window_cells()
+
+WINDOW_SCORE_TABLE = np.array(WINDOW_SCORES, dtype=np.int64)
+
+# Bit index of every board cell, for unpacking bitboards
+CELL_BITS = np.array([[cell_bit(row, col) for col in range(COLUMNS)] for row in range(ROWS)],
+                     dtype=np.uint64)
+
+
+def evaluate_boards(boards, player):
+    """
+    Evaluate a stack of boards at once for the given player.
+    
+    Gives the same scores as AIEngine.score_position for every board,
+    including the win and loss scores.
+    
+    Args:
+        boards: Array of shape (N, ROWS, COLUMNS) holding board states
+        player (int): The player to evaluate for
+        
+    Returns:
+        numpy.ndarray: N int64 scores (positive favors the player)
+    """
+    boards = np.asarray(boards)
+    flat = boards.reshape(boards.shape[0], ROWS * COLUMNS)
+    windows = flat[:, WINDOW_CELLS]  # (N, windows, 4)
+    own_counts = np.count_nonzero(windows == player, axis=2)
+    opponent_counts = np.count_nonzero(windows == 3 - player, axis=2)
+    
+    # Windows only count while the opponent has no piece in them
+    window_scores = np.where(opponent_counts == 0, WINDOW_SCORE_TABLE[own_counts], 0).sum(axis=1)
+    
+    center = boards[:, :, COLUMNS // 2]
+    center_scores = CENTER_SCORE * (np.count_nonzero(center == player, axis=1) -
+                                    np.count_nonzero(center == 3 - player, axis=1))
+    scores = window_scores + center_scores
+    
+    scores = np.where((opponent_counts == 4).any(axis=1), -WIN_SCORE, scores)
+    scores = np.where((own_counts == 4).any(axis=1), WIN_SCORE, scores)
+    return scores.astype(np.int64)
+
+
+def boards_from_bitboards(player1_bits, player2_bits):
+    """
+    Unpack arrays of bitboards into a stack of boards.
+    
+    Args:
+        player1_bits: Array of player 1 bitboards (convertible to uint64)
+        player2_bits: Array of player 2 bitboards (convertible to uint64)
+        
+    Returns:
+        numpy.ndarray: Array of shape (N, ROWS, COLUMNS) (row 0 is the top row)
+    """
+    player1_bits = np.asarray(player1_bits, dtype=np.uint64)[:, None, None]
+    player2_bits = np.asarray(player2_bits, dtype=np.uint64)[:, None, None]
+    one = np.uint64(1)
+    boards = ((player1_bits >> CELL_BITS) & one).astype(np.int8) * PLAYER_1
+    boards += ((player2_bits >> CELL_BITS) & one).astype(np.int8) * PLAYER_2
+    return boards
+
+
+def evaluate_bitboards(player1_bits, player2_bits, player):
+    """
+    Evaluate arrays of bitboard positions at once for the given player.
+    
+    Args:
+        player1_bits: Array of player 1 bitboards
+        player2_bits: Array of player 2 bitboards
+        player (int): The player to evaluate for
+        
+    Returns:
+        numpy.ndarray: N int64 scores (positive favors the player)
+    """
+    return evaluate_boards(boards_from_bitboards(player1_bits, player2_bits), player)
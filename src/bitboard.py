@@ -0,0 +1,368 @@
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2, EMPTY
+
+
+# Each column occupies COLUMN_HEIGHT consecutive bits, bottom cell first.
+# The extra sentinel bit on top of every column is always empty so that
+# shifts used for win detection never wrap from one column into the next.
+COLUMN_HEIGHT = ROWS + 1
+
+BOTTOM_MASK = sum(1 << (col * COLUMN_HEIGHT) for col in range(COLUMNS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+COLUMN_MASKS = tuple(((1 << ROWS) - 1) << (col * COLUMN_HEIGHT) for col in range(COLUMNS))
+CENTER_MASK = COLUMN_MASKS[COLUMNS // 2]
+
+# Bit index just above the top cell of every column (a full column's height)
+COLUMN_LIMITS = tuple(col * COLUMN_HEIGHT + ROWS for col in range(COLUMNS))
+
+# Distance in bits from a column to its mirror image (column COLUMNS - 1 - col)
+MIRROR_OFFSETS = tuple((COLUMNS - 1 - 2 * col) * COLUMN_HEIGHT for col in range(COLUMNS))
+
+# Static move order: center column first, then outwards
+CENTER_ORDER = tuple(sorted(range(COLUMNS), key=lambda col: abs(col - COLUMNS // 2)))
+
+
+def cell_bit(row, col):
+    """
+    Get the bit index of a board cell.
+
+    Args:
+        row (int): Row in board coordinates (0 is the top row)
+        col (int): Column index
+
+    Returns:
+        int: Index of the bit representing the cell
+    """
+    return col * COLUMN_HEIGHT + (ROWS - 1 - row)
+
+
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:  # Python < 3.10
+    def popcount(bits):
+        """Count the set bits of a non-negative integer."""
+        return bin(bits).count('1')
+
+
+def has_alignment(bits):
+    """
+    Check whether a player's bitboard contains four in a row.
+
+    Args:
+        bits (int): Bitboard holding one player's pieces
+
+    Returns:
+        bool: True if the pieces contain a line of four
+    """
+    # Horizontal
+    m = bits & (bits >> COLUMN_HEIGHT)
+    if m & (m >> (2 * COLUMN_HEIGHT)):
+        return True
+
+    # Diagonal (one direction)
+    m = bits & (bits >> (COLUMN_HEIGHT - 1))
+    if m & (m >> (2 * (COLUMN_HEIGHT - 1))):
+        return True
+
+    # Diagonal (other direction)
+    m = bits & (bits >> (COLUMN_HEIGHT + 1))
+    if m & (m >> (2 * (COLUMN_HEIGHT + 1))):
+        return True
+
+    # Vertical
+    m = bits & (bits >> 1)
+    if m & (m >> 2):
+        return True
+
+    return False
+
+
+def winning_cells(bits, occupied):
+    """
+    Find the empty cells that would complete four in a row for a player.
+
+    Args:
+        bits (int): Bitboard holding the player's pieces
+        occupied (int): Bitboard of all occupied cells
+
+    Returns:
+        int: Bitmask of empty cells (playable or not) that win for the player
+    """
+    # Vertical: three pieces directly below
+    cells = (bits << 1) & (bits << 2) & (bits << 3)
+
+    for shift in (COLUMN_HEIGHT, COLUMN_HEIGHT - 1, COLUMN_HEIGHT + 1):
+        pair = (bits << shift) & (bits << (2 * shift))
+        cells |= pair & (bits << (3 * shift))
+        cells |= pair & (bits >> shift)
+        pair = (bits >> shift) & (bits >> (2 * shift))
+        cells |= pair & (bits << shift)
+        cells |= pair & (bits >> (3 * shift))
+
+    return cells & (BOARD_MASK ^ occupied)
+
+
+class Position:
+    """
+    A Connect 4 position stored as one integer bitboard per player.
+
+    Column heights are tracked as the index of the next free bit in each
+    column, so dropping a piece is a single shift and or. The left-right
+    mirror image of both bitboards is maintained alongside so symmetric
+    positions can share one canonical key. Played columns go on a
+    preallocated move stack so undo() needs no arguments.
+    """
+
+    __slots__ = ('bitboards', 'mirrored', 'heights', 'moves', 'move_count')
+
+    def __init__(self):
+        """Initialize an empty position."""
+        self.bitboards = [0, 0, 0]  # Indexed by player number
+        self.mirrored = [0, 0, 0]
+        self.heights = [col * COLUMN_HEIGHT for col in range(COLUMNS)]
+        self.moves = [0] * (ROWS * COLUMNS)
+        self.move_count = 0
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Build a position from a 2D board such as GameModel.get_board_state().
+
+        The board does not record the order of the moves, so the move stack
+        is filled column by column.
+
+        Args:
+            board: The board state (row 0 is the top row), or a
+                BoardSnapshot, whose bitboards are used directly
+
+        Returns:
+            Position: The equivalent bitboard position
+        """
+        player1_bits = getattr(board, 'player1_bits', None)
+        if player1_bits is not None:
+            return cls.from_bitboards(player1_bits, board.player2_bits)
+        position = cls()
+        for col in range(COLUMNS):
+            for row in range(ROWS - 1, -1, -1):
+                piece = board[row][col]
+                if piece == EMPTY:
+                    break
+                position.play(col, int(piece))
+        return position
+
+    @classmethod
+    def from_bitboards(cls, player1_bits, player2_bits):
+        """
+        Build a position from one bitboard per player in this layout.
+
+        The move stack is filled column by column, as in from_board.
+
+        Args:
+            player1_bits (int): Bitboard of player 1's pieces
+            player2_bits (int): Bitboard of player 2's pieces
+
+        Returns:
+            Position: The position
+        """
+        position = cls()
+        occupied = player1_bits | player2_bits
+        for col in range(COLUMNS):
+            cell = col * COLUMN_HEIGHT
+            while occupied >> cell & 1:
+                position.play(col, PLAYER_1 if player1_bits >> cell & 1 else PLAYER_2)
+                cell += 1
+        return position
+
+    @classmethod
+    def from_moves(cls, moves):
+        """
+        Build a position by playing a move string from an empty board.
+
+        Args:
+            moves (str): Columns numbered from 1, e.g. "4453" (player 1
+                moves first)
+
+        Returns:
+            Position: The resulting position
+
+        Raises:
+            ValueError: If a move is not a playable column or is played
+                after the game is over
+        """
+        position = cls()
+        player = PLAYER_1
+        for index, char in enumerate(moves):
+            column = ord(char) - ord('1')
+            if not 0 <= column < COLUMNS or not position.can_play(column):
+                raise ValueError(f"Invalid move {char!r} at position {index + 1} of {moves!r}")
+            if position.has_won(PLAYER_1) or position.has_won(PLAYER_2):
+                raise ValueError(f"Move {index + 1} of {moves!r} is played after the game is over")
+            position.play(column, player)
+            player = PLAYER_2 if player == PLAYER_1 else PLAYER_1
+        return position
+
+    def to_board(self):
+        """
+        Convert the position back to a nested list board.
+
+        Returns:
+            list: ROWS x COLUMNS list of lists (row 0 is the top row)
+        """
+        board = [[EMPTY] * COLUMNS for _ in range(ROWS)]
+        for row in range(ROWS):
+            for col in range(COLUMNS):
+                bit = 1 << cell_bit(row, col)
+                if self.bitboards[PLAYER_1] & bit:
+                    board[row][col] = PLAYER_1
+                elif self.bitboards[PLAYER_2] & bit:
+                    board[row][col] = PLAYER_2
+        return board
+
+    def copy(self):
+        """
+        Create an independent copy of the position.
+
+        Returns:
+            Position: The copied position
+        """
+        position = Position.__new__(Position)
+        position.bitboards = self.bitboards[:]
+        position.mirrored = self.mirrored[:]
+        position.heights = self.heights[:]
+        position.moves = self.moves[:]
+        position.move_count = self.move_count
+        return position
+
+    def can_play(self, column):
+        """
+        Check if a piece can be dropped in a column.
+
+        Args:
+            column (int): The column to check
+
+        Returns:
+            bool: True if the column is not full
+        """
+        return self.heights[column] < COLUMN_LIMITS[column]
+
+    def play(self, column, player):
+        """
+        Drop a piece for the given player. The column must be playable.
+
+        Args:
+            column (int): The column to play in
+            player (int): The player making the move
+
+        Returns:
+            int: Bit index of the cell the piece landed on
+        """
+        height = self.heights[column]
+        self.bitboards[player] |= 1 << height
+        self.mirrored[player] |= 1 << (height + MIRROR_OFFSETS[column])
+        self.heights[column] = height + 1
+        self.moves[self.move_count] = column
+        self.move_count += 1
+        return height
+
+    def undo(self):
+        """
+        Take back the last move played.
+
+        Returns:
+            int: Bit index of the cell that was emptied
+        """
+        self.move_count -= 1
+        column = self.moves[self.move_count]
+        height = self.heights[column] - 1
+        self.heights[column] = height
+        player = PLAYER_1 if self.bitboards[PLAYER_1] >> height & 1 else PLAYER_2
+        self.bitboards[player] ^= 1 << height
+        self.mirrored[player] ^= 1 << (height + MIRROR_OFFSETS[column])
+        return height
+
+    def last_move(self):
+        """
+        Get the column of the last move played.
+
+        Returns:
+            int: The column, or None if the board is empty
+        """
+        if self.move_count == 0:
+            return None
+        return self.moves[self.move_count - 1]
+
+    def has_won(self, player):
+        """
+        Check if the given player has four in a row.
+
+        Args:
+            player (int): The player to check
+
+        Returns:
+            bool: True if the player has won
+        """
+        return has_alignment(self.bitboards[player])
+
+    def occupied(self):
+        """
+        Get the bitmask of all occupied cells.
+
+        Returns:
+            int: Bitmask of cells holding a piece of either player
+        """
+        return self.bitboards[PLAYER_1] | self.bitboards[PLAYER_2]
+
+    def valid_moves_mask(self):
+        """
+        Get the bitmask of cells where the next piece of each column lands.
+
+        Returns:
+            int: One bit per playable column
+        """
+        return (self.occupied() + BOTTOM_MASK) & BOARD_MASK
+
+    def is_full(self):
+        """
+        Check if every cell is occupied.
+
+        Returns:
+            bool: True if no more moves can be made
+        """
+        return self.move_count == ROWS * COLUMNS
+
+    def key(self):
+        """
+        Get a unique integer key for the position.
+
+        Adding the bottom row to the occupied cells sets one marker bit above
+        each column's pieces, so player 1's pieces plus that value identify
+        both players' pieces.
+
+        Returns:
+            int: The position key
+        """
+        own = self.bitboards[PLAYER_1]
+        return own + (own | self.bitboards[PLAYER_2]) + BOTTOM_MASK
+
+    def mirror_key(self):
+        """
+        Get the key of the position's left-right mirror image.
+
+        Returns:
+            int: The mirrored position key
+        """
+        own = self.mirrored[PLAYER_1]
+        return own + (own | self.mirrored[PLAYER_2]) + BOTTOM_MASK
+
+    def canonical_key(self):
+        """
+        Get the smaller of the keys of the position and its mirror image.
+
+        Returns:
+            tuple: (key, mirrored) where mirrored is True if the key belongs
+                to the mirror image, so stored columns must be flipped
+        """
+        key = self.key()
+        mirror_key = self.mirror_key()
+        if mirror_key < key:
+            return (mirror_key, True)
+        return (key, False)
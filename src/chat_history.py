@@ -0,0 +1,143 @@
+import re
+import threading
+from collections import deque
+from constants import TUTOR_HISTORY_TURNS, TUTOR_TOKEN_BUDGET, TUTOR_SUMMARY_TOKENS
+
+
+FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(\s|$)", re.S)
+
+
+def estimate_tokens(text):
+    """
+    Estimate the number of model tokens of a text without calling the API.
+
+    Args:
+        text (str): Any text
+
+    Returns:
+        int: About one token per four characters, as for English text
+    """
+    return (len(text) + 3) // 4
+
+
+def count_tokens(contents, system_instruction=''):
+    """
+    Estimate the tokens of a conversation.
+
+    Args:
+        contents (list): Messages as {'role': ..., 'parts': [text]} dicts
+        system_instruction (str): The model's system instruction, which is
+            sent with every request
+
+    Returns:
+        int: Estimated tokens of the system instruction and all message parts
+    """
+    return estimate_tokens(system_instruction) + sum(
+        estimate_tokens(part) for message in contents for part in message['parts'])
+
+
+class ChatHistory:
+    """
+    Bounded conversation history of the tutor.
+
+    Only the last few turns are sent with a question, and only as question
+    and answer: the board and strategy text of a turn belong to a position
+    that is gone, so they are never kept. Turns that leave the window are
+    compacted into a short summary of what the student asked earlier. If a
+    request would still exceed the token budget, its oldest turns and then
+    the summary are left out. The system instruction of the model is sent
+    with every request, so it counts towards the budget.
+
+    The history is safe to use from the tutor worker threads.
+    """
+
+    def __init__(self, max_turns=TUTOR_HISTORY_TURNS, token_budget=TUTOR_TOKEN_BUDGET,
+                 summary_tokens=TUTOR_SUMMARY_TOKENS, system_instruction=''):
+        """
+        Initialize an empty history.
+
+        Args:
+            max_turns (int): Question/answer pairs kept word for word
+            token_budget (int): Estimated tokens allowed per request
+            summary_tokens (int): Estimated tokens allowed for the summary
+            system_instruction (str): The model's system instruction
+        """
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.system_instruction = system_instruction
+        self.turns = deque()
+        # One short line per compacted turn, oldest first
+        self.summary_items = deque()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.turns)
+
+    @property
+    def summary(self):
+        """Summary of the turns that left the window ("" if none did)."""
+        if not self.summary_items:
+            return ""
+        return "Earlier in this session: " + ' '.join(self.summary_items)
+
+    def add_turn(self, question, answer):
+        """
+        Add a completed question and answer.
+
+        Args:
+            question (str): The student's question, without board or strategy
+            answer (str): The tutor's complete answer
+        """
+        with self.lock:
+            self.turns.append((question, answer))
+            while len(self.turns) > self.max_turns:
+                self.compact(*self.turns.popleft())
+
+    def compact(self, question, answer):
+        """Add a turn to the summary, dropping the oldest items beyond its budget (lock held)."""
+        match = FIRST_SENTENCE.match(answer.strip())
+        gist = (match.group(1) if match else answer.strip())[:120]
+        self.summary_items.append(f'The student asked "{question.strip()[:120]}" and the tutor replied: {gist}')
+        while len(self.summary_items) > 1 and estimate_tokens(self.summary) > self.summary_tokens:
+            self.summary_items.popleft()
+
+    def build_contents(self, prompt):
+        """
+        Build the messages of a request.
+
+        Args:
+            prompt (str): The full prompt of the new question
+
+        Returns:
+            tuple: (contents, turns) where contents are the messages to send
+                and turns is the number of earlier turns included
+        """
+        with self.lock:
+            turns = list(self.turns)
+            summary = self.summary
+
+        while True:
+            contents = []
+            for question, answer in turns:
+                contents.append({'role': 'user', 'parts': [f"Student's question: {question}"]})
+                contents.append({'role': 'model', 'parts': [answer]})
+            contents.append({'role': 'user', 'parts': [prompt]})
+            if summary:
+                first = contents[0]['parts'][0]
+                contents[0] = {'role': 'user', 'parts': [f"({summary})\n\n{first}"]}
+            if count_tokens(contents, self.system_instruction) <= self.token_budget:
+                break
+            if turns:
+                turns.pop(0)
+            elif summary:
+                summary = ""
+            else:
+                break  # The prompt alone is over budget, send it anyway
+        return contents, len(turns)
+
+    def clear(self):
+        """Forget the conversation."""
+        with self.lock:
+            self.turns.clear()
+            self.summary_items.clear()
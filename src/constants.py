@@ -1,3 +1,5 @@
+import os
+
 # Game Board Constants
 ROWS = 6
 COLUMNS = 7
@@ -24,6 +26,44 @@ EMPTY = 0
 
 # AI Constants
 AI_DEPTH = 4  # Depth for minimax algorithm
+AI_TIME_LIMIT_MS = None  # Per-move time budget in ms (None searches to AI_DEPTH)
+AI_WORKERS = 1  # Processes for fixed-depth searches (1 = no pool, 0 = one per core)
+AI_MOVE_DELAY_MS = 500  # Minimum time before the AI's move is shown, so it stays visible
+AI_PONDER = True  # Search the AI's answers while the human is thinking
+AI_SEARCH_STATS = True  # Collect search statistics (AIEngine.stats) and log them per move
+TT_SIZE = 1 << 18  # Maximum transposition table entries (0 disables the table)
+
+# Opening Book (built with: python main.py build-book)
+OPENING_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'opening_book.bin')
+OPENING_BOOK_PLY = 6  # Positions with fewer moves than this are stored
+OPENING_BOOK_DEPTH = 8  # Search depth used to build the book
+
+# Knowledge Base Retrieval
+KNOWLEDGE_BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'knowledge_base')
+KB_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'kb_index.npz')
+KB_CHUNK_WORDS = 120  # Maximum words per indexed chunk
+KB_TOP_K = 2  # Chunks sent to the tutor with every question
+KB_RELOAD_INTERVAL_S = 2.0  # Seconds between checks for changed knowledge base documents
+
+# Tutor Conversation
+TUTOR_HISTORY_TURNS = 4  # Earlier questions and answers sent word for word with a question
+TUTOR_SUMMARY_TOKENS = 150  # Estimated tokens of the summary of older turns
+TUTOR_TOKEN_BUDGET = 2000  # Estimated tokens allowed per tutor request
+TUTOR_ANALYSIS_DEPTH = 4  # Search depth of the column scores sent to the tutor (0 leaves them out)
+
+# Tutor Response Cache
+TUTOR_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'tutor_cache.sqlite3')
+TUTOR_CACHE_SIZE = 10000  # Maximum answers kept in the cache file
+TUTOR_CACHE_MEMORY_SIZE = 512  # Maximum answers kept in memory
+TUTOR_CACHE_TTL_S = 30 * 24 * 3600  # Answers older than this are asked again (None keeps them)
+
+# Tutor API Client
+TUTOR_DEADLINE_S = 20.0  # Longest a tutor answer may take in total
+TUTOR_ATTEMPT_TIMEOUT_S = 8.0  # Wait for the first piece of an answer before retrying
+TUTOR_MAX_RETRIES = 2  # Retries of a failed request before giving up
+TUTOR_RETRY_BACKOFF_S = 0.5  # Base of the jittered exponential backoff between retries
+TUTOR_BREAKER_FAILURES = 3  # Consecutive failed requests that open the circuit breaker
+TUTOR_BREAKER_RESET_S = 30.0  # Seconds the tutor answers offline before trying the API again
 
 # Font Settings
 FONT_SIZE = 36
@@ -0,0 +1,104 @@
+from constants import PLAYER_1, PLAYER_2
+from bitboard import CENTER_MASK
+from rules import LINE_MASKS, CELL_LINES, NUM_CELLS
+
+
+# Score of a won (or, negated, lost) position
+WIN_SCORE = 1000000
+
+# Score for a window holding 0-4 of the player's pieces and none of the opponent's
+WINDOW_SCORES = (0, 1, 2, 5, 100)
+
+# Score change when a window with n of the player's pieces (and none of the
+# opponent's) gets one more
+WINDOW_GAINS = tuple(WINDOW_SCORES[n + 1] - WINDOW_SCORES[n] for n in range(4))
+
+# Bonus for every piece in the center column
+CENTER_SCORE = 3
+
+CELL_CENTER_SCORES = tuple(CENTER_SCORE if CENTER_MASK >> bit & 1 else 0 for bit in range(NUM_CELLS))
+
+
+class IncrementalEvaluator:
+    """
+    Heuristic evaluation kept up to date one piece at a time.
+    
+    For every window of four cells the evaluator stores how many pieces each
+    player has in it, together with the running score_position value of both
+    players. Adding or removing a piece only touches the windows through
+    that cell, so reading the score of a position is a list lookup.
+    """
+    
+    __slots__ = ('counts', 'scores')
+    
+    def __init__(self):
+        """Initialize the evaluator for an empty board."""
+        self.counts = [None, [0] * len(LINE_MASKS), [0] * len(LINE_MASKS)]
+        self.scores = [0, 0, 0]  # Indexed by player number
+    
+    @classmethod
+    def from_position(cls, position):
+        """
+        Build an evaluator matching a bitboard position.
+        
+        Args:
+            position (Position): The position to evaluate
+            
+        Returns:
+            IncrementalEvaluator: The evaluator
+        """
+        evaluator = cls()
+        for player in (PLAYER_1, PLAYER_2):
+            bits = position.bitboards[player]
+            for bit in range(NUM_CELLS):
+                if bits >> bit & 1:
+                    evaluator.add(bit, player)
+        return evaluator
+    
+    def add(self, cell, player):
+        """
+        Update the counts and scores for a piece placed on a cell.
+        
+        Args:
+            cell (int): Bit index of the cell
+            player (int): The player owning the piece
+        """
+        own_counts = self.counts[player]
+        opponent_counts = self.counts[3 - player]
+        own_delta = CELL_CENTER_SCORES[cell]
+        opponent_delta = -own_delta
+        for window in CELL_LINES[cell]:
+            count = own_counts[window]
+            opponent_count = opponent_counts[window]
+            if opponent_count == 0:
+                own_delta += WINDOW_GAINS[count]
+            elif count == 0:
+                # The opponent's window is now blocked
+                opponent_delta -= WINDOW_SCORES[opponent_count]
+            own_counts[window] = count + 1
+        self.scores[player] += own_delta
+        self.scores[3 - player] += opponent_delta
+    
+    def remove(self, cell, player):
+        """
+        Update the counts and scores for a piece taken off a cell.
+        
+        Args:
+            cell (int): Bit index of the cell
+            player (int): The player owning the piece
+        """
+        own_counts = self.counts[player]
+        opponent_counts = self.counts[3 - player]
+        own_delta = -CELL_CENTER_SCORES[cell]
+        opponent_delta = -own_delta
+        for window in CELL_LINES[cell]:
+            count = own_counts[window] - 1
+            opponent_count = opponent_counts[window]
+            if opponent_count == 0:
+                own_delta -= WINDOW_GAINS[count]
+            elif count == 0:
+                # The opponent's window is open again
+                opponent_delta += WINDOW_SCORES[opponent_count]
+            own_counts[window] = count
+        self.scores[player] += own_delta
+        self.scores[3 - player] += opponent_delta
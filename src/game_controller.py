@@ -2,14 +2,22 @@ import pygame
 from pygame.locals import *
 from game_model import GameModel
 from game_view import GameView
-from ai_engine import AIEngine
+from ai_engine import AIEngine, SearchAborted
+from ai_worker import AIWorker
 from llm_tutor import LLMTutor
+from tutor_worker import TutorWorker
 from constants import *
 
 
 class GameController:
-    def __init__(self):
-        """Initialize the game controller with all components."""
+    def __init__(self, llm_tutor=None):
+        """
+        Initialize the game controller with all components.
+        
+        Args:
+            llm_tutor (LLMTutor): Tutor to use, e.g. one given a fake model, or
+                None for the Gemini tutor
+        """
         # Initialize Pygame
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -26,13 +34,20 @@ class GameController:
         
         # Initialize AI and Tutor
         self.ai_engine = AIEngine()
-        self.llm_tutor = LLMTutor()
+        self.ai_worker = AIWorker(self.ai_engine)
+        self.llm_tutor = llm_tutor or LLMTutor()
+        self.tutor_worker = TutorWorker(self.llm_tutor)
         
         # Initialize tutor-related variables
         self.user_input = ""
         self.tutor_response = ""
+        self.tutor_request = None
         self.knowledge_base = self.llm_tutor.load_knowledge_base()
         
+        # Background AI search for the current turn
+        self.ai_future = None
+        self.ai_started_at = 0
+        
         # Game state
         self.running = True
         self.clock = pygame.time.Clock()
@@ -69,6 +84,8 @@ class GameController:
                                 self.game_model.game_over = True
                             else:
                                 self.game_model.switch_player()
+                                # Replaces pondering, which has prepared this search
+                                self.start_ai_search()
             
             elif event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
@@ -88,8 +105,12 @@ class GameController:
                 elif event.key == K_r and not self.text_input_active:
                     # Reset the game (only when not typing)
                     self.game_model.reset_game()
+                    self.ai_worker.reset()
+                    self.ai_future = None
                     self.user_input = ""
                     self.tutor_response = ""
+                    self.tutor_worker.cancel()
+                    self.tutor_request = None
                 
                 elif event.unicode.isprintable() and self.text_input_active:
                     # Handle printable characters only when text input is active
@@ -97,30 +118,25 @@ class GameController:
                     print(f"Added character: {event.unicode}, current input: {self.user_input}")
     
     def trigger_tutor(self):
-        """Trigger the AI tutor with the current board state and user input."""
+        """
+        Ask the AI tutor about the current board state and user input.
+        
+        The response streams in on a background thread (see update_display).
+        Asking again cancels an unanswered question.
+        """
         if not self.user_input.strip():
             return
         
         try:
             print(f"Triggering tutor with input: {self.user_input}")
             
-            # Get board state as text
-            board_text = self.game_model.get_board_text()
-            print(f"Board text: {board_text}")
+            # Get the board (an immutable snapshot, safe to hand to the tutor thread)
+            board = self.game_model.get_board_state()
+            print(f"Board: {board}")
             
-            # Find relevant strategy
-            relevant_strategy = self.llm_tutor.find_relevant_strategy(
-                self.user_input, self.knowledge_base
-            )
-            print(f"Relevant strategy: {relevant_strategy[:100]}...")
-            
-            # Get tutor response
-            self.tutor_response = self.llm_tutor.get_tutoring_response(
-                board_text, relevant_strategy, self.user_input
-            )
-            print(f"Tutor response: {self.tutor_response[:100]}...")
-            print(f"Tutor response length: {len(self.tutor_response)}")
-            print(f"Tutor response type: {type(self.tutor_response)}")
+            # Find the relevant strategy and stream the tutor response
+            self.tutor_request = self.tutor_worker.ask(board, self.user_input, self.knowledge_base)
+            self.tutor_response = ""
             
             # Clear user input
             self.user_input = ""
@@ -129,27 +145,63 @@ class GameController:
             print(f"Error in trigger_tutor: {e}")
             import traceback
             traceback.print_exc()
+            self.tutor_request = None
             self.tutor_response = "I'm having trouble processing your question right now. Please try again!"
             self.user_input = ""
     
     def ai_move(self):
-        """Make AI move if it's the AI's turn."""
-        if (not self.game_model.game_over and 
-            self.game_model.current_player == PLAYER_2):
-            
-            # Get the best move from AI
-            best_column = self.ai_engine.get_best_move(self.game_model.get_board_state())
-            
-            # Make the move
-            if self.game_model.make_move(best_column, PLAYER_2):
-                # Check for win or draw
-                if self.game_model.check_win(PLAYER_2):
-                    self.game_model.game_over = True
-                    self.game_model.winner = PLAYER_2
-                elif self.game_model.is_draw():
-                    self.game_model.game_over = True
-                else:
-                    self.game_model.switch_player()
+        """
+        Advance the AI's turn without blocking.
+        
+        Starts a background search when it becomes the AI's turn, and plays
+        the move once the search has finished and AI_MOVE_DELAY_MS has passed.
+        """
+        if (self.game_model.game_over or 
+            self.game_model.current_player != PLAYER_2):
+            return
+        
+        if self.ai_future is None:
+            self.start_ai_search()
+            return
+        
+        if (not self.ai_future.done() or 
+            pygame.time.get_ticks() - self.ai_started_at < AI_MOVE_DELAY_MS):
+            return
+        
+        future = self.ai_future
+        self.ai_future = None
+        try:
+            best_column = future.result()
+        except SearchAborted:
+            return  # Cancelled, a new search starts next frame
+        except Exception as e:
+            print(f"Error in AI search: {e}")
+            import traceback
+            traceback.print_exc()
+            valid_locations = self.ai_engine.get_valid_locations(self.game_model.get_board_state())
+            best_column = valid_locations[0]
+        else:
+            # The worker is idle until pondering starts, so the stats are this move's
+            if self.ai_engine.stats is not None:
+                print(f"AI move: {self.ai_engine.stats.summary()}")
+        
+        # Make the move
+        if self.game_model.make_move(best_column, PLAYER_2):
+            # Check for win or draw
+            if self.game_model.check_win(PLAYER_2):
+                self.game_model.game_over = True
+                self.game_model.winner = PLAYER_2
+            elif self.game_model.is_draw():
+                self.game_model.game_over = True
+            else:
+                self.game_model.switch_player()
+                if AI_PONDER:
+                    self.ai_worker.ponder(self.game_model.get_board_state())
+    
+    def start_ai_search(self):
+        """Start searching for the AI's move in the background."""
+        self.ai_future = self.ai_worker.request_move(self.game_model.get_board_state())
+        self.ai_started_at = pygame.time.get_ticks()
     
     def update_display(self):
         """Update the game display."""
@@ -159,14 +211,19 @@ class GameController:
         # Draw the board
         self.game_view.draw_board(board)
         
-        # Draw tutor panel
-        self.game_view.draw_tutor_panel(self.tutor_response, self.user_input, self.text_input_active)
+        # Draw tutor panel with the response streamed so far
+        pending = False
+        if self.tutor_request is not None:
+            self.tutor_response = self.tutor_request.text
+            pending = self.tutor_request.pending
+        self.game_view.draw_tutor_panel(self.tutor_response, self.user_input, self.text_input_active, pending)
         
         # Draw game status
         self.game_view.draw_game_status(
             self.game_model.current_player,
             self.game_model.game_over,
-            self.game_model.winner
+            self.game_model.winner,
+            thinking=self.ai_future is not None
         )
         
         # Draw instructions
@@ -181,18 +238,18 @@ class GameController:
             # Handle events
             self.handle_events()
             
+            # Start or finish the AI's move (the search runs in the background)
+            self.ai_move()
+            
             # Update display
             self.update_display()
             
-            # Make AI move if it's AI's turn (only once per turn)
-            if (not self.game_model.game_over and 
-                self.game_model.current_player == PLAYER_2):
-                # Add a small delay to make AI moves visible
-                pygame.time.wait(500)  # 500ms delay
-                self.ai_move()
-            
             # Control frame rate
             self.clock.tick(60)
         
         # Clean up
+        self.tutor_worker.shutdown()
+        self.llm_tutor.close()
+        self.ai_worker.shutdown()
+        self.ai_engine.close()
         pygame.quit()
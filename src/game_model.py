@@ -1,35 +1,277 @@
-import numpy as np
 from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2, EMPTY
+from bitboard import COLUMN_MASKS, cell_bit, has_alignment
+from rules import completes_line, landing_cell
+
+
+# Every played move is stored as one byte: the player in the high bits and
+# the column in the low bits
+PLAYER_SHIFT = 4
+COLUMN_BITS = (1 << PLAYER_SHIFT) - 1
+
+
+def _encode_moves(moves):
+    """
+    Parse a move string into the moves of alternating players.
+    
+    Args:
+        moves (str): Columns numbered from 1, e.g. "4453" (player 1 moves first)
+    
+    Returns:
+        list: (column, player) pairs in playing order
+    
+    Raises:
+        ValueError: If a character is not a column number
+    """
+    pairs = []
+    player = PLAYER_1
+    for index, char in enumerate(moves):
+        column = ord(char) - ord('1')
+        if not 0 <= column < COLUMNS:
+            raise ValueError(f"Invalid move {char!r} at position {index + 1} of {moves!r}")
+        pairs.append((column, player))
+        player = PLAYER_2 if player == PLAYER_1 else PLAYER_1
+    return pairs
+
+
+class BoardSnapshot:
+    """
+    Immutable view of the board at one point of a game.
+    
+    A snapshot shares the model's bitboards and move bytes, which are never
+    modified in place, so taking one copies nothing. Indexing works like a
+    2D board: snapshot[row][col] is PLAYER_1, PLAYER_2 or EMPTY, with row 0
+    the top row. The rows are built on first access and kept, so reading a
+    snapshot cell by cell allocates nothing after that; code that only needs
+    the pieces can use player1_bits and player2_bits directly.
+    """
+    
+    __slots__ = ('player1_bits', 'player2_bits', 'moves', '_rows')
+    
+    def __init__(self, player1_bits, player2_bits, moves):
+        """
+        Initialize the snapshot.
+        
+        Args:
+            player1_bits (int): Bitboard of player 1's pieces
+            player2_bits (int): Bitboard of player 2's pieces
+            moves (bytes): The moves played, as stored by GameModel
+        """
+        object.__setattr__(self, 'player1_bits', player1_bits)
+        object.__setattr__(self, 'player2_bits', player2_bits)
+        object.__setattr__(self, 'moves', moves)
+        object.__setattr__(self, '_rows', None)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("BoardSnapshot is immutable")
+    
+    def __repr__(self):
+        return f"BoardSnapshot({self.to_moves()!r})"
+    
+    def __len__(self):
+        """Get the number of rows."""
+        return ROWS
+    
+    def __getitem__(self, row):
+        """
+        Get one row of the board.
+        
+        Args:
+            row (int): Row index (0 is the top row)
+        
+        Returns:
+            tuple: The piece in every column of the row
+        """
+        rows = self._rows
+        if rows is None:
+            rows = self.build_rows()
+        if not 0 <= row < ROWS:
+            raise IndexError("row index out of range")
+        return rows[row]
+    
+    def build_rows(self):
+        """
+        Build and keep the rows of the board.
+        
+        Returns:
+            tuple: One tuple of pieces per row, top row first
+        """
+        rows = []
+        for row in range(ROWS):
+            cells = []
+            for col in range(COLUMNS):
+                bit = 1 << cell_bit(row, col)
+                if self.player1_bits & bit:
+                    cells.append(PLAYER_1)
+                elif self.player2_bits & bit:
+                    cells.append(PLAYER_2)
+                else:
+                    cells.append(EMPTY)
+            rows.append(tuple(cells))
+        rows = tuple(rows)
+        object.__setattr__(self, '_rows', rows)
+        return rows
+    
+    def to_moves(self):
+        """
+        Get the moves played as a move string.
+        
+        Returns:
+            str: Columns numbered from 1, e.g. "4453"
+        """
+        return ''.join(chr(ord('1') + (move & COLUMN_BITS)) for move in self.moves)
 
 
 class GameModel:
+    """
+    Game state stored as one bitboard per player and the moves played.
+    
+    Bitboards use the layout of bitboard.Position. The moves, and the moves
+    taken back for redo(), are bytes objects that are replaced rather than
+    modified, so snapshots can share them. A game holds no per-cell storage
+    and only a few hundred bytes in total.
+    """
+    
+    __slots__ = ('player1_bits', 'player2_bits', 'moves', 'undone_moves',
+                 'current_player', 'game_over', 'winner')
+    
     def __init__(self):
         """Initialize the game model with a 6x7 board and set current player to 1."""
-        self.board = np.zeros((ROWS, COLUMNS), dtype=int)
-        self.current_player = PLAYER_1
-        self.game_over = False
-        self.winner = None
+        self.reset_game()
+    
+    @classmethod
+    def from_moves(cls, moves):
+        """
+        Create a game by playing a move string from the start.
+        
+        Players alternate, starting with player 1. The current player, game
+        over flag and winner are set as the game controller would.
+        
+        Args:
+            moves (str): Columns numbered from 1, e.g. "4453"
+        
+        Returns:
+            GameModel: The game after the moves
+        
+        Raises:
+            ValueError: If a move is not a playable column or is played
+                after the game is over
+        """
+        game = cls()
+        for index, (column, player) in enumerate(_encode_moves(moves)):
+            if game.game_over or not game.make_move(column, player):
+                raise ValueError(f"Move {index + 1} of {moves!r} cannot be played")
+            game.update_status(player)
+        return game
+    
+    def to_moves(self):
+        """
+        Get the moves played as a move string, the inverse of from_moves.
+        
+        Returns:
+            str: Columns numbered from 1, e.g. "4453"
+        """
+        return self.snapshot().to_moves()
+    
+    @property
+    def board(self):
+        """The current board as an immutable snapshot."""
+        return self.snapshot()
     
     def make_move(self, column, player):
         """
         Place a piece in the specified column for the given player.
         
+        Clears the moves that could be redone.
+        
         Args:
             column (int): The column to place the piece (0-6)
             player (int): The player making the move (1 or 2)
-            
+        
         Returns:
             bool: True if move was successful, False otherwise
         """
         if not self.is_valid_location(column):
             return False
+        self.place(column, player)
+        self.undone_moves = b''
+        return True
+    
+    def place(self, column, player):
+        """
+        Drop a piece in a playable column and record the move.
         
-        # Find the lowest empty row in the column
-        for row in range(ROWS - 1, -1, -1):
-            if self.board[row][column] == EMPTY:
-                self.board[row][column] = player
-                return True
-        return False
+        Args:
+            column (int): The column to place the piece
+            player (int): The player making the move
+        """
+        cell = 1 << landing_cell(self.player1_bits | self.player2_bits, column)
+        if player == PLAYER_1:
+            self.player1_bits |= cell
+        else:
+            self.player2_bits |= cell
+        self.moves += bytes(((player << PLAYER_SHIFT) | column,))
+    
+    def undo(self):
+        """
+        Take back the last move.
+        
+        The player who made it is to move again and the game is no longer over.
+        
+        Returns:
+            int: The column of the move taken back, or None if no move was played
+        """
+        if not self.moves:
+            return None
+        move = self.moves[-1]
+        column = move & COLUMN_BITS
+        player = move >> PLAYER_SHIFT
+        
+        # The move's piece is the highest one in its column
+        column_bits = (self.player1_bits | self.player2_bits) & COLUMN_MASKS[column]
+        cell = 1 << (column_bits.bit_length() - 1)
+        if player == PLAYER_1:
+            self.player1_bits ^= cell
+        else:
+            self.player2_bits ^= cell
+        
+        self.moves = self.moves[:-1]
+        self.undone_moves += bytes((move,))
+        self.current_player = player
+        self.game_over = False
+        self.winner = None
+        return column
+    
+    def redo(self):
+        """
+        Play the last move taken back by undo() again.
+        
+        Returns:
+            int: The column of the move played, or None if there is nothing to redo
+        """
+        if not self.undone_moves:
+            return None
+        move = self.undone_moves[-1]
+        column = move & COLUMN_BITS
+        player = move >> PLAYER_SHIFT
+        self.place(column, player)
+        self.undone_moves = self.undone_moves[:-1]
+        self.update_status(player)
+        return column
+    
+    def update_status(self, player):
+        """
+        End the game or pass the turn after a move.
+        
+        Args:
+            player (int): The player who just moved
+        """
+        if self.check_win(player):
+            self.game_over = True
+            self.winner = player
+        elif self.is_draw():
+            self.game_over = True
+        else:
+            self.current_player = PLAYER_2 if player == PLAYER_1 else PLAYER_1
     
     def is_valid_location(self, column):
         """
@@ -37,61 +279,34 @@ class GameModel:
         
         Args:
             column (int): The column to check
-            
+        
         Returns:
             bool: True if the column is valid for a move
         """
         if column < 0 or column >= COLUMNS:
             return False
-        return self.board[0][column] == EMPTY
+        return landing_cell(self.player1_bits | self.player2_bits, column) >= 0
     
     def check_win(self, player):
         """
         Check for a win by the specified player.
         
+        A game ends at its first four in a row, so a win by the player who
+        moved last goes through their last piece: only the lines through it
+        are checked. For the other player the whole board is checked.
+        
         Args:
             player (int): The player to check for a win
-            
+        
         Returns:
             bool: True if the player has won
         """
-        # Check horizontal
-        for row in range(ROWS):
-            for col in range(COLUMNS - 3):
-                if (self.board[row][col] == player and
-                    self.board[row][col + 1] == player and
-                    self.board[row][col + 2] == player and
-                    self.board[row][col + 3] == player):
-                    return True
-        
-        # Check vertical
-        for row in range(ROWS - 3):
-            for col in range(COLUMNS):
-                if (self.board[row][col] == player and
-                    self.board[row + 1][col] == player and
-                    self.board[row + 2][col] == player and
-                    self.board[row + 3][col] == player):
-                    return True
-        
-        # Check diagonal (positive slope)
-        for row in range(ROWS - 3):
-            for col in range(COLUMNS - 3):
-                if (self.board[row][col] == player and
-                    self.board[row + 1][col + 1] == player and
-                    self.board[row + 2][col + 2] == player and
-                    self.board[row + 3][col + 3] == player):
-                    return True
-        
-        # Check diagonal (negative slope)
-        for row in range(3, ROWS):
-            for col in range(COLUMNS - 3):
-                if (self.board[row][col] == player and
-                    self.board[row - 1][col + 1] == player and
-                    self.board[row - 2][col + 2] == player and
-                    self.board[row - 3][col + 3] == player):
-                    return True
-        
-        return False
+        bits = self.player1_bits if player == PLAYER_1 else self.player2_bits
+        if not self.moves or self.moves[-1] >> PLAYER_SHIFT != player:
+            return has_alignment(bits)
+        # The last piece is the highest one in its column
+        column_bits = (self.player1_bits | self.player2_bits) & COLUMN_MASKS[self.moves[-1] & COLUMN_BITS]
+        return completes_line(bits, column_bits.bit_length() - 1)
     
     def is_draw(self):
         """
@@ -100,16 +315,25 @@ class GameModel:
         Returns:
             bool: True if the game is a draw
         """
-        return np.all(self.board[0] != EMPTY)
+        return len(self.moves) == ROWS * COLUMNS
+    
+    def snapshot(self):
+        """
+        Get an immutable snapshot of the board without copying it.
+        
+        Returns:
+            BoardSnapshot: The current board
+        """
+        return BoardSnapshot(self.player1_bits, self.player2_bits, self.moves)
     
     def get_board_state(self):
         """
-        Get the current board state as a 2D array.
+        Get the current board state.
         
         Returns:
-            numpy.ndarray: The current board state
+            BoardSnapshot: The current board, indexed as board[row][col]
         """
-        return self.board.copy()
+        return self.snapshot()
     
     def switch_player(self):
         """Switch the current player."""
@@ -117,7 +341,10 @@ class GameModel:
     
     def reset_game(self):
         """Reset the game to initial state."""
-        self.board = np.zeros((ROWS, COLUMNS), dtype=int)
+        self.player1_bits = 0
+        self.player2_bits = 0
+        self.moves = b''
+        self.undone_moves = b''
         self.current_player = PLAYER_1
         self.game_over = False
         self.winner = None
@@ -130,12 +357,12 @@ class GameModel:
             str: Text representation of the board
         """
         text = "Current Board State:\n"
-        for row in range(ROWS):
+        for row in self.snapshot():
             text += "|"
-            for col in range(COLUMNS):
-                if self.board[row][col] == EMPTY:
+            for piece in row:
+                if piece == EMPTY:
                     text += " "
-                elif self.board[row][col] == PLAYER_1:
+                elif piece == PLAYER_1:
                     text += "X"
                 else:
                     text += "O"
@@ -48,7 +48,7 @@ class GameView:
             text_rect = text.get_rect(center=(col * SQUARE_SIZE + SQUARE_SIZE // 2, SQUARE_SIZE // 2))
             self.screen.blit(text, text_rect)
     
-    def draw_tutor_panel(self, tutor_response, user_input, text_input_active=False):
+    def draw_tutor_panel(self, tutor_response, user_input, text_input_active=False, pending=False):
         """
         Draw the tutor panel with text input and response area.
         
@@ -56,6 +56,7 @@ class GameView:
             tutor_response (str): The tutor's response to display
             user_input (str): The current user input text
             text_input_active (bool): Whether text input is currently active
+            pending (bool): Whether a question is waiting for its first words
         """
         # Draw tutor panel background
         panel_y = (ROWS + 1) * SQUARE_SIZE
@@ -80,8 +81,10 @@ class GameView:
             self.screen.blit(placeholder_text, (15, panel_y + 15))
         
         # Draw tutor response
-        print(f"Drawing tutor response: '{tutor_response}'")
-        if tutor_response and tutor_response.strip():
+        if pending:
+            pending_text = self.tutor_font.render("Tutor is thinking...", True, GRAY)
+            self.screen.blit(pending_text, (10, panel_y + 60))
+        elif tutor_response and tutor_response.strip():
             # Split response into lines for better display
             words = tutor_response.split()
             lines = []
@@ -104,7 +107,7 @@ class GameView:
                 response_text = self.tutor_font.render(line, True, BLACK)
                 self.screen.blit(response_text, (10, panel_y + 60 + i * 25))
     
-    def draw_game_status(self, current_player, game_over, winner):
+    def draw_game_status(self, current_player, game_over, winner, thinking=False):
         """
         Draw the current game status.
         
@@ -112,6 +115,7 @@ class GameView:
             current_player (int): The current player (1 or 2)
             game_over (bool): Whether the game is over
             winner (int): The winner (None if no winner)
+            thinking (bool): Whether the AI is searching for its move
         """
         status_y = (ROWS + 1) * SQUARE_SIZE + 250
         
@@ -120,6 +124,8 @@ class GameView:
                 status_text = f"Player {winner} wins!"
             else:
                 status_text = "It's a draw!"
+        elif thinking:
+            status_text = "AI is thinking..."
         else:
             status_text = f"Player {current_player}'s turn"
         
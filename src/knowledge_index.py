@@ -0,0 +1,309 @@
+import json
+import math
+import os
+import re
+import threading
+import numpy as np
+from constants import KB_INDEX_PATH, KB_CHUNK_WORDS, KB_TOP_K
+
+
+# Bump when the index file layout or the tokenizer changes
+INDEX_VERSION = 1
+
+# BM25 parameters: term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN = re.compile(r"[a-z0-9]+")
+HEADING = re.compile(r"^(#+)\s+(.*)$")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been before but by can could do does
+doing for from had has have how i if in into is it its just me more most my no not of on or
+other our over should so some such than that the their them then there these they this those
+to up very was we were what when where which while who why will with would you your
+""".split())
+
+
+def stem(word):
+    """
+    Reduce a word to a crude stem, so "threats", "blocking" and "pieces" match
+    "threat", "block" and "piece".
+
+    Args:
+        word (str): A lower-case word
+
+    Returns:
+        str: The stem
+    """
+    if len(word) <= 3 or word.endswith('ss'):
+        return word
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    for suffix in ('ing', 'ed', 's'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if suffix != 's' and word[-1] == word[-2] and word[-1] not in 'aeious':
+                word = word[:-1]  # "winning" -> "win"
+            break
+    if word.endswith('e') and len(word) > 3:
+        word = word[:-1]  # "place" and "placed" -> "plac"
+    return word
+
+
+def tokenize(text):
+    """
+    Split text into index terms.
+
+    Args:
+        text (str): A question or a piece of a document
+
+    Returns:
+        list: Lower-case stemmed words without stopwords
+    """
+    return [stem(word) for word in TOKEN.findall(text.lower()) if word not in STOPWORDS]
+
+
+def chunk_markdown(text, max_words=KB_CHUNK_WORDS):
+    """
+    Split a markdown document into chunks of whole paragraphs.
+
+    Every chunk belongs to one section and is labelled with its heading.
+    Paragraphs are joined until a chunk would exceed max_words; a longer
+    paragraph is split between sentences.
+
+    Args:
+        text (str): The document
+        max_words (int): Maximum words per chunk (a longer sentence is kept whole)
+
+    Returns:
+        list: (heading, text) pairs
+    """
+    chunks = []
+    heading = ''
+    pieces = []
+    words = 0
+
+    def flush():
+        nonlocal pieces, words
+        if pieces:
+            chunks.append((heading, ' '.join(pieces)))
+        pieces = []
+        words = 0
+
+    for block in re.split(r"\n\s*\n", text):
+        block = block.strip()
+        if not block:
+            continue
+        lines = block.splitlines()
+        match = HEADING.match(lines[0])
+        if match:
+            flush()
+            heading = match.group(2).strip()
+            block = '\n'.join(lines[1:]).strip()
+            if not block:
+                continue
+        for sentence in SENTENCE_END.split(' '.join(block.split())):
+            count = len(sentence.split())
+            if words and words + count > max_words:
+                flush()
+            pieces.append(sentence)
+            words += count
+        if words >= max_words // 2:
+            flush()
+    flush()
+    return chunks
+
+
+class KnowledgeIndex:
+    """
+    BM25 index over the chunks of the knowledge base documents.
+
+    The posting lists of all terms are stored back to back in two NumPy
+    arrays of chunk ids and precomputed BM25 weights, so a search adds up
+    one slice of weights per query term and picks the best scores with a
+    partial sort. The index is saved to an .npz file and loaded from it as
+    long as the list of documents and their modification times and sizes is
+    unchanged; otherwise it is rebuilt from the documents.
+
+    Searches may run while the index is refreshed on another thread; they
+    use the old index until the new one is complete.
+    """
+
+    def __init__(self, index_path=KB_INDEX_PATH, chunk_words=KB_CHUNK_WORDS):
+        """
+        Initialize an empty index. Call refresh() to load or build it.
+
+        Args:
+            index_path (str): .npz file the index is saved to, or None to
+                build it in memory only
+            chunk_words (int): Maximum words per chunk
+        """
+        self.index_path = index_path
+        self.chunk_words = chunk_words
+        self.signature = None
+        # (source, heading, text) of every chunk, indexed by chunk id
+        self.chunks = []
+        # term -> (start, end) of its posting list in ids and weights
+        self.postings = {}
+        self.ids = np.zeros(0, dtype=np.int32)
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def refresh(self, knowledge_base):
+        """
+        Bring the index up to date with the documents of a knowledge base.
+
+        Args:
+            knowledge_base (KnowledgeBase): The scanned knowledge base
+
+        Returns:
+            bool: True if the index was rebuilt from the documents
+        """
+        signature = knowledge_base.signature()
+        if signature == self.signature:
+            return False
+        if self.load(signature):
+            return False
+        self.build(knowledge_base, signature)
+        self.save()
+        return True
+
+    def load(self, signature):
+        """Load the saved index if it was built from these documents."""
+        if self.index_path is None:
+            return False
+        try:
+            with np.load(self.index_path) as data:
+                meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+                if (meta.get('version') != INDEX_VERSION or meta.get('chunk_words') != self.chunk_words
+                        or meta.get('signature') != signature):
+                    return False
+                self.set_index(signature, [tuple(chunk) for chunk in meta['chunks']], meta['terms'],
+                               data['ids'], data['weights'], data['offsets'])
+        except (OSError, ValueError, KeyError):
+            return False
+        return True
+
+    def save(self):
+        """Write the index to its file, replacing it atomically."""
+        if self.index_path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        meta = json.dumps({
+            'version': INDEX_VERSION,
+            'chunk_words': self.chunk_words,
+            'signature': self.signature,
+            'chunks': self.chunks,
+            'terms': list(self.postings),
+        }).encode('utf-8')
+        offsets = np.array([start for start, _ in self.postings.values()] + [len(self.ids)], dtype=np.int64)
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez(f, meta=np.frombuffer(meta, dtype=np.uint8), ids=self.ids, weights=self.weights,
+                     offsets=offsets)
+        os.replace(temp_path, self.index_path)
+
+    def set_index(self, signature, chunks, terms, ids, weights, offsets):
+        """
+        Install chunks and posting lists.
+
+        Args:
+            signature (list): Documents the index was built from
+            chunks (list): (source, heading, text) of every chunk
+            terms (list): The terms, in the order of their posting lists
+            ids: Chunk ids of all posting lists, back to back
+            weights: BM25 weights matching ids
+            offsets: Start of every posting list, followed by the total length
+        """
+        offsets = [int(offset) for offset in offsets]
+        postings = {term: (offsets[i], offsets[i + 1]) for i, term in enumerate(terms)}
+        ids = np.asarray(ids, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.float32)
+        with self.lock:
+            self.signature = signature
+            self.chunks = chunks
+            self.postings = postings
+            self.ids = ids
+            self.weights = weights
+
+    def build(self, knowledge_base, signature):
+        """
+        Chunk every document and build the posting lists.
+
+        The content comes from the knowledge base's documents, which keep
+        it, so every file is read once.
+
+        Args:
+            knowledge_base (KnowledgeBase): The scanned knowledge base
+            signature (list): Documents from KnowledgeBase.signature()
+        """
+        documents = {os.path.relpath(document.path, knowledge_base.directory).replace(os.sep, '/'): document
+                     for document in knowledge_base.documents.values()}
+        chunks = []
+        term_counts = []
+        for source, _, _ in signature:
+            document = documents.get(source)
+            if document is None:
+                continue
+            for heading, chunk in chunk_markdown(document.text, self.chunk_words):
+                chunks.append((source, heading, chunk))
+                counts = {}
+                for term in tokenize(heading + ' ' + chunk):
+                    counts[term] = counts.get(term, 0) + 1
+                term_counts.append(counts)
+
+        lengths = [sum(counts.values()) for counts in term_counts]
+        average_length = sum(lengths) / len(lengths) if lengths else 1.0
+        document_frequency = {}
+        for counts in term_counts:
+            for term in counts:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        postings = {}
+        for chunk_id, counts in enumerate(term_counts):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[chunk_id] / average_length)
+            for term, count in counts.items():
+                frequency = document_frequency[term]
+                idf = math.log(1 + (len(chunks) - frequency + 0.5) / (frequency + 0.5))
+                ids, weights = postings.setdefault(term, ([], []))
+                ids.append(chunk_id)
+                weights.append(idf * count * (BM25_K1 + 1) / (count + norm))
+
+        terms = list(postings)
+        offsets = [0]
+        for term in terms:
+            offsets.append(offsets[-1] + len(postings[term][0]))
+        self.set_index(signature, chunks, terms, [chunk_id for term in terms for chunk_id in postings[term][0]],
+                       [weight for term in terms for weight in postings[term][1]], offsets)
+
+    def search(self, query, k=KB_TOP_K):
+        """
+        Find the chunks that best match a question.
+
+        Args:
+            query (str): The question
+            k (int): Maximum number of chunks to return
+
+        Returns:
+            list: (score, source, heading, text) of the best chunks, best first;
+                empty if no chunk shares a term with the question
+        """
+        with self.lock:
+            chunks, postings, ids, weights = self.chunks, self.postings, self.ids, self.weights
+        spans = [postings[term] for term in set(tokenize(query)) if term in postings]
+        if not spans or k <= 0:
+            return []
+        scores = np.zeros(len(chunks), dtype=np.float32)
+        for start, end in spans:
+            scores[ids[start:end]] += weights[start:end]
+        if k < len(scores):
+            best = np.argpartition(scores, -k)[-k:]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(float(scores[chunk_id]),) + chunks[chunk_id] for chunk_id in best if scores[chunk_id] > 0]
@@ -0,0 +1,191 @@
+import os
+import threading
+from collections.abc import Mapping
+from constants import KNOWLEDGE_BASE_DIR, KB_RELOAD_INTERVAL_S
+
+
+class Document:
+    """
+    One knowledge base document, read from disk on first use.
+
+    A Document belongs to one version of its file: when the file changes,
+    the knowledge base replaces it with a new Document, so cached content
+    is never stale.
+    """
+
+    __slots__ = ('path', 'mtime_ns', 'size', '_text')
+
+    def __init__(self, path, mtime_ns, size):
+        """
+        Initialize the document without reading it.
+
+        Args:
+            path (str): Absolute path of the file
+            mtime_ns (int): Modification time of the file in nanoseconds
+            size (int): Size of the file in bytes
+        """
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self._text = None
+
+    @property
+    def text(self):
+        """The content of the document (read once, then cached)."""
+        if self._text is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._text = f.read()
+            except OSError as e:
+                print(f"Warning: Could not read knowledge base document {self.path}: {e}")
+                return ''
+        return self._text
+
+
+class KnowledgeBase(Mapping):
+    """
+    The strategy documents of the knowledge base directory.
+
+    The directory is resolved relative to the package, so the tutor works
+    from any working directory. Every .md file below it is a document,
+    named by its relative path without the extension (e.g. "center_control"
+    or "openings/even_threats"). Documents are discovered by one scan of the
+    directory tree and only read when their content is first used.
+
+    After start(), a background thread rescans the directory every few
+    seconds and calls the listeners when a document was added, removed or
+    changed, so edits are picked up while the game runs. The initial scan
+    also happens on that thread, so starting takes the same time for any
+    number of documents.
+    """
+
+    def __init__(self, directory=KNOWLEDGE_BASE_DIR, reload_interval=KB_RELOAD_INTERVAL_S):
+        """
+        Initialize the knowledge base without scanning it.
+
+        Args:
+            directory (str): Root of the knowledge base
+            reload_interval (float): Seconds between scans for changes
+        """
+        self.directory = directory
+        self.reload_interval = reload_interval
+        # name -> Document, replaced as a whole when the directory changes
+        self.documents = {}
+        self.listeners = []
+        self.scanned = threading.Event()
+        self.stop_event = threading.Event()
+        self.refresh_lock = threading.Lock()
+        self.thread = None
+
+    def __getitem__(self, name):
+        return self.documents[name].text
+
+    def __contains__(self, name):
+        return name in self.documents
+
+    def __iter__(self):
+        return iter(self.documents)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add_listener(self, listener):
+        """
+        Register a function to call with the knowledge base after every change.
+
+        Args:
+            listener: Function taking the KnowledgeBase, e.g. KnowledgeIndex.refresh
+        """
+        self.listeners.append(listener)
+
+    def signature(self):
+        """
+        Describe the current documents, e.g. to check whether a saved index is current.
+
+        Returns:
+            list: Sorted [relative path, mtime in ns, size] of every document
+        """
+        return sorted([os.path.relpath(document.path, self.directory).replace(os.sep, '/'),
+                       document.mtime_ns, document.size] for document in self.documents.values())
+
+    def scan(self):
+        """
+        Find the documents of the directory tree in one pass.
+
+        Returns:
+            dict: name -> (absolute path, mtime in ns, size)
+        """
+        found = {}
+        pending = [self.directory]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append(entry.path)
+                elif entry.name.endswith('.md'):
+                    try:
+                        info = entry.stat()
+                    except OSError:
+                        continue  # Removed since the directory was listed
+                    name = os.path.relpath(entry.path, self.directory)[:-len('.md')].replace(os.sep, '/')
+                    found[name] = (entry.path, info.st_mtime_ns, info.st_size)
+        return found
+
+    def refresh(self):
+        """
+        Rescan the directory and notify the listeners if anything changed.
+
+        Documents whose file is unchanged keep their cached content.
+
+        Returns:
+            bool: True if a document was added, removed or changed
+        """
+        with self.refresh_lock:
+            found = self.scan()
+            documents = {}
+            changed = len(found) != len(self.documents)
+            for name, (path, mtime_ns, size) in found.items():
+                document = self.documents.get(name)
+                if document is None or document.mtime_ns != mtime_ns or document.size != size:
+                    document = Document(path, mtime_ns, size)
+                    changed = True
+                documents[name] = document
+            first_scan = not self.scanned.is_set()
+            if changed or first_scan:
+                self.documents = documents
+                for listener in self.listeners:
+                    try:
+                        listener(self)
+                    except Exception as e:
+                        print(f"Warning: Could not update the knowledge base index: {e}")
+            self.scanned.set()
+            return changed
+
+    def wait_until_scanned(self):
+        """Block until the first scan is done, scanning now if the thread is not running."""
+        if self.thread is None:
+            if not self.scanned.is_set():
+                self.refresh()
+        else:
+            self.scanned.wait()
+
+    def start(self):
+        """Scan the directory in the background and keep watching it for changes."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.watch, name='knowledge-base', daemon=True)
+            self.thread.start()
+
+    def watch(self):
+        """Scan until stopped (runs on the background thread)."""
+        self.refresh()
+        while not self.stop_event.wait(self.reload_interval):
+            changed = self.refresh()
+            if changed:
+                print(f"Knowledge base reloaded: {len(self.documents)} documents")
+
+    def stop(self):
+        """Stop watching for changes."""
+        self.stop_event.set()
@@ -1,167 +1,259 @@
 import os
+import time
 import google.generativeai as genai
 from dotenv import load_dotenv
+from response_cache import ResponseCache
+from knowledge_index import KnowledgeIndex
+from knowledge_loader import KnowledgeBase
+from chat_history import ChatHistory, count_tokens, estimate_tokens
+from tutor_stats import TutorRequestStats
+from prompt_builder import PromptBuilder, SYSTEM_INSTRUCTION
+from tutor_client import TutorClient, ModelBackend, CircuitOpen
+
+
+# Shown when the Gemini API fails
+ERROR_RESPONSE = ("I'm having trouble connecting to the AI tutor right now. "
+                  "Try asking about center control or threat analysis strategies!")
 
 
 class LLMTutor:
-    def __init__(self):
-        """Initialize the LLM tutor with Gemini API configuration."""
+    def __init__(self, model=None, cache=None, client=None, knowledge_index=None):
+        """
+        Initialize the LLM tutor with Gemini API configuration.
+        
+        Args:
+            model: Object with a GenerativeModel-style generate_content()
+                to use instead of Gemini, e.g. the FakeStreamingModel of the
+                tests, already given SYSTEM_INSTRUCTION as its system instruction
+            cache (ResponseCache): Cache of answers to use. By default Gemini
+                answers are cached in TUTOR_CACHE_PATH; an injected model
+                gets no cache.
+            client (TutorClient): Client calling the model with deadlines,
+                retries and a circuit breaker, or None for one with the
+                TUTOR_DEADLINE_S and related settings
+            knowledge_index (KnowledgeIndex): Index of the knowledge base to
+                use, or None for one saved in KB_INDEX_PATH
+        """
         load_dotenv()
         
+        # Recent questions and answers, sent with every request
+        self.history = ChatHistory(system_instruction=SYSTEM_INSTRUCTION)
+        # TutorRequestStats of the last completed request
+        self.last_request = None
+        self.prompt_builder = PromptBuilder()
+        self.cache = cache
+        self.knowledge_base = KnowledgeBase()
+        self.knowledge_index = knowledge_index if knowledge_index is not None else KnowledgeIndex()
+        self.knowledge_base.add_listener(self.knowledge_index.refresh)
+        
+        self.model = model if model is not None else self.create_model()
+        self.client = client
+        if self.client is None and self.model is not None:
+            self.client = TutorClient(ModelBackend(self.model))
+    
+    def create_model(self):
+        """
+        Create the Gemini model (and a cache for it) if GOOGLE_API_KEY is set.
+        
+        Returns:
+            The model, or None if no API key is configured
+        """
         # Configure the Gemini API
         api_key = os.getenv('GOOGLE_API_KEY')
         if not api_key or api_key == "YOUR_API_KEY":
             print("Warning: Please set your Google Gemini API key in the .env file")
-            self.model = None
-            self.chat = None
-        else:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-            self.chat = self.model.start_chat(history=[])
+            return None
+        genai.configure(api_key=api_key)
+        if self.cache is None:
+            self.cache = ResponseCache()
+        return genai.GenerativeModel('gemini-1.5-flash', system_instruction=SYSTEM_INSTRUCTION)
     
-    def get_tutoring_response(self, board_state_text, relevant_strategy, user_query):
+    def get_tutoring_response(self, board_state, relevant_strategy, user_query):
         """
         Get a tutoring response from the Gemini API.
         
         Args:
-            board_state_text (str): Text representation of the current board
+            board_state: The current board, indexed as board[row][col]
             relevant_strategy (str): Relevant strategy content from knowledge base
             user_query (str): The user's question
             
         Returns:
             str: The tutor's response
         """
-        if not self.chat:
-            # Provide a simple fallback response for testing
-            if "center" in user_query.lower() or "middle" in user_query.lower():
-                return "Consider placing your piece in the center column (column 3) - it gives you the most opportunities to create winning combinations!"
-            elif "threat" in user_query.lower() or "block" in user_query.lower():
-                return "Look for any three-in-a-row patterns that your opponent could complete. Blocking these threats is crucial!"
-            else:
-                return "Try to control the center and look for opportunities to create multiple threats simultaneously!"
-        
-        # Construct the Socratic prompt
-        prompt = f"""
-You are a helpful Connect 4 tutor using the Socratic method. Your goal is to guide the student to discover the answer themselves rather than giving direct answers.
-
-Current board state:
-{board_state_text}
-
-Relevant strategy information:
-{relevant_strategy}
-
-Student's question: {user_query}
-
-Instructions:
-1. Analyze the board state and the student's question
-2. Consider the relevant strategy information provided
-3. Instead of giving a direct answer, ask a guiding question that will help the student think through the problem
-4. Your response should be encouraging and educational
-5. Keep your response concise (2-3 sentences maximum)
-6. Focus on helping the student develop strategic thinking skills
-
-Remember: You are a tutor, not a coach. Guide the student to discover the answer through thoughtful questioning.
-"""
+        return ''.join(self.stream_tutoring_response(board_state, relevant_strategy, user_query))
+    
+    def stream_tutoring_response(self, board_state, relevant_strategy, user_query):
+        """
+        Stream a tutoring response from the Gemini API as it is generated.
+        
+        The question and answer are added to the conversation history once
+        the answer is complete. Closing the generator early (e.g. when the
+        question is cancelled) leaves the history unchanged. A question asked
+        before about the same (or mirrored) board is answered from the
+        response cache in one piece. The statistics of every completed
+        request are kept in last_request.
         
+        The model is called through the TutorClient, so the answer is
+        complete within its deadline. While its circuit breaker is open
+        after repeated failures, the offline answer is given at once.
+        
+        Args:
+            board_state: The current board, indexed as board[row][col]
+            relevant_strategy (str): Relevant strategy content from knowledge base
+            user_query (str): The user's question
+            
+        Yields:
+            str: The next piece of the response text
+        """
+        start = time.perf_counter()
+        
+        if not self.model:
+            yield self.offline_response(user_query, 'fallback', start)
+            return
+        
+        if self.cache is not None:
+            cached = self.cache.get(board_state, relevant_strategy, user_query)
+            if cached is not None:
+                self.history.add_turn(user_query, cached)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.record_request(TutorRequestStats('cache', response_tokens=estimate_tokens(cached),
+                                                      first_chunk_ms=elapsed_ms, total_ms=elapsed_ms))
+                yield cached
+                return
+        
+        if self.client.breaker.is_open():
+            yield self.offline_response(user_query, 'offline', start)
+            return
+        
+        prompt = self.build_prompt(board_state, relevant_strategy, user_query)
+        contents, turns = self.history.build_contents(prompt)
+        stats = TutorRequestStats('model', prompt_tokens=count_tokens(contents, SYSTEM_INSTRUCTION),
+                                  history_turns=turns)
+        
+        parts = []
         try:
             print(f"Sending prompt to Gemini API...")
-            response = self.chat.send_message(prompt)
+            for text in self.client.stream(contents, stats):
+                if stats.first_chunk_ms is None:
+                    stats.first_chunk_ms = (time.perf_counter() - start) * 1000
+                parts.append(text)
+                yield text
             print(f"Received response from API")
-            
-            # Ensure we get a string response
-            if hasattr(response, 'text'):
-                return str(response.text)
-            else:
-                return str(response)
-                
+        except CircuitOpen:
+            # Opened by another request since the check above
+            yield self.offline_response(user_query, 'offline', start)
+            return
         except Exception as e:
             print(f"Error calling Gemini API: {e}")
+            stats.source = 'error'
+            stats.total_ms = (time.perf_counter() - start) * 1000
+            self.record_request(stats)
             # Return a safe fallback response instead of crashing
-            return "I'm having trouble connecting to the AI tutor right now. Try asking about center control or threat analysis strategies!"
+            yield ("\n" if parts else "") + ERROR_RESPONSE
+            return
+        
+        response_text = ''.join(parts)
+        self.history.add_turn(user_query, response_text)
+        if self.cache is not None and response_text:
+            self.cache.put(board_state, relevant_strategy, user_query, response_text)
+        
+        stats.response_tokens = estimate_tokens(response_text)
+        stats.total_ms = (time.perf_counter() - start) * 1000
+        self.record_request(stats)
     
-    def load_knowledge_base(self):
+    def offline_response(self, user_query, source, start):
         """
-        Load the knowledge base content.
+        Answer without the model and record the request.
         
+        Args:
+            user_query (str): The user's question
+            source (str): Source to record, "fallback" or "offline"
+            start (float): perf_counter() at the start of the request
+            
         Returns:
-            dict: Dictionary with strategy names as keys and content as values
+            str: A canned hint matching the question
         """
-        knowledge_base = {}
+        if "center" in user_query.lower() or "middle" in user_query.lower():
+            text = "Consider placing your piece in the center column (column 3) - it gives you the most opportunities to create winning combinations!"
+        elif "threat" in user_query.lower() or "block" in user_query.lower():
+            text = "Look for any three-in-a-row patterns that your opponent could complete. Blocking these threats is crucial!"
+        else:
+            text = "Try to control the center and look for opportunities to create multiple threats simultaneously!"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.record_request(TutorRequestStats(source, response_tokens=estimate_tokens(text),
+                                              first_chunk_ms=elapsed_ms, total_ms=elapsed_ms))
+        return text
+    
+    def record_request(self, stats):
+        """
+        Keep and log the statistics of a completed request.
         
-        try:
-            # Try different possible paths for the knowledge base files
-            possible_paths = [
-                'src/knowledge_base/center_control.md',
-                'knowledge_base/center_control.md',
-                '../knowledge_base/center_control.md'
-            ]
-            
-            center_control_content = None
-            for path in possible_paths:
-                try:
-                    with open(path, 'r') as f:
-                        center_control_content = f.read()
-                        print(f"Successfully loaded center control from: {path}")
-                        break
-                except FileNotFoundError:
-                    continue
-            
-            if center_control_content:
-                knowledge_base['center_control'] = center_control_content
-            else:
-                knowledge_base['center_control'] = 'Controlling the center column is important in Connect 4.'
-            
-            # Try different possible paths for threat analysis
-            possible_paths = [
-                'src/knowledge_base/threat_analysis.md',
-                'knowledge_base/threat_analysis.md',
-                '../knowledge_base/threat_analysis.md'
-            ]
-            
-            threat_analysis_content = None
-            for path in possible_paths:
-                try:
-                    with open(path, 'r') as f:
-                        threat_analysis_content = f.read()
-                        print(f"Successfully loaded threat analysis from: {path}")
-                        break
-                except FileNotFoundError:
-                    continue
+        Args:
+            stats (TutorRequestStats): The statistics
+        """
+        self.last_request = stats
+        print(f"Tutor request: {stats.summary()}")
+    
+    def close(self):
+        """Stop watching the knowledge base and close the response cache."""
+        self.knowledge_base.stop()
+        if self.cache is not None:
+            self.cache.close()
+    
+    def build_prompt(self, board_state, relevant_strategy, user_query):
+        """
+        Construct the prompt for one question.
+        
+        The instructions are not part of it: they are the model's system
+        instruction (see prompt_builder.SYSTEM_INSTRUCTION).
+        
+        Args:
+            board_state: 2D board indexed as board[row][col]
+            relevant_strategy (str): Relevant strategy content from knowledge base
+            user_query (str): The user's question
             
-            if threat_analysis_content:
-                knowledge_base['threat_analysis'] = threat_analysis_content
-            else:
-                knowledge_base['threat_analysis'] = 'Threats are potential winning combinations that need to be blocked.'
-                
-        except Exception as e:
-            print(f"Warning: Could not load knowledge base files: {e}")
-            knowledge_base = {
-                'center_control': 'Controlling the center column is important in Connect 4.',
-                'threat_analysis': 'Threats are potential winning combinations that need to be blocked.'
-            }
+        Returns:
+            str: The prompt
+        """
+        return self.prompt_builder.build(board_state, relevant_strategy, user_query)
+    
+    def load_knowledge_base(self):
+        """
+        Start loading the knowledge base.
+        
+        The documents under KNOWLEDGE_BASE_DIR are discovered and indexed on
+        a background thread, which keeps watching them so edited, added or
+        removed documents are used without restarting the game. Document
+        content is read on first use.
         
-        return knowledge_base
+        Returns:
+            KnowledgeBase: Mapping of document names (e.g. "center_control")
+                to their content
+        """
+        self.knowledge_base.start()
+        return self.knowledge_base
     
     def find_relevant_strategy(self, user_input, knowledge_base):
         """
         Find the most relevant strategy based on user input.
         
+        The KB_TOP_K best matching chunks of the knowledge base index are
+        returned, each under its section heading. Waits for the first scan
+        and indexing of the knowledge base, so call it off the game loop
+        (TutorWorker does).
+        
         Args:
             user_input (str): The user's question
-            knowledge_base (dict): The loaded knowledge base
+            knowledge_base (Mapping): The loaded knowledge base, used when no
+                indexed chunk matches the question
             
         Returns:
             str: The most relevant strategy content
         """
-        user_input_lower = user_input.lower()
-        
-        # Simple keyword matching
-        if any(word in user_input_lower for word in ['center', 'middle', 'column 3', 'column 4']):
-            return knowledge_base.get('center_control', 'Center control is important.')
+        self.knowledge_base.wait_until_scanned()
+        results = self.knowledge_index.search(user_input)
+        if results:
+            return '\n\n'.join(f"## {heading or source}\n{text}" for _, source, heading, text in results)
         
-        elif any(word in user_input_lower for word in ['threat', 'block', 'defend', 'three', 'winning']):
-            return knowledge_base.get('threat_analysis', 'Threat analysis is crucial.')
-        
-        else:
-            # Default to center control if no specific keywords found
-            return knowledge_base.get('center_control', 'Center control is important.')
+        # Default to center control if the question shares no words with the knowledge base
+        return knowledge_base.get('center_control', 'Center control is important.')
@@ -0,0 +1,198 @@
+import mmap
+import os
+import struct
+import time
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2, OPENING_BOOK_PLY, OPENING_BOOK_DEPTH
+from bitboard import Position
+
+
+# File layout: a header followed by fixed-size records sorted by key.
+# Every record holds the canonical (mirror-normalized) key of a position,
+# the score of the best move for the side to move and that move, given for
+# the canonical orientation.
+BOOK_MAGIC = b'C4BOOK01'
+HEADER = struct.Struct('<8sHHHxxI')  # magic, rows, columns, max ply, record count
+RECORD = struct.Struct('<QiBxxx')  # key, score, column
+
+
+class OpeningBook:
+    """
+    Read-only opening book backed by a memory-mapped file.
+
+    Opening the book only maps the file and reads the header, so startup
+    cost does not depend on the book size. Lookups binary search the sorted
+    records in place.
+    """
+
+    def __init__(self, path):
+        """
+        Open a book file.
+
+        Args:
+            path (str): Path of the book file
+
+        Raises:
+            ValueError: If the file is not a book for the current board size
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.data) < HEADER.size:
+            self.data.close()
+            raise ValueError(f"Opening book {path} is truncated")
+        magic, rows, columns, max_ply, count = HEADER.unpack_from(self.data, 0)
+        if magic != BOOK_MAGIC or (rows, columns) != (ROWS, COLUMNS):
+            self.data.close()
+            raise ValueError(f"{path} is not an opening book for a {ROWS}x{COLUMNS} board")
+        if len(self.data) < HEADER.size + count * RECORD.size:
+            self.data.close()
+            raise ValueError(f"Opening book {path} is truncated")
+        self.max_ply = max_ply
+        self.count = count
+
+    @classmethod
+    def load(cls, path):
+        """
+        Open a book file if it exists.
+
+        Args:
+            path (str): Path of the book file
+
+        Returns:
+            OpeningBook: The book, or None if the file is missing or invalid
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not open opening book: {e}")
+            return None
+
+    def __len__(self):
+        """Get the number of positions in the book."""
+        return self.count
+
+    def find(self, key):
+        """
+        Binary search the records for a key.
+
+        Args:
+            key (int): Canonical position key
+
+        Returns:
+            tuple: (column, score) in canonical orientation, or None
+        """
+        data = self.data
+        low = 0
+        high = self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, score, column = RECORD.unpack_from(data, HEADER.size + middle * RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return (column, score)
+        return None
+
+    def lookup(self, position, player):
+        """
+        Look up the best move of a player in a position.
+
+        The book is built from games where player 1 moves first, so it only
+        answers when it is the given player's turn in such a game.
+
+        Args:
+            position (Position): The position to look up
+            player (int): The player to move
+
+        Returns:
+            tuple: (column, score) for the player, or None if not in the book
+        """
+        if position.move_count >= self.max_ply:
+            return None
+        if player != (PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2):
+            return None
+        key, mirrored = position.canonical_key()
+        entry = self.find(key)
+        if entry is None:
+            return None
+        column, score = entry
+        if mirrored:
+            column = COLUMNS - 1 - column
+        return (column, score)
+
+    def close(self):
+        """Unmap the book file."""
+        self.data.close()
+
+
+def build_opening_book(path, max_ply=OPENING_BOOK_PLY, depth=OPENING_BOOK_DEPTH, progress=True):
+    """
+    Search every opening position and write the results to a book file.
+
+    All positions with fewer than max_ply moves that can arise from a game
+    started by player 1 are visited once per mirror pair, skipping positions
+    that are already decided.
+
+    Args:
+        path (str): Output file path
+        max_ply (int): Store positions with fewer moves than this
+        depth (int): Search depth used for every position
+        progress (bool): Print progress while building
+
+    Returns:
+        int: Number of positions written
+    """
+    from ai_engine import AIEngine
+
+    engines = {player: AIEngine(book_path=None, ai_player=player) for player in (PLAYER_1, PLAYER_2)}
+    records = {}
+    frontier = [Position()]
+    start = time.perf_counter()
+
+    for ply in range(max_ply):
+        player = PLAYER_1 if ply % 2 == 0 else PLAYER_2
+        engine = engines[player]
+        next_frontier = {}
+
+        for position in frontier:
+            key, mirrored = position.canonical_key()
+            score, column = engine.search(position, time_limit_ms=None, max_depth=depth)
+            if mirrored:
+                column = COLUMNS - 1 - column
+            records[key] = (score, column)
+
+            # Expand to the positions after every move that does not end the game
+            for col in range(COLUMNS):
+                if not position.can_play(col):
+                    continue
+                child = position.copy()
+                child.play(col, player)
+                if child.has_won(player) or child.is_full():
+                    continue
+                child_key = child.canonical_key()[0]
+                if child_key not in next_frontier:
+                    next_frontier[child_key] = child
+
+        if progress:
+            print(f"Ply {ply}: {len(frontier)} positions, {time.perf_counter() - start:.1f}s")
+        frontier = list(next_frontier.values())
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file first so an open book is never truncated
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(BOOK_MAGIC, ROWS, COLUMNS, max_ply, len(records)))
+        for key in sorted(records):
+            score, column = records[key]
+            f.write(RECORD.pack(key, score, column))
+    os.replace(temp_path, path)
+
+    return len(records)
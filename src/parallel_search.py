@@ -0,0 +1,247 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from constants import AI_WORKERS
+from bitboard import CENTER_ORDER
+
+
+# Value of the shared alpha before any root move has been scored
+NO_ALPHA = -(1 << 62)
+
+# Slots of the state shared with the workers: the id of the current search,
+# the best exact root score published in it, and the root order of its move
+GENERATION, ALPHA, ALPHA_ORDER = range(3)
+
+# Seconds between checks of the stop event while waiting for workers
+STOP_POLL_INTERVAL = 0.02
+
+# Per-process state of pool workers, set by _init_worker
+_worker_engine = None
+_worker_shared = None
+_worker_game = None
+
+
+class _SupersededCheck:
+    """Stop event of a worker task, set once a newer search has started."""
+
+    def __init__(self, shared, generation):
+        self.shared = shared
+        self.generation = generation
+
+    def is_set(self):
+        return self.shared[GENERATION] != self.generation
+
+
+def _init_worker(engine_options, shared):
+    """Create the engine a pool worker keeps for its whole lifetime."""
+    global _worker_engine, _worker_shared
+    from ai_engine import AIEngine
+
+    _worker_engine = AIEngine(book_path=None, workers=1, **engine_options)
+    _worker_shared = shared
+
+
+def _search_root_move(game, generation, position, column, order, depth, ai_player, alpha):
+    """
+    Score one root move inside a pool worker.
+
+    Args:
+        game: Identifier of the game, the worker's table is cleared when it changes
+        generation: Identifier of the search the task belongs to
+        position (Position): The root position
+        column: The root move to score
+        order: Index of the move in the root order, which breaks ties
+        depth: Search depth of the root
+        ai_player: The player the search is for
+        alpha: Best score known when the task was submitted
+
+    Returns:
+        tuple: (column, score, alpha, nodes) where alpha is the bound the
+            search used and score is exact if it is above alpha, an upper
+            bound otherwise, or None if the search was superseded
+    """
+    global _worker_game
+    from ai_engine import SearchAborted
+
+    engine = _worker_engine
+    shared = _worker_shared
+    if game != _worker_game:
+        engine.reset()
+        _worker_game = game
+    engine.ai_player = ai_player
+    engine.human_player = 3 - ai_player
+
+    # Other workers may have raised alpha since the task was submitted. A
+    # move later in the root order must beat this one, so its score is
+    # lowered by one to keep an equal score of this move exact.
+    with shared.get_lock():
+        if shared[GENERATION] != generation:
+            return (column, None, alpha, 0)
+        if shared[ALPHA] != NO_ALPHA:
+            alpha = max(alpha, shared[ALPHA] - (1 if shared[ALPHA_ORDER] > order else 0))
+
+    try:
+        score = engine.search_move(position, column, depth, alpha, _SupersededCheck(shared, generation))
+    except SearchAborted:
+        return (column, None, alpha, engine.nodes)
+
+    with shared.get_lock():
+        if (shared[GENERATION] == generation and score > alpha
+                and (shared[ALPHA] == NO_ALPHA or (score, -order) > (shared[ALPHA], -shared[ALPHA_ORDER]))):
+            shared[ALPHA] = score
+            shared[ALPHA_ORDER] = order
+    return (column, score, alpha, engine.nodes)
+
+
+class ParallelSearch:
+    """
+    Root-splitting search over a persistent process pool.
+
+    The first root move is searched with a full window to get a bound, then
+    the remaining root moves are searched in parallel. Workers publish their
+    exact scores through a shared alpha value, and each task starts from the
+    best score known at that time, so later moves can be cut off early. Of
+    equal scores the move earliest in the root order wins, so the result
+    does not depend on which task finishes first. Workers keep their engine,
+    including its transposition table, between moves.
+
+    Every search has its own generation id. Tasks of a cancelled search see
+    that a newer one has started and stop, and never read or publish the
+    alpha of another search.
+    """
+
+    def __init__(self, workers=AI_WORKERS, **engine_options):
+        """
+        Initialize the search. Worker processes start on first use.
+
+        Args:
+            workers (int): Number of worker processes (0 uses every core)
+            **engine_options: Keyword arguments for the workers' AIEngine
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.engine_options = engine_options
+        self.shared = multiprocessing.Array('q', [0, NO_ALPHA, 0])
+        self.executor = None
+        # Tasks of cancelled searches that may still be running
+        self.stale = set()
+        self.game = 0
+        self.nodes = 0
+
+    def start(self):
+        """Start the worker processes if they are not running yet."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.engine_options, self.shared),
+            )
+
+    def reset(self):
+        """Make the workers forget the current game before their next task."""
+        self.game += 1
+
+    def search(self, position, depth, ai_player, first_move=None, stop_event=None):
+        """
+        Search a position to a fixed depth.
+
+        Args:
+            position (Position): The root position, with ai_player to move
+            depth: Search depth (at least 1)
+            ai_player: The player to find a move for
+            first_move: Column to search first (e.g. from the last search)
+            stop_event (threading.Event): Cancels the search when set, or None
+
+        Returns:
+            tuple: (score, column) for the best move, or None if stop_event
+                was set. Tasks already running in a worker stop soon after.
+        """
+        self.start()
+        self.nodes = 0
+        columns = [col for col in CENTER_ORDER if position.can_play(col)]
+        if first_move in columns:
+            columns.remove(first_move)
+            columns.insert(0, first_move)
+
+        # Tasks of a cancelled search have been told to stop, let them finish
+        wait(self.stale)
+        self.stale = set()
+        with self.shared.get_lock():
+            self.shared[GENERATION] += 1
+            self.shared[ALPHA] = NO_ALPHA
+            self.shared[ALPHA_ORDER] = 0
+            generation = self.shared[GENERATION]
+
+        # The first move gives the bound the other workers start from
+        future = self.executor.submit(_search_root_move, self.game, generation, position, columns[0], 0,
+                                      depth, ai_player, -float('inf'))
+        if not self.wait_for({future}, stop_event):
+            return None
+        best_column, best_score, _, nodes = future.result()
+        self.nodes += nodes
+        best_order = 0
+
+        pending = {
+            self.executor.submit(_search_root_move, self.game, generation, position, col, order, depth,
+                                 ai_player, best_score)
+            for order, col in enumerate(columns[1:], 1)
+        }
+        while pending:
+            timeout = None if stop_event is None else STOP_POLL_INTERVAL
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if stop_event is not None and stop_event.is_set():
+                self.cancel(pending)
+                return None
+            for future in done:
+                column, score, alpha, nodes = future.result()
+                self.nodes += nodes
+                # Scores not above the bound a task used are only upper
+                # bounds: the move is no better than one already found
+                if score is None or score <= alpha:
+                    continue
+                order = columns.index(column)
+                if (score, -order) > (best_score, -best_order):
+                    best_score, best_column, best_order = score, column, order
+
+        return (best_score, best_column)
+
+    def wait_for(self, futures, stop_event):
+        """
+        Wait for tasks unless the search is stopped first.
+
+        Args:
+            futures (set): The tasks to wait for
+            stop_event (threading.Event): Cancels the wait when set, or None
+
+        Returns:
+            bool: True if the tasks finished, False if stop_event was set
+        """
+        if stop_event is None:
+            wait(futures)
+            return True
+        while not stop_event.is_set():
+            if not wait(futures, timeout=STOP_POLL_INTERVAL).not_done:
+                return True
+        self.cancel(futures)
+        return False
+
+    def cancel(self, futures):
+        """
+        Cancel the tasks of the current search.
+
+        Queued tasks are dropped and running ones stop at their next budget
+        check; the next search waits for them before it starts.
+
+        Args:
+            futures (set): The unfinished tasks
+        """
+        with self.shared.get_lock():
+            self.shared[GENERATION] += 1
+        for future in futures:
+            if not future.cancel():
+                self.stale.add(future)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,169 @@
+import threading
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2, EMPTY, TUTOR_ANALYSIS_DEPTH
+from ai_engine import AIEngine
+from bitboard import Position
+from evaluation import WIN_SCORE
+
+
+# Sent once as the model's system instruction instead of with every question
+SYSTEM_INSTRUCTION = """You are a Connect 4 tutor using the Socratic method. Never give the answer directly: reply with an encouraging guiding question (2-3 sentences at most) that helps the student discover it and builds their strategic thinking. Base it on the position, the engine facts and the strategy notes.
+
+Positions are rows from top to bottom separated by "/": X is player 1, O is player 2, a digit is that many empty cells. Columns are numbered 0-6 from the left. The engine facts are correct; use them to steer your question without revealing them."""
+
+PIECE_CODES = {PLAYER_1: 'X', PLAYER_2: 'O'}
+
+
+def encode_board(board):
+    """
+    Encode a board in a compact row format.
+
+    Args:
+        board: 2D board indexed as board[row][col], row 0 at the top
+
+    Returns:
+        str: e.g. "7/7/7/7/3O3/2XXO2" for rows top to bottom, with runs of
+            empty cells written as their length
+    """
+    rows = []
+    for row in range(ROWS):
+        text = ''
+        empty = 0
+        for col in range(COLUMNS):
+            piece = board[row][col]
+            if piece == EMPTY:
+                empty += 1
+                continue
+            if empty:
+                text += str(empty)
+                empty = 0
+            text += PIECE_CODES[piece]
+        if empty:
+            text += str(empty)
+        rows.append(text)
+    return '/'.join(rows)
+
+
+def format_columns(columns):
+    """Join column numbers as "3", "2 or 5" or "1, 2 or 5"."""
+    names = [str(col) for col in columns]
+    if len(names) == 1:
+        return names[0]
+    return ', '.join(names[:-1]) + ' or ' + names[-1]
+
+
+def format_score(score):
+    """Describe an engine score as a signed number, "win" or "loss"."""
+    if score >= WIN_SCORE:
+        return "win"
+    if score <= -WIN_SCORE:
+        return "loss"
+    return f"{score:+d}"
+
+
+class PromptBuilder:
+    """
+    Builds the compact per-question prompt of the tutor.
+
+    Instead of the text grid and the instructions, every question carries
+    the board in a short row format and facts worked out by its own
+    AIEngine: the columns that win at once, the columns that must be
+    blocked, and a fixed-depth score of every column for the player to
+    move. The instructions go to the model once, as SYSTEM_INSTRUCTION.
+    """
+
+    def __init__(self, analysis_depth=TUTOR_ANALYSIS_DEPTH):
+        """
+        Initialize the builder. Its engine is created on first use.
+
+        Args:
+            analysis_depth (int): Search depth of the column scores, or 0 to
+                leave them out
+        """
+        self.analysis_depth = analysis_depth
+        # Separate from the game's engine, which searches on the AI thread
+        self.engine = None
+        self.engine_lock = threading.Lock()
+
+    def analyze(self, board):
+        """
+        Work out the facts about a position.
+
+        Args:
+            board: 2D board indexed as board[row][col]
+
+        Returns:
+            dict: 'to_move' (player or None if the game is over), 'wins'
+                (columns that win at once), 'blocks' (columns where the
+                opponent would win next) and 'scores' (per-column scores
+                for the player to move, None for full columns, or None if
+                not computed)
+        """
+        position = Position.from_board(board)
+        facts = {'to_move': None, 'wins': [], 'blocks': [], 'scores': None}
+        if position.has_won(PLAYER_1) or position.has_won(PLAYER_2) or position.is_full():
+            return facts
+
+        player = PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+        facts['to_move'] = player
+        for col in range(COLUMNS):
+            if not position.can_play(col):
+                continue
+            position.play(col, player)
+            if position.has_won(player):
+                facts['wins'].append(col)
+            position.undo()
+            position.play(col, 3 - player)
+            if position.has_won(3 - player):
+                facts['blocks'].append(col)
+            position.undo()
+
+        if self.analysis_depth:
+            with self.engine_lock:
+                if self.engine is None:
+                    self.engine = AIEngine(tt_size=1 << 14, book_path=None, workers=1, collect_stats=False)
+                facts['scores'] = self.engine.score_columns(board, self.analysis_depth)
+        return facts
+
+    def describe_facts(self, facts):
+        """
+        Write the facts about a position as short sentences.
+
+        Args:
+            facts (dict): Facts from analyze()
+
+        Returns:
+            str: One line per fact
+        """
+        player = facts['to_move']
+        if player is None:
+            return "The game is over."
+        me, opponent = PIECE_CODES[player], PIECE_CODES[3 - player]
+        lines = [f"To move: {me}"]
+        if facts['wins']:
+            lines.append(f"{me} wins at once in column {format_columns(facts['wins'])}.")
+        if facts['blocks']:
+            lines.append(f"{opponent} threatens to win in column {format_columns(facts['blocks'])}; "
+                         f"{me} must block.")
+        if facts['scores'] is not None:
+            scores = ' '.join(f"{col}:{format_score(score)}" for col, score in enumerate(facts['scores'])
+                              if score is not None)
+            lines.append(f"Engine scores for {me} by column (depth {self.analysis_depth}, "
+                         f"higher is better): {scores}")
+        return '\n'.join(lines)
+
+    def build(self, board, relevant_strategy, user_query):
+        """
+        Build the prompt of one question.
+
+        Args:
+            board: 2D board indexed as board[row][col]
+            relevant_strategy (str): Relevant strategy content from knowledge base
+            user_query (str): The user's question
+
+        Returns:
+            str: The prompt
+        """
+        return (f"Position: {encode_board(board)}\n"
+                f"{self.describe_facts(self.analyze(board))}\n\n"
+                f"Strategy notes:\n{relevant_strategy}\n\n"
+                f"Student's question: {user_query}")
@@ -0,0 +1,315 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from prompt_builder import encode_board
+from constants import ROWS, COLUMNS, TUTOR_CACHE_PATH, TUTOR_CACHE_SIZE, TUTOR_CACHE_MEMORY_SIZE, TUTOR_CACHE_TTL_S
+
+
+# "column 3", "Column 3" or a list such as "columns 2 and 3" or "columns 1, 2
+# or 5" in a question or an answer
+COLUMN_NUMBER = re.compile(r'[0-9]+\b')
+COLUMN_REFERENCE = re.compile(r'(?i)\b(columns?\s+)([0-9]+\b(?:(?:\s*,\s*(?:(?:and|or)\s+)?|\s+(?:and|or)\s+)[0-9]+\b)*)')
+
+# What mirror_columns cannot rewrite once the column references are gone: a
+# bare number ("Should I play 2?"), "col 1", a side ("the left edge") or a
+# column named in words ("the first column")
+UNMIRRORABLE = re.compile(
+    r'(?i)[0-9]|\b(?:left|right)|\bcols?\b'
+    r'|\b(?:one|two|three|four|five|six|seven|first|second|third|fourth|fifth|sixth|seventh|last)\s+columns?\b'
+    r'|\bcolumns?\s+(?:one|two|three|four|five|six|seven)\b')
+
+
+def mirror_columns(text):
+    """
+    Replace column references in a text by those of the mirrored board.
+
+    Args:
+        text (str): A question or answer, e.g. "Why not column 1?"
+
+    Returns:
+        str: The text with every column number replaced, e.g. "Why not
+            column 5?" or "columns 4 and 3" for "columns 2 and 3"
+    """
+    def flip_number(match):
+        column = int(match.group(0))
+        if column >= COLUMNS:
+            return match.group(0)
+        return str(COLUMNS - 1 - column)
+
+    def flip(match):
+        return match.group(1) + COLUMN_NUMBER.sub(flip_number, match.group(2))
+    return COLUMN_REFERENCE.sub(flip, text)
+
+
+def can_mirror(text):
+    """
+    Check whether mirror_columns() rewrites a text completely.
+
+    Args:
+        text (str): A question or answer
+
+    Returns:
+        bool: False if the text refers to a column in a way mirror_columns()
+            leaves alone, so it is only valid for its own board
+    """
+    return UNMIRRORABLE.search(COLUMN_REFERENCE.sub('', text)) is None
+
+
+def canonical_board(board):
+    """
+    Encode a board, mirror-normalized.
+
+    Args:
+        board: 2D board indexed as board[row][col]
+
+    Returns:
+        tuple: (encoding, mirrored) where encoding is the encode_board() text
+            of the smaller of the board and its mirror image, and mirrored is
+            True if that is the mirror image
+    """
+    encoding = encode_board(board)
+    mirror = encode_board([tuple(board[row])[::-1] for row in range(ROWS)])
+    if mirror < encoding:
+        return mirror, True
+    return encoding, False
+
+
+def normalize_query(query):
+    """
+    Normalize a question so trivially different spellings share a cache entry.
+
+    Args:
+        query (str): The student's question
+
+    Returns:
+        str: The question in lower case without punctuation or extra spaces
+    """
+    return ' '.join(re.sub(r'[^\w\s]', ' ', query.lower()).split())
+
+
+def strategy_id(relevant_strategy):
+    """
+    Get a short id of a strategy text.
+
+    Args:
+        relevant_strategy (str): Strategy content from the knowledge base
+
+    Returns:
+        str: Hex digest of the text, so an edited document gets a new id
+    """
+    return hashlib.sha1(relevant_strategy.encode('utf-8')).hexdigest()[:16]
+
+
+class ResponseCache:
+    """
+    Cache of tutor answers keyed by position, question and strategy.
+
+    Answers are kept in an in-memory LRU in front of a SQLite file, so hits
+    of the running game are a dictionary lookup and answers survive restarts.
+    Positions are mirror-normalized: an answer given for a board is reused
+    for its mirror image, with its column references flipped. Questions and
+    answers with columns mirror_columns() cannot flip (e.g. "Should I play
+    2?" or "the left side") are only kept for their own board. Entries older
+    than the TTL count as misses, and the least recently used entries beyond
+    the size cap are dropped.
+
+    The cache is safe to use from the tutor worker threads.
+    """
+
+    def __init__(self, path=TUTOR_CACHE_PATH, max_entries=TUTOR_CACHE_SIZE,
+                 memory_entries=TUTOR_CACHE_MEMORY_SIZE, ttl_seconds=TUTOR_CACHE_TTL_S):
+        """
+        Open the cache, creating the database file if needed.
+
+        Args:
+            path (str): SQLite file, or None to keep answers in memory only
+            max_entries (int): Maximum number of answers stored in the file
+            memory_entries (int): Maximum number of answers kept in memory
+            ttl_seconds (float): Age after which an answer expires, or None
+                to keep answers until they are evicted
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # key -> (response, created), least recently used first
+        self.memory = OrderedDict()
+        # key -> access time of answers read from the file since the last write
+        self.touched = {}
+        self.db = None
+
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                            "created REAL NOT NULL, accessed REAL NOT NULL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self.db.commit()
+
+    @staticmethod
+    def make_key(board_state, relevant_strategy, user_query, shared=True):
+        """
+        Build the cache key of a question.
+
+        Args:
+            board_state: 2D board indexed as board[row][col]
+            relevant_strategy (str): Strategy content sent with the question
+            user_query (str): The student's question
+            shared (bool): Whether the entry may be shared with the mirror
+                image of the board. It is not if the question cannot be
+                mirrored.
+
+        Returns:
+            tuple: (key, mirrored) where mirrored is True if the key describes
+                the mirror image of the board, so columns must be flipped
+        """
+        if shared and can_mirror(user_query):
+            board, mirrored = canonical_board(board_state)
+            kind = 'shared'
+        else:
+            board, mirrored = encode_board(board_state), False
+            kind = 'own'
+        query = normalize_query(mirror_columns(user_query) if mirrored else user_query)
+        key = hashlib.sha1('\0'.join((kind, board, query, strategy_id(relevant_strategy))).encode('utf-8'))
+        return key.hexdigest(), mirrored
+
+    def get(self, board_state, relevant_strategy, user_query):
+        """
+        Look up the answer to a question.
+
+        Args:
+            board_state: 2D board indexed as board[row][col]
+            relevant_strategy (str): Strategy content sent with the question
+            user_query (str): The student's question
+
+        Returns:
+            str: The cached answer for this board, or None on a miss
+        """
+        key, mirrored = self.make_key(board_state, relevant_strategy, user_query)
+        with self.lock:
+            response = self.lookup(key)
+            if response is None and can_mirror(user_query):
+                # An answer that cannot be mirrored is kept for its own board
+                key, mirrored = self.make_key(board_state, relevant_strategy, user_query, shared=False)
+                response = self.lookup(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return mirror_columns(response) if mirrored else response
+
+    def put(self, board_state, relevant_strategy, user_query, response):
+        """
+        Store the answer to a question.
+
+        Args:
+            board_state: 2D board indexed as board[row][col]
+            relevant_strategy (str): Strategy content sent with the question
+            user_query (str): The student's question
+            response (str): The complete answer
+        """
+        key, mirrored = self.make_key(board_state, relevant_strategy, user_query, shared=can_mirror(response))
+        if mirrored:
+            response = mirror_columns(response)
+        now = time.time()
+        with self.lock:
+            self.remember(key, response, now)
+            if self.db is not None:
+                self.write_access_times()
+                self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                                (key, response, now, now))
+                self.db.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                                "ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+                self.db.commit()
+
+    def lookup(self, key):
+        """Find an unexpired answer in memory or in the file (lock held)."""
+        now = time.time()
+        entry = self.memory.get(key)
+        if entry is not None:
+            if not self.expired(entry[1], now):
+                self.memory.move_to_end(key)
+                return entry[0]
+            del self.memory[key]
+
+        if self.db is None:
+            return None
+        row = self.db.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        response, created = row
+        if self.expired(created, now):
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.db.commit()
+            return None
+        # Written with the next put or on close, so disk hits stay fast
+        self.touched[key] = now
+        self.remember(key, response, created)
+        return response
+
+    def write_access_times(self):
+        """Write the access times of answers read from the file (lock held)."""
+        if self.touched:
+            self.db.executemany("UPDATE responses SET accessed = ? WHERE key = ?",
+                                [(accessed, key) for key, accessed in self.touched.items()])
+            self.touched.clear()
+
+    def remember(self, key, response, created):
+        """Add an answer to the in-memory LRU (lock held)."""
+        self.memory[key] = (response, created)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def expired(self, created, now):
+        """Check whether an answer created at a time has outlived the TTL."""
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: hits, misses, hit_rate, and the number of answers in memory
+                and in the file
+        """
+        with self.lock:
+            stored = len(self.memory)
+            if self.db is not None:
+                stored = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self.memory),
+                'stored_entries': stored,
+            }
+
+    def clear(self):
+        """Remove every answer from memory and from the file."""
+        with self.lock:
+            self.memory.clear()
+            self.touched.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM responses")
+                self.db.commit()
+
+    def close(self):
+        """Close the database file. Later lookups only use memory."""
+        with self.lock:
+            if self.db is not None:
+                self.write_access_times()
+                self.db.commit()
+                self.db.close()
+                self.db = None
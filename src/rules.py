@@ -0,0 +1,143 @@
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2, EMPTY
+from bitboard import COLUMN_HEIGHT, COLUMN_MASKS, BOTTOM_MASK, cell_bit, has_alignment
+
+
+# Bits per bitboard, including the sentinel bit of every column
+NUM_CELLS = COLUMNS * COLUMN_HEIGHT
+
+
+def _build_line_masks():
+    """Build one bitmask for every line of four cells on the board."""
+    masks = []
+    directions = [(0, 1), (1, 0), (1, 1), (-1, 1)]  # (row step, col step)
+    for row_step, col_step in directions:
+        for row in range(ROWS):
+            for col in range(COLUMNS):
+                end_row = row + 3 * row_step
+                end_col = col + 3 * col_step
+                if not (0 <= end_row < ROWS and 0 <= end_col < COLUMNS):
+                    continue
+                mask = 0
+                for i in range(4):
+                    mask |= 1 << cell_bit(row + i * row_step, col + i * col_step)
+                masks.append(mask)
+    return tuple(masks)
+
+
+# Every line of four cells that can win the game
+LINE_MASKS = _build_line_masks()
+
+# Indices into LINE_MASKS of the lines through each bit of the board
+CELL_LINES = tuple(
+    tuple(index for index, mask in enumerate(LINE_MASKS) if mask >> bit & 1)
+    for bit in range(NUM_CELLS)
+)
+
+# The masks of the lines through each bit of the board
+CELL_LINE_MASKS = tuple(tuple(LINE_MASKS[index] for index in lines) for lines in CELL_LINES)
+
+
+def completes_line(bits, cell):
+    """
+    Check whether a piece lies on a line of four of its player.
+
+    Only the lines through the cell are looked at, so this is the check to
+    run after a move.
+
+    Args:
+        bits (int): Bitboard of the player's pieces, including the new piece
+        cell (int): Bit index of the piece
+
+    Returns:
+        bool: True if one of the lines through the cell is complete
+    """
+    for mask in CELL_LINE_MASKS[cell]:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def landing_cell(occupied, column):
+    """
+    Find where a piece dropped in a column lands.
+
+    Args:
+        occupied (int): Bitboard of all occupied cells
+        column (int): The column to drop the piece in
+
+    Returns:
+        int: Bit index of the landing cell, or -1 if the column is full
+    """
+    cell = (occupied + BOTTOM_MASK) & COLUMN_MASKS[column]
+    return cell.bit_length() - 1
+
+
+def board_bitboards(board):
+    """
+    Convert a 2D board to bitboards.
+
+    Args:
+        board: The board state, indexed as board[row][col] (row 0 is the top
+            row), or a BoardSnapshot, whose bitboards are returned as they are
+
+    Returns:
+        tuple: (player 1 bitboard, player 2 bitboard)
+    """
+    player1_bits = getattr(board, 'player1_bits', None)
+    if player1_bits is not None:
+        return (player1_bits, board.player2_bits)
+    bitboards = [0, 0, 0]
+    for row in range(ROWS):
+        cells = board[row]
+        for col in range(COLUMNS):
+            piece = cells[col]
+            if piece != EMPTY:
+                bitboards[int(piece)] |= 1 << cell_bit(row, col)
+    return (bitboards[PLAYER_1], bitboards[PLAYER_2])
+
+
+def check_win(board, player):
+    """
+    Check if a player has four in a row on a 2D board.
+
+    Args:
+        board: The board state
+        player (int): The player to check
+
+    Returns:
+        bool: True if the player has won
+    """
+    return has_alignment(board_bitboards(board)[player - 1])
+
+
+def valid_locations(board):
+    """
+    List the columns of a 2D board that are not full.
+
+    Args:
+        board: The board state
+
+    Returns:
+        list: Playable column indices in increasing order
+    """
+    top_row = board[0]
+    return [col for col in range(COLUMNS) if top_row[col] == EMPTY]
+
+
+def drop_piece(board, column, player):
+    """
+    Drop a piece in a column of a mutable 2D board.
+
+    Args:
+        board: The board to modify
+        column (int): The column to drop the piece in
+        player (int): The player making the move
+
+    Returns:
+        int: The row the piece landed in, or None if the column is full
+    """
+    for row in range(ROWS - 1, -1, -1):
+        if board[row][column] == EMPTY:
+            board[row][column] = player
+            return row
+    return None
@@ -0,0 +1,98 @@
+class SearchStats:
+    """
+    Telemetry of one AIEngine search.
+
+    The engine keeps its counters as plain integers while searching and
+    only copies them into a SearchStats when the search is over, so
+    collecting statistics costs a few increments per node.
+    """
+
+    __slots__ = ('source', 'column', 'score', 'time_ms', 'nodes', 'leaf_evaluations', 'cutoffs',
+                 'first_move_cutoffs', 'max_ply', 'tt_probes', 'tt_hits', 'iterations',
+                 'principal_variation')
+
+    def __init__(self, source, column, score, time_ms, nodes=0, leaf_evaluations=0, cutoffs=0,
+                 first_move_cutoffs=0, max_ply=0, tt_probes=0, tt_hits=0, iterations=(),
+                 principal_variation=()):
+        """
+        Initialize the statistics.
+
+        Args:
+            source (str): Where the move came from: "search", "parallel",
+                "book" or "ponder"
+            column (int): The chosen column
+            score: Score of the chosen column
+            time_ms (float): Total time of the search in milliseconds
+            nodes (int): Nodes visited
+            leaf_evaluations (int): Heuristic evaluations at the search horizon
+            cutoffs (int): Beta cutoffs
+            first_move_cutoffs (int): Beta cutoffs caused by the first move tried
+            max_ply (int): Deepest ply reached from the root
+            tt_probes (int): Transposition table lookups
+            tt_hits (int): Lookups that found the position
+            iterations: (depth, time_ms, nodes) of every completed iteration
+            principal_variation: The expected line of play, starting with column
+        """
+        self.source = source
+        self.column = column
+        self.score = score
+        self.time_ms = time_ms
+        self.nodes = nodes
+        self.leaf_evaluations = leaf_evaluations
+        self.cutoffs = cutoffs
+        self.first_move_cutoffs = first_move_cutoffs
+        self.max_ply = max_ply
+        self.tt_probes = tt_probes
+        self.tt_hits = tt_hits
+        self.iterations = list(iterations)
+        self.principal_variation = list(principal_variation)
+
+    @property
+    def depth(self):
+        """Depth of the deepest completed iteration (0 if nothing was searched)."""
+        return self.iterations[-1][0] if self.iterations else 0
+
+    @property
+    def nodes_per_sec(self):
+        """Nodes visited per second."""
+        return self.nodes * 1000 / self.time_ms if self.time_ms > 0 else 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        """Share of beta cutoffs caused by the first move tried."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        """Share of transposition table lookups that found the position."""
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def to_dict(self):
+        """
+        Convert the statistics to plain values, e.g. for JSON.
+
+        Returns:
+            dict: Every field and derived rate
+        """
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['depth'] = self.depth
+        data['nodes_per_sec'] = round(self.nodes_per_sec)
+        data['first_move_cutoff_rate'] = round(self.first_move_cutoff_rate, 4)
+        data['tt_hit_rate'] = round(self.tt_hit_rate, 4)
+        return data
+
+    def summary(self):
+        """
+        Describe the search in one line for logging.
+
+        Returns:
+            str: e.g. "column 3 score 12 depth 6 (max ply 9) 7256 nodes in 83.4 ms ..."
+        """
+        if self.source in ('book', 'ponder'):
+            return f"column {self.column} score {self.score} from {self.source} in {self.time_ms:.1f} ms"
+        pv = ''.join(str(column) for column in self.principal_variation)
+        return (f"column {self.column} score {self.score} depth {self.depth} (max ply {self.max_ply}) "
+                f"{self.nodes} nodes in {self.time_ms:.1f} ms ({self.nodes_per_sec:.0f}/s), "
+                f"{self.leaf_evaluations} evaluations, {self.cutoffs} cutoffs "
+                f"({self.first_move_cutoff_rate:.0%} first move), "
+                f"tt hits {self.tt_hit_rate:.0%}, pv {pv or '-'}")
@@ -0,0 +1,141 @@
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from constants import COLUMNS, PLAYER_1, PLAYER_2, AI_DEPTH, OPENING_BOOK_PATH
+from bitboard import Position
+from game_model import GameModel
+
+
+# Engines of a pool worker, keyed by player, set by _init_worker
+_worker_engines = None
+_worker_settings = None
+
+
+def side_settings(depth=AI_DEPTH, time_limit_ms=None, book=False):
+    """
+    Build the engine settings of one side.
+
+    Args:
+        depth (int): Search depth (the deepest iteration with a time limit)
+        time_limit_ms (int): Time budget per move, or None for a fixed depth
+        book (bool): Answer opening positions from the opening book
+
+    Returns:
+        dict: The settings, as accepted by run_selfplay
+    """
+    return {'depth': depth, 'time_limit_ms': time_limit_ms, 'book': book}
+
+
+def _init_worker(settings):
+    """Create the engines a pool worker keeps for its whole lifetime."""
+    global _worker_engines, _worker_settings
+    from ai_engine import AIEngine
+
+    _worker_settings = settings
+    _worker_engines = {
+        player: AIEngine(ai_player=player, workers=1,
+                         book_path=OPENING_BOOK_PATH if settings[player]['book'] else None)
+        for player in (PLAYER_1, PLAYER_2)
+    }
+
+
+def play_game(index, seed, opening_plies):
+    """
+    Play one AI-vs-AI game inside a pool worker.
+
+    The first opening_plies moves are random, so games with different seeds
+    take different paths through the same engines.
+
+    Args:
+        index (int): Number of the game
+        seed (int): Seed of the random opening
+        opening_plies (int): Number of random moves before the engines play
+
+    Returns:
+        dict: The game record (see run_selfplay)
+    """
+    rng = random.Random(seed)
+    game = GameModel()
+    position = Position()
+    times_ms = []
+    nodes = []
+    for engine in _worker_engines.values():
+        engine.reset()
+
+    while not game.game_over:
+        player = game.current_player
+        if len(game.moves) < opening_plies:
+            column = rng.choice([col for col in range(COLUMNS) if position.can_play(col)])
+        else:
+            engine = _worker_engines[player]
+            settings = _worker_settings[player]
+            start = time.perf_counter()
+            _, column = engine.search(position, settings['time_limit_ms'], None, settings['depth'])
+            times_ms.append(round((time.perf_counter() - start) * 1000, 3))
+            nodes.append(engine.nodes)
+        game.make_move(column, player)
+        position.play(column, player)
+        game.update_status(player)
+
+    moves = game.to_moves()
+    return {
+        'game': index,
+        'seed': seed,
+        'opening': moves[:opening_plies],
+        'moves': moves,
+        'winner': game.winner,
+        'plies': len(moves),
+        'move_times_ms': times_ms,
+        'nodes': nodes,
+    }
+
+
+def run_selfplay(games, output, player1=None, player2=None, workers=0, opening_plies=2, seed=0,
+                 progress=True):
+    """
+    Play AI-vs-AI games in a process pool and stream their records.
+
+    Every finished game is written as one JSON line as soon as it is done,
+    so the output can be followed while the run is going. A record holds
+    the game number and seed, the opening and all moves as move strings,
+    the winner (null for a draw), and the time in ms and nodes searched of
+    every engine move.
+
+    Args:
+        games (int): Number of games to play
+        output: Writable text file for the JSON lines
+        player1 (dict): Settings of player 1 from side_settings(), or None for defaults
+        player2 (dict): Settings of player 2 from side_settings(), or None for defaults
+        workers (int): Number of worker processes (0 uses every core)
+        opening_plies (int): Random moves at the start of every game
+        seed (int): Base seed, game i uses seed + i
+        progress (bool): Print a summary to stderr at the end
+
+    Returns:
+        dict: Number of wins of each player and of draws, keyed 1, 2 and None
+    """
+    settings = {
+        PLAYER_1: player1 or side_settings(),
+        PLAYER_2: player2 or side_settings(),
+    }
+    results = {PLAYER_1: 0, PLAYER_2: 0, None: 0}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                             initializer=_init_worker, initargs=(settings,)) as executor:
+        futures = [executor.submit(play_game, index, seed + index, opening_plies) for index in range(games)]
+        for future in as_completed(futures):
+            record = future.result()
+            results[record['winner']] += 1
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+
+    if progress:
+        elapsed = time.perf_counter() - start
+        print(f"{games} games in {elapsed:.1f}s ({games * 60 / elapsed:.0f} games/min): "
+              f"player 1 won {results[PLAYER_1]}, player 2 won {results[PLAYER_2]}, "
+              f"{results[None]} draws", file=sys.stderr)
+    return results
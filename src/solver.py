@@ -0,0 +1,217 @@
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2
+from bitboard import BOTTOM_MASK, BOARD_MASK, CENTER_ORDER, COLUMN_MASKS, popcount, winning_cells
+from transposition_table import TranspositionTable, UPPER_BOUND
+
+
+CELLS = ROWS * COLUMNS
+
+SOLVER_TT_SIZE = 1 << 19
+
+
+class Solver:
+    """
+    Exact Connect 4 solver.
+
+    Computes the game-theoretic value of a position with a negamax search
+    that only ever uses null windows, narrowing the score range by
+    bisection like MTD(f). Scores follow the usual convention:
+
+    * 0: the game is a draw with best play
+    * positive: the player to move wins. The sooner the win, the higher
+      the score: 1 means winning with the last stone, and each earlier
+      stone adds one.
+    * negative: the player to move loses, with the same scale
+
+    The search works on (current player's pieces, occupied cells) bitboard
+    pairs, with the side to move given by the move count (player 1 moves
+    first).
+    """
+
+    def __init__(self, tt_size=SOLVER_TT_SIZE):
+        """
+        Initialize the solver.
+
+        Args:
+            tt_size (int): Maximum transposition table entries
+        """
+        self.transposition_table = TranspositionTable(tt_size)
+        self.nodes = 0
+
+    def reset(self):
+        """Forget all stored results."""
+        self.transposition_table.clear()
+
+    def negamax(self, current, mask, moves, alpha, beta):
+        """
+        Negamax search with alpha-beta pruning.
+
+        The player to move cannot win with their next move (checked by the
+        caller). The result is exact inside (alpha, beta); otherwise it is
+        a bound on the same side as the window.
+
+        Args:
+            current: Bitboard of the player to move
+            mask: Bitboard of all occupied cells
+            moves: Number of moves played
+            alpha: Lower end of the search window
+            beta: Upper end of the search window
+
+        Returns:
+            int: Score of the position for the player to move
+        """
+        self.nodes += 1
+
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        opponent_wins = winning_cells(current ^ mask, mask)
+        forced = possible & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                # Two threats to block at once: the opponent wins next move
+                return -((CELLS - moves) // 2)
+            possible = forced
+        non_losing = possible & ~(opponent_wins >> 1)
+        if not non_losing:
+            return -((CELLS - moves) // 2)
+
+        if moves >= CELLS - 2:
+            return 0  # Neither player can win with the last two stones
+
+        # The opponent cannot win with their next move, so the score is
+        # bounded from below
+        lower = -((CELLS - 2 - moves) // 2)
+        if alpha < lower:
+            alpha = lower
+            if alpha >= beta:
+                return alpha
+
+        # Upper bound: we cannot win with our next move, or a stored bound
+        upper = (CELLS - 1 - moves) // 2
+        table = self.transposition_table
+        key = current + mask + BOTTOM_MASK
+        slot = table.probe(key)
+        if slot >= 0:
+            upper = table.scores[slot]
+        if beta > upper:
+            beta = upper
+            if alpha >= beta:
+                return beta
+
+        # Try moves that create the most new threats first, center first on ties
+        ordered = []
+        for col in CENTER_ORDER:
+            move = non_losing & COLUMN_MASKS[col]
+            if move:
+                threats = popcount(winning_cells(current | move, mask))
+                index = len(ordered)
+                while index > 0 and ordered[index - 1][0] < threats:
+                    index -= 1
+                ordered.insert(index, (threats, move))
+
+        opponent = current ^ mask
+        for _, move in ordered:
+            score = -self.negamax(opponent, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        table.store(key, alpha, UPPER_BOUND, CELLS - moves, -1)
+        return alpha
+
+    def solve_bitboards(self, current, mask, moves):
+        """
+        Solve a position given as bitboards.
+
+        Args:
+            current: Bitboard of the player to move
+            mask: Bitboard of all occupied cells
+            moves: Number of moves played
+
+        Returns:
+            int: Exact score for the player to move
+        """
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        if winning_cells(current, mask) & possible:
+            return (CELLS + 1 - moves) // 2
+
+        # Narrow [low, high] with null-window searches until it closes
+        low = -((CELLS - moves) // 2)
+        high = (CELLS + 1 - moves) // 2
+        while low < high:
+            # Probe closer to zero first, where most positions end up
+            middle = low + (high - low) // 2
+            if middle <= 0 and -(-low // 2) < middle:
+                middle = -(-low // 2)
+            elif middle >= 0 and high // 2 > middle:
+                middle = high // 2
+            score = self.negamax(current, mask, moves, middle, middle + 1)
+            if score <= middle:
+                high = score
+            else:
+                low = score
+        return low
+
+    def solve(self, position):
+        """
+        Solve a position.
+
+        Args:
+            position (Position): A position that is not already decided
+
+        Returns:
+            int: Exact score for the player to move
+        """
+        player = PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+        return self.solve_bitboards(position.bitboards[player], position.occupied(), position.move_count)
+
+    def analyze(self, position):
+        """
+        Solve every move of a position.
+
+        Args:
+            position (Position): A position that is not already decided
+
+        Returns:
+            list: Score for the player to move of playing each column, or
+                None for full columns
+        """
+        player = PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+        current = position.bitboards[player]
+        mask = position.occupied()
+        moves = position.move_count
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+
+        scores = []
+        for col in range(COLUMNS):
+            move = possible & COLUMN_MASKS[col]
+            if not move:
+                scores.append(None)
+            elif winning_cells(current, mask) & move:
+                scores.append((CELLS + 1 - moves) // 2)
+            elif moves + 1 == CELLS:
+                scores.append(0)
+            else:
+                opponent = current ^ mask
+                scores.append(-self.solve_bitboards(opponent, mask | move, moves + 1))
+        return scores
+
+
+def describe_score(score, move_count):
+    """
+    Describe a solver score in words.
+
+    Args:
+        score (int): Score for the player to move
+        move_count (int): Number of moves played in the scored position
+
+    Returns:
+        str: "win in N", "loss in N" or "draw", where N counts the moves of
+            the winning player from now on
+    """
+    if score is None:
+        return "full"
+    if score > 0:
+        return f"win in {CELLS // 2 + 1 - score - move_count // 2}"
+    if score < 0:
+        return f"loss in {CELLS // 2 + 1 + score - (move_count + 1) // 2}"
+    return "draw"
@@ -0,0 +1,82 @@
+from constants import TT_SIZE
+
+
+# Bound types stored with every entry
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table for the minimax search.
+    
+    Entries are kept in parallel preallocated lists so memory use is capped
+    by the table size. Every bucket has two slots: a depth-preferred slot that
+    is only overwritten by an equal or deeper search, and an always-replace
+    slot that takes everything else.
+    """
+    
+    def __init__(self, max_entries=TT_SIZE):
+        """
+        Initialize an empty table.
+        
+        Args:
+            max_entries (int): Maximum number of entries kept in the table
+        """
+        # An odd bucket count keeps the low bits of the bitboard key (which
+        # only describe the first columns) from deciding the bucket alone.
+        self.buckets = max(1, max_entries // 2) | 1
+        self.max_entries = 2 * self.buckets
+        self.keys = [-1] * self.max_entries
+        self.scores = [0] * self.max_entries
+        self.flags = [EXACT] * self.max_entries
+        self.depths = [-1] * self.max_entries
+        self.moves = [-1] * self.max_entries
+    
+    def probe(self, key):
+        """
+        Look up a position.
+        
+        Args:
+            key (int): The position key
+            
+        Returns:
+            int: Slot index of the entry, or -1 if the position is not stored
+        """
+        slot = (key % self.buckets) * 2
+        if self.keys[slot] == key:
+            return slot
+        if self.keys[slot + 1] == key:
+            return slot + 1
+        return -1
+    
+    def store(self, key, score, flag, depth, move):
+        """
+        Store a search result, replacing an older entry if needed.
+        
+        Args:
+            key (int): The position key
+            score (int): The score found by the search
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND
+            depth (int): Remaining search depth the score was computed with
+            move (int): Best column found, or -1 if none
+        """
+        slot = (key % self.buckets) * 2
+        if self.keys[slot] != key and depth < self.depths[slot]:
+            slot += 1  # Keep the deeper result, use the always-replace slot
+        self.keys[slot] = key
+        self.scores[slot] = score
+        self.flags[slot] = flag
+        self.depths[slot] = depth
+        self.moves[slot] = move
+    
+    def clear(self):
+        """Remove all entries from the table."""
+        for i in range(self.max_entries):
+            self.keys[i] = -1
+            self.depths[i] = -1
+    
+    def __len__(self):
+        """Count the stored entries."""
+        return self.max_entries - self.keys.count(-1)
@@ -0,0 +1,316 @@
+import queue
+import random
+import threading
+import time
+from google.api_core import exceptions as api_exceptions
+from constants import (TUTOR_DEADLINE_S, TUTOR_ATTEMPT_TIMEOUT_S, TUTOR_MAX_RETRIES, TUTOR_RETRY_BACKOFF_S,
+                       TUTOR_BREAKER_FAILURES, TUTOR_BREAKER_RESET_S)
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling the backend while the circuit breaker is open."""
+
+
+class AttemptTimeout(TimeoutError):
+    """Raised when the backend sends nothing within the timeout of an attempt."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an answer is not complete by the deadline of its request."""
+
+
+# Errors caused by an unavailable or overloaded service. They are retried
+# and count towards opening the circuit; any other error (e.g. an invalid
+# request) is raised at once.
+RETRYABLE_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.TooManyRequests,
+    api_exceptions.InternalServerError,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.GatewayTimeout,
+)
+
+
+class ModelBackend:
+    """
+    Backend streaming answers from a GenerativeModel-style model.
+
+    A backend has one method, stream(contents, timeout_s), a generator that
+    yields the text of the answer piece by piece and returns the usage
+    metadata of the response (or None). Any object with that method can be
+    given to TutorClient, e.g. to test against a stub.
+    """
+
+    def __init__(self, model):
+        """
+        Initialize the backend.
+
+        Args:
+            model: Object with GenerativeModel's generate_content(), e.g. a
+                genai.GenerativeModel or the FakeStreamingModel of the tests
+        """
+        self.model = model
+
+    def stream(self, contents, timeout_s):
+        """
+        Stream the answer to a conversation.
+
+        Args:
+            contents (list): Messages as {'role': ..., 'parts': [text]} dicts
+            timeout_s (float): Timeout passed on to the API call
+
+        Yields:
+            str: The next piece of the answer
+
+        Returns:
+            The usage metadata of the response, or None
+        """
+        response = self.model.generate_content(contents, stream=True, request_options={'timeout': timeout_s})
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue  # A chunk without text, e.g. only safety ratings
+            if text:
+                yield text
+        return getattr(response, 'usage_metadata', None)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service for a while.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests fail at once. After reset_timeout_s one trial request is let
+    through (half open): if it succeeds the circuit closes, otherwise it
+    opens again for another reset_timeout_s.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=TUTOR_BREAKER_FAILURES, reset_timeout_s=TUTOR_BREAKER_RESET_S):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout_s (float): Seconds the circuit stays open before a trial
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.times_opened = 0
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        """CLOSED, OPEN or HALF_OPEN."""
+        with self.lock:
+            if self.opened_at is None:
+                return self.CLOSED
+            if self.trial_running or time.monotonic() - self.opened_at >= self.reset_timeout_s:
+                return self.HALF_OPEN
+            return self.OPEN
+
+    def is_open(self):
+        """Check whether a request would fail at once, without starting a trial."""
+        with self.lock:
+            if self.opened_at is None:
+                return False
+            return self.trial_running or time.monotonic() - self.opened_at < self.reset_timeout_s
+
+    def allow(self):
+        """
+        Ask to send a request.
+
+        Returns:
+            bool: True if the request may go ahead (in the half-open state
+                it is the trial, and every other request is refused)
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running or time.monotonic() - self.opened_at < self.reset_timeout_s:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        """Close the circuit after a successful request."""
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit if there were too many."""
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self.trial_running:
+                    self.times_opened += 1
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+    def record_cancel(self):
+        """Forget a request that was cancelled before it succeeded or failed."""
+        with self.lock:
+            self.trial_running = False
+
+
+class AttemptStream:
+    """
+    One call to the backend, read on its own thread.
+
+    The caller waits for every piece with a timeout, so a stalled
+    connection cannot hold it longer than its deadline. An abandoned call
+    finishes in the background (the backend's own timeout ends it).
+    """
+
+    def __init__(self, backend, contents, timeout_s):
+        self.queue = queue.Queue()
+        self.abandoned = threading.Event()
+        self.thread = threading.Thread(target=self.run, args=(backend, contents, timeout_s),
+                                       name='tutor-request', daemon=True)
+        self.thread.start()
+
+    def run(self, backend, contents, timeout_s):
+        """Read the backend's stream into the queue (runs on the request thread)."""
+        try:
+            iterator = backend.stream(contents, timeout_s)
+            while not self.abandoned.is_set():
+                self.queue.put(('chunk', next(iterator)))
+        except StopIteration as stop:
+            self.queue.put(('done', stop.value))
+        except Exception as e:
+            self.queue.put(('error', e))
+
+    def next(self, timeout_s, timeout_error):
+        """
+        Wait for the next event of the call.
+
+        Args:
+            timeout_s (float): Longest time to wait
+            timeout_error: Exception class raised when nothing arrives in time
+
+        Returns:
+            tuple: ('chunk', text) or ('done', usage metadata)
+        """
+        try:
+            kind, value = self.queue.get(timeout=max(0.0, timeout_s))
+        except queue.Empty:
+            raise timeout_error(f"No response from the tutor backend within {timeout_s:.1f}s")
+        if kind == 'error':
+            raise value
+        return kind, value
+
+    def abandon(self):
+        """Stop reading the call."""
+        self.abandoned.set()
+
+
+class TutorClient:
+    """
+    Calls the tutor backend with a deadline, retries and a circuit breaker.
+
+    Every request must be complete within deadline_s. An attempt that sends
+    nothing within attempt_timeout_s, or fails with a retryable error
+    before its first piece of text, is retried up to max_retries times
+    after a random backoff (exponential with full jitter), as long as the
+    deadline allows. Once text has been streamed a failure is final, since
+    a retry would repeat it. Requests that fail for availability reasons
+    feed a circuit breaker, so a service that is down costs nothing until
+    it is tried again.
+    """
+
+    def __init__(self, backend, deadline_s=TUTOR_DEADLINE_S, attempt_timeout_s=TUTOR_ATTEMPT_TIMEOUT_S,
+                 max_retries=TUTOR_MAX_RETRIES, backoff_s=TUTOR_RETRY_BACKOFF_S, breaker=None):
+        """
+        Initialize the client.
+
+        Args:
+            backend: Backend with a stream(contents, timeout_s) generator,
+                e.g. a ModelBackend
+            deadline_s (float): Longest time a request may take in total
+            attempt_timeout_s (float): Longest wait for the first piece of
+                text before an attempt is retried
+            max_retries (int): Retries after the first attempt
+            backoff_s (float): Base of the exponential backoff between attempts
+            breaker (CircuitBreaker): Breaker to use, or None for a new one
+        """
+        self.backend = backend
+        self.deadline_s = deadline_s
+        self.attempt_timeout_s = attempt_timeout_s
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.breaker = breaker or CircuitBreaker()
+
+    def stream(self, contents, stats=None):
+        """
+        Stream the answer to a conversation.
+
+        Args:
+            contents (list): Messages as {'role': ..., 'parts': [text]} dicts
+            stats (TutorRequestStats): Statistics to record the attempts and
+                the reported prompt tokens in, or None
+
+        Yields:
+            str: The next piece of the answer
+
+        Raises:
+            CircuitOpen: If the breaker refuses the request
+            DeadlineExceeded: If the answer was not complete in time
+            Exception: The backend's error once retries are exhausted, or
+                at once if it is not retryable
+        """
+        if not self.breaker.allow():
+            raise CircuitOpen("The tutor backend is unavailable")
+        deadline = time.monotonic() + self.deadline_s
+        outcome_recorded = False
+        attempt = None
+        try:
+            attempts = 0
+            while True:
+                attempts += 1
+                if stats is not None:
+                    stats.attempts = attempts
+                remaining = deadline - time.monotonic()
+                attempt = AttemptStream(self.backend, contents, remaining)
+                try:
+                    event = attempt.next(min(self.attempt_timeout_s, remaining), AttemptTimeout)
+                    break
+                except RETRYABLE_ERRORS as e:
+                    attempt.abandon()
+                    backoff = random.uniform(0, self.backoff_s * 2 ** (attempts - 1))
+                    if attempts > self.max_retries or time.monotonic() + backoff >= deadline:
+                        self.breaker.record_failure()
+                        outcome_recorded = True
+                        raise
+                    print(f"Tutor request attempt {attempts} failed ({e}), retrying in {backoff:.2f}s")
+                    time.sleep(backoff)
+
+            while event[0] == 'chunk':
+                yield event[1]
+                event = attempt.next(deadline - time.monotonic(), DeadlineExceeded)
+            usage = event[1]
+            if stats is not None and getattr(usage, 'prompt_token_count', 0):
+                stats.prompt_tokens = usage.prompt_token_count
+                stats.tokens_reported = True
+            self.breaker.record_success()
+            outcome_recorded = True
+        except RETRYABLE_ERRORS:
+            if not outcome_recorded:
+                self.breaker.record_failure()
+                outcome_recorded = True
+            raise
+        finally:
+            if attempt is not None:
+                attempt.abandon()
+            if not outcome_recorded:
+                self.breaker.record_cancel()
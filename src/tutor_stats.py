@@ -0,0 +1,62 @@
+class TutorRequestStats:
+    """
+    Telemetry of one tutor request.
+
+    Token counts are estimates (about four characters per token) unless the
+    model reported the prompt size, so they can be compared across backends
+    and across a game.
+    """
+
+    __slots__ = ('source', 'prompt_tokens', 'response_tokens', 'history_turns', 'first_chunk_ms',
+                 'total_ms', 'tokens_reported', 'attempts')
+
+    def __init__(self, source, prompt_tokens=0, response_tokens=0, history_turns=0, first_chunk_ms=None,
+                 total_ms=0.0, tokens_reported=False, attempts=0):
+        """
+        Initialize the statistics.
+
+        Args:
+            source (str): Where the answer came from: "model", "cache",
+                "fallback" (no model configured), "offline" (circuit breaker
+                open) or "error"
+            prompt_tokens (int): Tokens sent, including the history and the system instruction
+            response_tokens (int): Estimated tokens of the answer
+            history_turns (int): Earlier turns sent with the question
+            first_chunk_ms (float): Time until the first piece of the answer,
+                or None if nothing arrived
+            total_ms (float): Time until the answer was complete
+            tokens_reported (bool): True if prompt_tokens was reported by the model
+            attempts (int): Calls made to the model, including retries
+        """
+        self.source = source
+        self.prompt_tokens = prompt_tokens
+        self.response_tokens = response_tokens
+        self.history_turns = history_turns
+        self.first_chunk_ms = first_chunk_ms
+        self.total_ms = total_ms
+        self.tokens_reported = tokens_reported
+        self.attempts = attempts
+
+    def to_dict(self):
+        """
+        Convert the statistics to plain values, e.g. for JSON.
+
+        Returns:
+            dict: Every field
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def summary(self):
+        """
+        Describe the request in one line for logging.
+
+        Returns:
+            str: e.g. "model: 512 prompt tokens (3 turns), 48 response tokens, first chunk 410 ms, total 900 ms",
+                followed by the number of attempts if the request was retried
+        """
+        estimate = '' if self.tokens_reported else '~'
+        first = f"{self.first_chunk_ms:.0f} ms" if self.first_chunk_ms is not None else "-"
+        retried = f", {self.attempts} attempts" if self.attempts > 1 else ""
+        return (f"{self.source}: {estimate}{self.prompt_tokens} prompt tokens ({self.history_turns} turns), "
+                f"~{self.response_tokens} response tokens, first chunk {first}, total {self.total_ms:.0f} ms"
+                f"{retried}")
@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TutorRequest:
+    """
+    One question being answered in the background.
+
+    The worker thread appends streamed text to parts; the game loop reads
+    text every frame. Once cancelled, the request stops streaming at the
+    next chunk and its text is never shown again.
+    """
+
+    def __init__(self, question):
+        """
+        Initialize the request.
+
+        Args:
+            question (str): The student's question
+        """
+        self.question = question
+        self.parts = []
+        self.done = False
+        self.cancelled = threading.Event()
+
+    @property
+    def text(self):
+        """The response text received so far."""
+        return ''.join(self.parts)
+
+    @property
+    def pending(self):
+        """True until the first piece of the response has arrived."""
+        return not self.parts and not self.done
+
+    def cancel(self):
+        """Stop streaming the response."""
+        self.cancelled.set()
+
+
+class TutorWorker:
+    """
+    Answers tutor questions on background threads so the game loop stays responsive.
+
+    Asking a new question cancels the previous one. Two threads are used so
+    a new question does not wait for a cancelled one to reach its next chunk.
+    """
+
+    def __init__(self, llm_tutor):
+        """
+        Initialize the worker.
+
+        Args:
+            llm_tutor (LLMTutor): The tutor to ask
+        """
+        self.llm_tutor = llm_tutor
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tutor')
+        self.request = None
+
+    def ask(self, board_state, user_query, knowledge_base):
+        """
+        Start answering a question, cancelling the previous one.
+
+        The relevant strategy is looked up on the worker thread too, since
+        the knowledge base may still be indexing its documents.
+
+        Args:
+            board_state: The current board, indexed as board[row][col]
+            user_query (str): The user's question
+            knowledge_base (Mapping): The knowledge base from LLMTutor.load_knowledge_base()
+
+        Returns:
+            TutorRequest: The request, filled in as the response streams in
+        """
+        self.cancel()
+        request = TutorRequest(user_query)
+        self.request = request
+        self.executor.submit(self.stream, request, board_state, user_query, knowledge_base)
+        return request
+
+    def stream(self, request, board_state, user_query, knowledge_base):
+        """Find the relevant strategy and stream a response into a request (runs on a worker thread)."""
+        chunks = None
+        try:
+            relevant_strategy = self.llm_tutor.find_relevant_strategy(user_query, knowledge_base)
+            if request.cancelled.is_set():
+                return
+            print(f"Relevant strategy: {relevant_strategy[:100]}...")
+            chunks = self.llm_tutor.stream_tutoring_response(board_state, relevant_strategy, user_query)
+            for chunk in chunks:
+                if request.cancelled.is_set():
+                    break
+                request.parts.append(chunk)
+        except Exception as e:
+            print(f"Error streaming tutor response: {e}")
+            request.parts.append("I'm having trouble processing your question right now. Please try again!")
+        finally:
+            if chunks is not None:
+                chunks.close()
+            request.done = True
+
+    def cancel(self):
+        """Cancel the current question, if any."""
+        if self.request is not None:
+            self.request.cancel()
+            self.request = None
+
+    def shutdown(self):
+        """Cancel the current question and stop the threads without waiting."""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,183 @@
+"""Offline test doubles of the Gemini model for the tests and benchmarks."""
+
+import random
+import time
+
+
+class FakeChunk:
+    """One streamed piece of a fake response."""
+
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeResponse:
+    """
+    Streamed response of FakeStreamingModel.
+
+    Iterating yields the chunks with the model's delays, like a streaming
+    Gemini response. The text attribute holds the whole reply.
+    """
+
+    def __init__(self, chunks, first_chunk_delay, chunk_delay):
+        self.chunks = chunks
+        self.first_chunk_delay = first_chunk_delay
+        self.chunk_delay = chunk_delay
+        self.text = ''.join(chunks)
+
+    def __iter__(self):
+        for index, chunk in enumerate(self.chunks):
+            time.sleep(self.first_chunk_delay if index == 0 else self.chunk_delay)
+            yield FakeChunk(chunk)
+
+
+class FakeStreamingModel:
+    """
+    Offline stand-in for genai.GenerativeModel.
+
+    Streams a canned Socratic reply word by word with configurable delays,
+    so the tutor UI and LLMTutor can be exercised without a network or an
+    API key, e.g. LLMTutor(model=FakeStreamingModel()).
+    """
+
+    def __init__(self, reply=None, first_chunk_delay=0.5, chunk_delay=0.05, system_instruction=None):
+        """
+        Initialize the fake model.
+
+        Args:
+            reply: Function from the question text to the reply text, or
+                None for a generic guiding question
+            first_chunk_delay (float): Seconds before the first chunk
+            chunk_delay (float): Seconds between later chunks
+            system_instruction (str): Accepted like GenerativeModel's, and kept
+        """
+        self.reply = reply or self.default_reply
+        self.first_chunk_delay = first_chunk_delay
+        self.chunk_delay = chunk_delay
+        self.system_instruction = system_instruction
+        self.requests = []
+
+    @staticmethod
+    def default_reply(question):
+        """Build a generic guiding question about the student's question."""
+        return (f"Good question! Before I answer \"{question.strip()}\", look at the board: "
+                "which columns would give you two ways to connect four at once, "
+                "and which of them could your opponent block with a single move?")
+
+    def generate_content(self, contents, stream=False, request_options=None):
+        """
+        Answer the last message of a conversation.
+
+        Args:
+            contents (list): Messages as {'role': ..., 'parts': [text]} dicts
+            stream (bool): Accepted for compatibility, the response always streams
+            request_options (dict): Accepted for compatibility and ignored
+
+        Returns:
+            FakeResponse: The reply
+        """
+        self.requests.append(contents)
+        prompt = contents[-1]['parts'][0]
+        question = prompt.rsplit("Student's question:", 1)[-1].split('\n', 1)[0]
+        words = self.reply(question).split(' ')
+        chunks = [word + ' ' for word in words[:-1]] + words[-1:]
+        return FakeResponse(chunks, self.first_chunk_delay, self.chunk_delay)
+
+
+class FaultyResponse:
+    """Streamed response of FaultInjectingModel: a FakeResponse that may stall or break off."""
+
+    def __init__(self, response, fault, stall_s, timeout_s):
+        self.response = response
+        self.fault = fault
+        self.stall_s = stall_s
+        self.timeout_s = timeout_s
+        self.text = response.text
+
+    def __iter__(self):
+        if self.fault == 'stall':
+            # A hung connection: nothing arrives until the request times out
+            if self.timeout_s is not None and self.timeout_s < self.stall_s:
+                time.sleep(max(0.0, self.timeout_s))
+                raise TimeoutError("Injected stall: request timed out")
+            time.sleep(self.stall_s)
+        for index, chunk in enumerate(self.response):
+            if self.fault == 'drop' and index == 1:
+                raise ConnectionError("Injected fault: connection dropped mid-stream")
+            yield chunk
+
+
+class FaultInjectingModel:
+    """
+    Stub backend that wraps a model and injects latency and errors.
+
+    Every call gets one outcome: "ok", "error" (the call fails at once with
+    a ConnectionError), "stall" (nothing arrives until the request's timeout,
+    or for stall_s) or "drop" (the connection breaks after the first chunk).
+    Outcomes are taken from schedule first, then drawn at random with the
+    given rates, so the tutor client can be tested both with exact scripts
+    and against a degraded service.
+    """
+
+    def __init__(self, model, error_rate=0.0, stall_rate=0.0, drop_rate=0.0, latency_s=0.0, stall_s=30.0,
+                 schedule=None, seed=None):
+        """
+        Initialize the stub.
+
+        Args:
+            model: Model whose answers are passed on, e.g. a FakeStreamingModel
+            error_rate (float): Share of calls that fail at once
+            stall_rate (float): Share of calls that hang
+            drop_rate (float): Share of calls that break off mid-stream
+            latency_s (float): Extra seconds before every call returns
+            stall_s (float): Seconds a hanging call lasts without a timeout
+            schedule (list): Outcomes of the first calls, e.g. ["error", "ok"]
+            seed (int): Seed of the random outcomes, or None
+        """
+        self.model = model
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.drop_rate = drop_rate
+        self.latency_s = latency_s
+        self.stall_s = stall_s
+        self.schedule = list(schedule or [])
+        self.random = random.Random(seed)
+        self.outcomes = []
+
+    def next_outcome(self):
+        """Pick the outcome of the next call."""
+        if self.schedule:
+            return self.schedule.pop(0)
+        roll = self.random.random()
+        for fault, rate in (('error', self.error_rate), ('stall', self.stall_rate), ('drop', self.drop_rate)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return 'ok'
+
+    def generate_content(self, contents, stream=False, request_options=None):
+        """
+        Answer like the wrapped model, with the next injected fault.
+
+        Args:
+            contents (list): Messages as {'role': ..., 'parts': [text]} dicts
+            stream (bool): Passed on to the wrapped model
+            request_options (dict): Options of the call; its 'timeout' ends stalls
+
+        Returns:
+            FaultyResponse: The reply
+
+        Raises:
+            ConnectionError: If the outcome of the call is "error"
+        """
+        fault = self.next_outcome()
+        self.outcomes.append(fault)
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        if fault == 'error':
+            raise ConnectionError("Injected fault: service unavailable")
+        timeout_s = (request_options or {}).get('timeout')
+        response = self.model.generate_content(contents, stream=stream)
+        return FaultyResponse(response, fault, self.stall_s, timeout_s)
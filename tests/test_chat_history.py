@@ -0,0 +1,83 @@
+"""Tests of the token budget of the tutor's conversation history."""
+
+import pytest
+
+from chat_history import ChatHistory, count_tokens, estimate_tokens
+
+SYSTEM_INSTRUCTION = "You are a patient Connect 4 tutor. " * 10
+
+
+def questions(contents):
+    """List the earlier questions sent in a request, oldest first."""
+    return [part.split("Student's question: ")[-1]
+            for message in contents[:-1] if message['role'] == 'user' for part in message['parts']]
+
+
+def test_recent_turns_are_sent_word_for_word():
+    history = ChatHistory(max_turns=3, token_budget=10000)
+    for turn in range(2):
+        history.add_turn(f"Question {turn}?", f"Answer {turn}.")
+    contents, turns = history.build_contents("New prompt")
+    assert turns == 2
+    assert questions(contents) == ["Question 0?", "Question 1?"]
+    assert contents[-1] == {'role': 'user', 'parts': ["New prompt"]}
+
+
+@pytest.mark.parametrize('budget', [150, 250, 400, 600])
+def test_request_stays_within_the_budget(budget):
+    history = ChatHistory(max_turns=6, token_budget=budget, system_instruction=SYSTEM_INSTRUCTION)
+    for turn in range(10):
+        history.add_turn(f"Question {turn}: what should I do about this threat?", "Block it now. " * 20)
+    contents, turns = history.build_contents("Board and strategy. " * 10)
+    assert count_tokens(contents, SYSTEM_INSTRUCTION) <= budget
+    assert turns < 6
+
+
+def test_oldest_turns_are_dropped_first():
+    history = ChatHistory(max_turns=4, token_budget=10000, summary_tokens=0)
+    for turn in range(4):
+        history.add_turn(f"Question {turn}?", "Answer. " * 25)
+    full, _ = history.build_contents("Prompt")
+
+    history.token_budget = count_tokens(full) - 1
+    contents, turns = history.build_contents("Prompt")
+    assert turns == 3
+    assert questions(contents) == ["Question 1?", "Question 2?", "Question 3?"]
+
+
+def test_system_instruction_counts_towards_the_budget():
+    history = ChatHistory(max_turns=4, token_budget=10000)
+    for turn in range(4):
+        history.add_turn(f"Question {turn}?", "Answer. " * 25)
+    full, _ = history.build_contents("Prompt")
+
+    history.token_budget = count_tokens(full)
+    assert history.build_contents("Prompt")[1] == 4
+    history.system_instruction = SYSTEM_INSTRUCTION
+    assert history.build_contents("Prompt")[1] < 4
+
+
+def test_summary_is_dropped_after_the_turns():
+    history = ChatHistory(max_turns=1, token_budget=10000)
+    history.add_turn("What about the center?", "The center column joins the most lines. It matters.")
+    history.add_turn("Should I block?", "Yes. " * 40)
+    contents, turns = history.build_contents("Prompt")
+    assert turns == 1
+    assert "Earlier in this session" in contents[0]['parts'][0]
+
+    history.token_budget = count_tokens(contents) - 1
+    contents, turns = history.build_contents("Prompt")
+    assert turns == 0
+    assert "Earlier in this session" in contents[0]['parts'][0]
+
+    history.token_budget = estimate_tokens("Prompt")
+    contents, turns = history.build_contents("Prompt")
+    assert contents == [{'role': 'user', 'parts': ["Prompt"]}]
+
+
+def test_prompt_over_the_budget_is_sent_alone():
+    history = ChatHistory(token_budget=10)
+    history.add_turn("Question?", "Answer.")
+    contents, turns = history.build_contents("A long prompt. " * 20)
+    assert turns == 0
+    assert len(contents) == 1
@@ -0,0 +1,89 @@
+"""Tests of GameModel's move strings, undo and redo."""
+
+import random
+
+import pytest
+
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2
+from game_model import GameModel
+
+
+def random_move_strings(seed, games=500):
+    """
+    Play random games to the end.
+
+    Yields:
+        str: The moves of a finished game (won or drawn)
+    """
+    rng = random.Random(seed)
+    for _ in range(games):
+        game = GameModel()
+        while not game.game_over:
+            column = rng.choice([col for col in range(COLUMNS) if game.is_valid_location(col)])
+            game.make_move(column, game.current_player)
+            game.update_status(game.current_player)
+        yield game.to_moves()
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_move_strings_round_trip(seed):
+    for moves in random_move_strings(seed):
+        game = GameModel.from_moves(moves)
+        assert game.to_moves() == moves
+        assert game.board.to_moves() == moves
+        assert game.game_over
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_undo_and_redo_return_to_the_same_game(seed):
+    for moves in random_move_strings(seed):
+        game = GameModel.from_moves(moves)
+        end = (game.to_moves(), game.winner, game.game_over, [tuple(row) for row in game.get_board_state()])
+
+        for index in range(len(moves), 0, -1):
+            assert game.undo() == int(moves[index - 1]) - 1
+            assert game.to_moves() == moves[:index - 1]
+            assert not game.game_over
+            assert game.winner is None
+        assert game.undo() is None
+        assert game.current_player == PLAYER_1
+
+        for index in range(len(moves)):
+            assert game.redo() == int(moves[index]) - 1
+        assert game.redo() is None
+        assert (game.to_moves(), game.winner, game.game_over, [tuple(row) for row in game.get_board_state()]) == end
+
+
+def test_undo_gives_the_turn_back():
+    game = GameModel.from_moves("44")
+    assert game.current_player == PLAYER_1
+    game.undo()
+    assert game.current_player == PLAYER_2
+    game.redo()
+    assert game.current_player == PLAYER_1
+
+
+def test_new_move_clears_redo():
+    game = GameModel.from_moves("445")
+    game.undo()
+    assert game.make_move(0, game.current_player)
+    assert game.redo() is None
+    assert game.to_moves() == "441"
+
+
+def test_winner_of_a_move_string():
+    game = GameModel.from_moves("4455667")
+    assert game.game_over
+    assert game.winner == PLAYER_1
+
+
+@pytest.mark.parametrize('moves', [
+    "1" * (ROWS + 1),   # The column is full
+    "44556677",         # Played after the game is over
+    "48",               # Not a column
+    "40",
+    "4a",
+])
+def test_unplayable_move_string_raises(moves):
+    with pytest.raises(ValueError):
+        GameModel.from_moves(moves)
@@ -0,0 +1,93 @@
+"""Tests of reloading the knowledge base and refreshing its index when documents change."""
+
+import os
+import time
+
+import pytest
+
+from knowledge_index import KnowledgeIndex
+from knowledge_loader import KnowledgeBase
+
+DOCUMENTS = {
+    'center_control.md': "# Center Control\n\nPlaying in the center column keeps the most lines open.\n",
+    'threats/odd_even.md': "# Odd and Even Threats\n\nThe first player wants threats on odd rows.\n",
+}
+
+
+def write(directory, name, text):
+    """Write a document, creating its subdirectory if needed."""
+    path = os.path.join(directory, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def sources(index, query):
+    """List the documents of the chunks a query finds."""
+    return [source for _, source, _, _ in index.search(query, k=10)]
+
+
+def wait_for(condition, timeout=5.0):
+    """Wait until a condition holds, failing the test after the timeout."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "the knowledge base was not reloaded in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def knowledge(tmp_path):
+    directory = str(tmp_path / 'knowledge_base')
+    for name, text in DOCUMENTS.items():
+        write(directory, name, text)
+    knowledge_base = KnowledgeBase(directory, reload_interval=0.05)
+    index = KnowledgeIndex(index_path=str(tmp_path / 'kb_index.npz'))
+    knowledge_base.add_listener(index.refresh)
+    knowledge_base.refresh()
+    yield directory, knowledge_base, index
+    knowledge_base.stop()
+
+
+def test_index_is_built_from_the_documents(knowledge):
+    _, knowledge_base, index = knowledge
+    assert sorted(knowledge_base) == ['center_control', 'threats/odd_even']
+    assert sources(index, "Why play the center?") == ['center_control.md']
+    assert sources(index, "odd threats") == ['threats/odd_even.md']
+
+
+def test_refresh_picks_up_edited_added_and_removed_documents(knowledge):
+    directory, knowledge_base, index = knowledge
+    write(directory, 'center_control.md', "# Center Control\n\nA piece in the middle joins many diagonals.\n")
+    write(directory, 'zugzwang.md', "# Zugzwang\n\nForce your opponent to fill the square below your threat.\n")
+    os.remove(os.path.join(directory, 'threats', 'odd_even.md'))
+    assert knowledge_base.refresh()
+
+    assert sorted(knowledge_base) == ['center_control', 'zugzwang']
+    assert "diagonals" in knowledge_base['center_control']
+    assert sources(index, "diagonals") == ['center_control.md']
+    assert sources(index, "column keeps lines open") == []
+    assert sources(index, "zugzwang") == ['zugzwang.md']
+    assert sources(index, "odd rows") == []
+    assert not knowledge_base.refresh()
+
+
+def test_watcher_refreshes_the_index_in_the_background(knowledge):
+    directory, knowledge_base, index = knowledge
+    knowledge_base.start()
+    write(directory, 'zugzwang.md', "# Zugzwang\n\nForce your opponent to fill the square below your threat.\n")
+    wait_for(lambda: sources(index, "zugzwang") == ['zugzwang.md'])
+    os.remove(os.path.join(directory, 'zugzwang.md'))
+    wait_for(lambda: sources(index, "zugzwang") == [])
+
+
+def test_saved_index_is_loaded_until_a_document_changes(knowledge, tmp_path):
+    directory, knowledge_base, index = knowledge
+    assert os.path.exists(tmp_path / 'kb_index.npz')
+    loaded = KnowledgeIndex(index_path=str(tmp_path / 'kb_index.npz'))
+    assert not loaded.refresh(knowledge_base)  # Loaded, not rebuilt
+    assert sources(loaded, "odd threats") == ['threats/odd_even.md']
+
+    write(directory, 'threats/odd_even.md', "# Odd and Even Threats\n\nThe second player wants even rows.\n")
+    knowledge_base.refresh()
+    assert not loaded.refresh(knowledge_base)  # Loads the index the listener saved
+    assert sources(loaded, "second player") == ['threats/odd_even.md']
@@ -0,0 +1,78 @@
+"""Tests of building and reading the opening book."""
+
+import pytest
+
+from ai_engine import AIEngine
+from bitboard import Position
+from constants import COLUMNS, PLAYER_1, PLAYER_2
+from opening_book import OpeningBook, build_opening_book
+
+BOOK_PLY = 3
+BOOK_DEPTH = 2
+
+
+@pytest.fixture(scope='module')
+def book_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('book') / 'book.bin')
+    build_opening_book(path, max_ply=BOOK_PLY, depth=BOOK_DEPTH, progress=False)
+    return path
+
+
+@pytest.fixture
+def book(book_path):
+    book = OpeningBook(book_path)
+    yield book
+    book.close()
+
+
+def search(moves):
+    """Search a position to the book depth, as the book builder does."""
+    position = Position.from_moves(moves)
+    player = PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+    score, column = AIEngine(book_path=None, ai_player=player, workers=1).search(position, max_depth=BOOK_DEPTH)
+    return column, score
+
+
+def test_book_stores_one_position_per_mirror_pair(book):
+    # The empty board, 4 of the 7 first moves and 25 of the 49 two-move
+    # openings ("44" is its own mirror image)
+    assert len(book) == 1 + 4 + 25
+    assert book.max_ply == BOOK_PLY
+
+
+@pytest.mark.parametrize('moves', ["", "4", "1", "12", "35"])
+def test_lookup_matches_a_search(book, moves):
+    position = Position.from_moves(moves)
+    player = PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+    column, score = book.lookup(position, player)
+    assert (column, score) == search(moves)
+
+
+@pytest.mark.parametrize('moves, mirror', [("1", "7"), ("12", "76"), ("35", "53")])
+def test_lookup_of_the_mirror_image(book, moves, mirror):
+    column, score = book.lookup(Position.from_moves(moves), PLAYER_1 if len(moves) % 2 == 0 else PLAYER_2)
+    mirror_column, mirror_score = book.lookup(Position.from_moves(mirror),
+                                              PLAYER_1 if len(mirror) % 2 == 0 else PLAYER_2)
+    assert mirror_score == score
+    assert mirror_column == COLUMNS - 1 - column
+
+
+def test_lookup_outside_the_book(book):
+    assert book.lookup(Position.from_moves("444"), PLAYER_2) is None  # Beyond the book's ply
+    assert book.lookup(Position.from_moves("4"), PLAYER_1) is None  # Not this player's turn
+
+
+def test_engine_plays_from_the_book(book_path, book):
+    position = Position.from_moves("12")
+    engine = AIEngine(book_path=book_path, ai_player=PLAYER_1, workers=1)
+    assert engine.get_best_move(position.to_board()) == book.lookup(position, PLAYER_1)[0]
+    engine.close()
+
+
+def test_invalid_book_files(tmp_path):
+    path = tmp_path / 'not_a_book.bin'
+    path.write_bytes(b'C4BOOK01')
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+    assert OpeningBook.load(str(path)) is None
+    assert OpeningBook.load(str(tmp_path / 'missing.bin')) is None
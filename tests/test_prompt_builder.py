@@ -0,0 +1,64 @@
+"""Tests of the compact board encoding and the engine facts of the tutor prompt."""
+
+import pytest
+
+from constants import PLAYER_1, PLAYER_2
+from evaluation import WIN_SCORE
+from game_model import GameModel
+from prompt_builder import PromptBuilder, encode_board
+
+
+def board(moves):
+    """Get the board after a move string (columns numbered from 1)."""
+    return GameModel.from_moves(moves).get_board_state()
+
+
+@pytest.fixture(scope='module')
+def builder():
+    return PromptBuilder(analysis_depth=2)
+
+
+@pytest.mark.parametrize('moves, encoding', [
+    ("", "7/7/7/7/7/7"),
+    ("4455", "7/7/7/7/3OO2/3XX2"),
+    ("121212", "7/7/7/XO5/XO5/XO5"),
+    ("17", "7/7/7/7/7/X5O"),
+])
+def test_encode_board(moves, encoding):
+    assert encode_board(board(moves)) == encoding
+
+
+def test_facts_of_a_win_and_a_block(builder):
+    # X has three in column 1 and O three in column 2 (columns 0 and 1 of the prompt)
+    facts = builder.analyze(board("121212"))
+    assert facts['to_move'] == PLAYER_1
+    assert facts['wins'] == [0]
+    assert facts['blocks'] == [1]
+    assert facts['scores'][0] >= WIN_SCORE
+
+    prompt = builder.build(board("121212"), "Block open threes.", "What now?")
+    assert prompt.startswith("Position: 7/7/7/XO5/XO5/XO5\nTo move: X\n")
+    assert "X wins at once in column 0." in prompt
+    assert "O threatens to win in column 1; X must block." in prompt
+    assert "Engine scores for X by column (depth 2, higher is better): 0:win " in prompt
+    assert prompt.endswith("Strategy notes:\nBlock open threes.\n\nStudent's question: What now?")
+
+
+def test_facts_of_a_double_threat(builder):
+    facts = builder.analyze(board("44556"))
+    assert facts['to_move'] == PLAYER_2
+    assert facts['wins'] == []
+    assert facts['blocks'] == [2, 6]
+    assert "X threatens to win in column 2 or 6; O must block." in builder.build(board("44556"), "", "")
+
+
+def test_facts_of_a_finished_game(builder):
+    facts = builder.analyze(board("4455667"))
+    assert facts == {'to_move': None, 'wins': [], 'blocks': [], 'scores': None}
+    assert "The game is over." in builder.build(board("4455667"), "", "")
+
+
+def test_scores_can_be_left_out():
+    prompt = PromptBuilder(analysis_depth=0).build(board("4455"), "", "")
+    assert "To move: X" in prompt
+    assert "Engine scores" not in prompt
@@ -0,0 +1,64 @@
+"""Tests of the mirror normalization of the tutor response cache."""
+
+import pytest
+
+from game_model import GameModel
+from response_cache import ResponseCache, mirror_columns, can_mirror
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("Why not column 1?", "Why not column 5?"),
+    ("Column 3 is the center.", "Column 3 is the center."),
+    ("Compare columns 2 and 3.", "Compare columns 4 and 3."),
+    ("Play in columns 0, 1 or 6", "Play in columns 6, 5 or 0"),
+    ("columns 1, 2, and 5 are open", "columns 5, 4, and 1 are open"),
+    ("Column 2 and then column 4", "Column 4 and then column 2"),
+    ("There are 7 columns 1 by 1", "There are 7 columns 5 by 1"),
+    ("Column 9 does not exist", "Column 9 does not exist"),
+])
+def test_mirror_columns(text, expected):
+    assert mirror_columns(text) == expected
+    assert mirror_columns(mirror_columns(text)) == text
+
+
+def test_mirrored_board_gets_mirrored_answer():
+    cache = ResponseCache(path=None)
+    board = GameModel.from_moves("4453").get_board_state()
+    mirror = GameModel.from_moves("4435").get_board_state()
+    cache.put(board, "notes", "Should I play columns 2 or 3?", "Columns 2 and 3 both block column 1.")
+    assert cache.get(mirror, "notes", "Should I play columns 4 or 3?") == "Columns 4 and 3 both block column 5."
+    cache.close()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("Should I play columns 2 or 3?", True),
+    ("Why is the center column strong?", True),
+    ("Should I play 2?", False),
+    ("What about col 1?", False),
+    ("Is the left side weak?", False),
+    ("Block on the right.", False),
+    ("Why not the first column?", False),
+    ("There are 7 columns 1 by 1", False),
+])
+def test_can_mirror(text, expected):
+    assert can_mirror(text) == expected
+
+
+def test_bare_number_question_is_not_shared_with_the_mirror():
+    cache = ResponseCache(path=None)
+    board = GameModel.from_moves("4435").get_board_state()
+    mirror = GameModel.from_moves("4453").get_board_state()
+    cache.put(board, "notes", "Should I play 2?", "Yes, 2 blocks the threat.")
+    assert cache.get(mirror, "notes", "Should I play 2?") is None
+    assert cache.get(board, "notes", "Should I play 2?") == "Yes, 2 blocks the threat."
+    cache.close()
+
+
+def test_answer_that_cannot_be_mirrored_is_kept_for_its_own_board():
+    cache = ResponseCache(path=None)
+    board = GameModel.from_moves("4435").get_board_state()
+    mirror = GameModel.from_moves("4453").get_board_state()
+    cache.put(board, "notes", "Where should I block?", "Block on the left side.")
+    assert cache.get(mirror, "notes", "Where should I block?") is None
+    assert cache.get(board, "notes", "Where should I block?") == "Block on the left side."
+    cache.close()
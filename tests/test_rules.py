@@ -0,0 +1,154 @@
+"""
+Cross-checks of the bitboard rules against the former 2D-board implementation.
+
+The reference functions below are the nested-loop scans GameModel and
+AIEngine used before the rules module, run on a NumPy board. Random games,
+with invalid columns, full columns, undo and redo mixed in, must give the
+same results from rules, GameModel and AIEngine.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+import rules
+from ai_engine import AIEngine
+from constants import ROWS, COLUMNS, PLAYER_1, PLAYER_2, EMPTY
+from game_model import GameModel
+
+
+def reference_check_win(board, player):
+    """Scan every horizontal, vertical and diagonal line of four."""
+    for row in range(ROWS):
+        for col in range(COLUMNS - 3):
+            if all(board[row][col + i] == player for i in range(4)):
+                return True
+    for row in range(ROWS - 3):
+        for col in range(COLUMNS):
+            if all(board[row + i][col] == player for i in range(4)):
+                return True
+    for row in range(ROWS - 3):
+        for col in range(COLUMNS - 3):
+            if all(board[row + i][col + i] == player for i in range(4)):
+                return True
+    for row in range(3, ROWS):
+        for col in range(COLUMNS - 3):
+            if all(board[row - i][col + i] == player for i in range(4)):
+                return True
+    return False
+
+
+def reference_valid_locations(board):
+    """List the columns whose top cell is empty."""
+    return [col for col in range(COLUMNS) if board[0][col] == EMPTY]
+
+
+def reference_drop_piece(board, column, player):
+    """Drop a piece in the lowest empty row of a column, returning the row or None."""
+    for row in range(ROWS - 1, -1, -1):
+        if board[row][column] == EMPTY:
+            board[row][column] = player
+            return row
+    return None
+
+
+def random_boards(seed, games=200):
+    """
+    Play random games on a reference board.
+
+    Yields:
+        tuple: (board, player, column) before every attempted move, where
+            column may be full or out of range
+    """
+    rng = random.Random(seed)
+    for _ in range(games):
+        board = np.zeros((ROWS, COLUMNS), dtype=int)
+        player = PLAYER_1
+        for _ in range(ROWS * COLUMNS + 10):
+            column = rng.randrange(-1, COLUMNS + 1)
+            yield board, player, column
+            if not 0 <= column < COLUMNS or board[0][column] != EMPTY:
+                continue
+            reference_drop_piece(board, column, player)
+            if reference_check_win(board, player):
+                break
+            player = 3 - player
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_rules_match_reference(seed):
+    for board, player, column in random_boards(seed):
+        assert rules.valid_locations(board) == reference_valid_locations(board)
+        for check in (PLAYER_1, PLAYER_2):
+            assert rules.check_win(board, check) == reference_check_win(board, check)
+        if 0 <= column < COLUMNS:
+            expected = board.copy()
+            actual = board.copy()
+            assert rules.drop_piece(actual, column, player) == reference_drop_piece(expected, column, player)
+            assert np.array_equal(actual, expected)
+
+
+def test_ai_engine_rules_match_reference():
+    engine = AIEngine(tt_size=1 << 10, book_path=None, workers=1, collect_stats=False)
+    for board, player, column in random_boards(3, games=100):
+        assert engine.get_valid_locations(board) == reference_valid_locations(board)
+        for check in (PLAYER_1, PLAYER_2):
+            assert engine.check_win(board, check) == reference_check_win(board, check)
+        if 0 <= column < COLUMNS:
+            expected = board.copy()
+            actual = board.copy()
+            engine.drop_piece(actual, column, player)
+            reference_drop_piece(expected, column, player)
+            assert np.array_equal(actual, expected)
+
+
+def assert_same_board(game, board):
+    """Check a GameModel against a reference board cell by cell."""
+    snapshot = game.get_board_state()
+    assert [list(row) for row in snapshot] == board.tolist()
+    for col in range(-1, COLUMNS + 1):
+        assert game.is_valid_location(col) == (0 <= col < COLUMNS and board[0][col] == EMPTY)
+    assert game.is_draw() == all(board[0][col] != EMPTY for col in range(COLUMNS))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_game_model_matches_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        game = GameModel()
+        board = np.zeros((ROWS, COLUMNS), dtype=int)
+        history = []  # (column, row, player) of the moves on the board
+        undone = []
+        while not game.game_over:
+            action = rng.random()
+            if action < 0.1 and history:
+                column, row, player = history.pop()
+                board[row][column] = EMPTY
+                undone.append((column, row, player))
+                assert game.undo() == column
+                assert game.current_player == player
+            elif action < 0.15 and undone:
+                column, row, player = undone.pop()
+                board[row][column] = player
+                history.append((column, row, player))
+                assert game.redo() == column
+            else:
+                column = rng.randrange(-1, COLUMNS + 1)
+                player = game.current_player
+                expected = 0 <= column < COLUMNS and board[0][column] == EMPTY
+                assert game.make_move(column, player) == expected
+                if not expected:
+                    continue
+                row = reference_drop_piece(board, column, player)
+                history.append((column, row, player))
+                undone.clear()
+                game.update_status(player)
+
+            assert_same_board(game, board)
+            for check in (PLAYER_1, PLAYER_2):
+                assert game.check_win(check) == reference_check_win(board, check)
+            assert game.to_moves() == ''.join(str(column + 1) for column, _, _ in history)
+
+        winner = next((p for p in (PLAYER_1, PLAYER_2) if reference_check_win(board, p)), None)
+        assert game.winner == winner
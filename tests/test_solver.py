@@ -0,0 +1,96 @@
+"""Tests of the exact solver on positions with known scores."""
+
+import pytest
+
+from ai_engine import AIEngine
+from bitboard import Position
+from constants import COLUMNS, PLAYER_1, PLAYER_2
+from solver import Solver, CELLS
+
+
+# Move string (columns 1-7, player 1 first) and exact score for the player
+# to move: won, lost and drawn positions. The 28-ply ones are from
+# benchmarks/solver_positions.txt, the others are also checked by brute force.
+KNOWN_POSITIONS = [
+    ("445566", 18),
+    ("44252144442222555656766566111771", 4),
+    ("52644444413333623616366111771777", 4),
+    ("16112225237356733331426752151747", -3),
+    ("5146247162546242276315571241473556", -4),
+    ("14262267144673536431273211736637", 0),
+    ("3443647157121545737264345557372112", 0),
+    ("5263241335455533365667166122", -5),
+    ("6765554441444157221512225126", -3),
+]
+
+
+def brute_force(position, player):
+    """Score a position by searching every game to the end, without pruning."""
+    moves = position.move_count
+    best = None
+    for col in range(COLUMNS):
+        if not position.can_play(col):
+            continue
+        position.play(col, player)
+        if position.has_won(player):
+            score = (CELLS + 1 - moves) // 2
+        elif position.is_full():
+            score = 0
+        else:
+            score = -brute_force(position, 3 - player)
+        position.undo()
+        if best is None or score > best:
+            best = score
+    return best
+
+
+def player_to_move(position):
+    """Get the player to move from the number of pieces (player 1 moves first)."""
+    return PLAYER_1 if position.move_count % 2 == 0 else PLAYER_2
+
+
+@pytest.fixture(scope='module')
+def solver():
+    return Solver()
+
+
+@pytest.mark.parametrize('moves, score', KNOWN_POSITIONS)
+def test_solver_finds_the_exact_score(solver, moves, score):
+    assert solver.solve(Position.from_moves(moves)) == score
+
+
+@pytest.mark.parametrize('moves, score', [(moves, score) for moves, score in KNOWN_POSITIONS if len(moves) >= 32])
+def test_known_scores_match_brute_force(moves, score):
+    position = Position.from_moves(moves)
+    assert brute_force(position, player_to_move(position)) == score
+
+
+@pytest.mark.parametrize('moves, score', KNOWN_POSITIONS)
+def test_solve_columns_agrees_with_the_solver(solver, moves, score):
+    engine = AIEngine(book_path=None, workers=1)
+    position = Position.from_moves(moves)
+    results = engine.solve_columns(position.to_board())
+    assert max(result[0] for result in results if result is not None) == score
+
+    for col, result in enumerate(results):
+        if not position.can_play(col):
+            assert result is None
+            continue
+        player = player_to_move(position)
+        position.play(col, player)
+        if position.has_won(player):
+            expected = (CELLS + 1 - len(moves)) // 2
+        elif position.is_full():
+            expected = 0
+        else:
+            expected = -solver.solve(position)
+        position.undo()
+        assert result[0] == expected
+
+
+def test_solve_columns_describes_the_result():
+    engine = AIEngine(book_path=None, workers=1)
+    results = engine.solve_columns(Position.from_moves("445566").to_board())
+    assert results[2] == (18, "win in 1")
+    assert results[6] == (18, "win in 1")
+    assert results[0] == (17, "win in 2")  # The open three cannot be blocked on both sides
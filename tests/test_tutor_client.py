@@ -0,0 +1,102 @@
+"""Tests of the tutor client's deadlines, retries and circuit breaker against the fault-injecting stub."""
+
+import time
+
+import pytest
+
+from fake_tutor_model import FakeStreamingModel, FaultInjectingModel
+from knowledge_index import KnowledgeIndex
+from llm_tutor import LLMTutor, ERROR_RESPONSE
+from tutor_client import TutorClient, ModelBackend, CircuitBreaker, CircuitOpen, DeadlineExceeded
+from tutor_stats import TutorRequestStats
+
+BOARD = [[0] * 7 for _ in range(6)]
+CONTENTS = [{'role': 'user', 'parts': ["Student's question: Why?"]}]
+
+
+def make_client(schedule, deadline_s=1.5, attempt_timeout_s=0.3, failures=3, reset_s=0.3, chunk_delay=0.005):
+    """Create a stub with scripted outcomes and a client with short timeouts."""
+    model = FaultInjectingModel(FakeStreamingModel(first_chunk_delay=0.02, chunk_delay=chunk_delay),
+                                schedule=schedule, stall_s=5.0)
+    client = TutorClient(ModelBackend(model), deadline_s=deadline_s, attempt_timeout_s=attempt_timeout_s,
+                         backoff_s=0.02, breaker=CircuitBreaker(failures, reset_s))
+    return model, client
+
+
+def test_errors_and_stalls_before_the_first_chunk_are_retried():
+    model, client = make_client(['error', 'stall', 'ok'])
+    stats = TutorRequestStats('model')
+    text = ''.join(client.stream(CONTENTS, stats))
+    assert text.startswith("Good question!")
+    assert stats.attempts == 3
+    assert model.outcomes == ['error', 'stall', 'ok']
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_a_dropped_stream_is_not_retried():
+    model, client = make_client(['drop', 'ok'])
+    with pytest.raises(ConnectionError):
+        list(client.stream(CONTENTS))
+    assert model.outcomes == ['drop']
+
+
+def test_errors_that_are_not_retryable_are_raised_at_once():
+    class InvalidRequestModel:
+        def generate_content(self, contents, stream=False, request_options=None):
+            raise ValueError("Invalid request")
+
+    client = TutorClient(ModelBackend(InvalidRequestModel()), breaker=CircuitBreaker(1, 30.0))
+    with pytest.raises(ValueError):
+        list(client.stream(CONTENTS))
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_stalls_are_bounded_by_the_deadline():
+    _, client = make_client(['stall'] * 10, deadline_s=0.8, attempt_timeout_s=0.5)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        list(client.stream(CONTENTS))
+    assert time.monotonic() - start < 1.0
+
+
+def test_a_slow_stream_ends_at_the_deadline():
+    _, client = make_client([], deadline_s=0.3, chunk_delay=0.1)
+    with pytest.raises(DeadlineExceeded):
+        list(client.stream(CONTENTS))
+
+
+def test_breaker_opens_after_repeated_failures_and_closes_after_a_trial():
+    model, client = make_client(['error'] * 9, failures=3)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            list(client.stream(CONTENTS))
+    assert client.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpen):
+        list(client.stream(CONTENTS))
+
+    time.sleep(0.35)
+    model.schedule = ['ok']
+    assert ''.join(client.stream(CONTENTS))
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_a_cancelled_trial_lets_the_next_request_try():
+    _, client = make_client([], failures=1, reset_s=0.05)
+    client.breaker.record_failure()
+    time.sleep(0.06)
+    chunks = client.stream(CONTENTS)
+    next(chunks)
+    chunks.close()
+    assert client.breaker.allow()
+
+
+def test_tutor_answers_offline_while_the_breaker_is_open():
+    model, client = make_client(['error'] * 9, failures=1)
+    tutor = LLMTutor(model=model, client=client, knowledge_index=KnowledgeIndex(index_path=None))
+    assert tutor.get_tutoring_response(BOARD, "notes", "How do I block a threat?") == ERROR_RESPONSE
+    assert tutor.last_request.source == 'error'
+    answer = tutor.get_tutoring_response(BOARD, "notes", "How do I block a threat?")
+    assert tutor.last_request.source == 'offline'
+    assert "three-in-a-row" in answer
+    assert len(model.outcomes) == 3  # One request and its two retries
+    tutor.close()
@@ -0,0 +1,54 @@
+"""Tests of background tutor answers against the offline fake model."""
+
+import time
+
+import pytest
+
+from fake_tutor_model import FakeStreamingModel
+from game_model import GameModel
+from knowledge_index import KnowledgeIndex
+from llm_tutor import LLMTutor
+from tutor_worker import TutorWorker
+
+
+def wait_until_done(request, timeout=10.0):
+    """Wait for a request to finish, failing the test after the timeout."""
+    deadline = time.monotonic() + timeout
+    while not request.done:
+        assert time.monotonic() < deadline, "the tutor did not answer in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def tutor():
+    model = FakeStreamingModel(reply=lambda question: f"What do you see in{question}?",
+                               first_chunk_delay=0.05, chunk_delay=0.01)
+    tutor = LLMTutor(model=model, knowledge_index=KnowledgeIndex(index_path=None))
+    worker = TutorWorker(tutor)
+    yield tutor, worker
+    worker.shutdown()
+    tutor.close()
+
+
+def test_answer_streams_in_pieces(tutor):
+    tutor, worker = tutor
+    knowledge_base = tutor.load_knowledge_base()
+    request = worker.ask(GameModel.from_moves("44").get_board_state(), "How do I block a threat?", knowledge_base)
+    wait_until_done(request)
+    assert request.text == "What do you see in How do I block a threat??"
+    assert len(request.parts) > 1
+    assert tutor.last_request.source == 'model'
+    assert len(tutor.history) == 1
+
+
+def test_new_question_cancels_the_previous_one(tutor):
+    tutor, worker = tutor
+    knowledge_base = tutor.load_knowledge_base()
+    board = GameModel().get_board_state()
+    first = worker.ask(board, "What about the center column?", knowledge_base)
+    second = worker.ask(board, "Should I block?", knowledge_base)
+    assert first.cancelled.is_set()
+    wait_until_done(second)
+    wait_until_done(first)
+    assert second.text == "What do you see in Should I block??"
+    assert [question for question, _ in tutor.history.turns] == ["Should I block?"]